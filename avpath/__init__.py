@@ -1,8 +1,26 @@
+from typing import TYPE_CHECKING
+
+from vpath.utils import lazy_exports
 from .utils import check_lib
-check_lib()
-del check_lib
 
-from .paths import AsyncVPath
-from .storage import AsyncStorage
-from .middleware import *
-from .factory import AsyncFileSystem
+# anyio и aiofiles импортируются вместе с первым используемым именем, а не при `import avpath`.
+_EXPORTS = {
+    "AsyncVPath": ".paths",
+    "AsyncStorage": ".storage",
+    "AsyncFileSystem": ".factory",
+    "AsyncStorageWrapper": ".middleware",
+    "AsyncSubStorage": ".middleware",
+    "AsyncMountStorage": ".middleware",
+    "AsyncMultiStorage": ".middleware",
+    "AsyncCachingStorage": ".middleware",
+    "AsyncMetricsStorage": ".middleware",
+    "AsyncTraceStorage": ".middleware",
+}
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS, on_first=check_lib)
+
+if TYPE_CHECKING:
+    from .paths import AsyncVPath
+    from .storage import AsyncStorage
+    from .factory import AsyncFileSystem
+    from .middleware import *
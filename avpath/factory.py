@@ -1,25 +1,52 @@
 from __future__ import annotations
-import importlib.metadata
-from typing import Type, Optional
+import posixpath
+from typing import Iterable, Type, Optional
 
-from attrs import define
+from attrs import define, field
 
-from vpath.utils import URLParser, LazyLoader
+from vpath.utils import URLParser, LazyLoader, cached_entry_points, StoragePool, VStat, group_batch
 from vpath.abc import BaseStorageContainer
+from vpath.factory import Resolver
 from .storage import AsyncStorage
 from .paths import AsyncVPath
 
 
 @define
 class DefaultAsyncContainer(BaseStorageContainer):
-    """Контейнер для асинхронного хранилища."""
+    """Контейнер для асинхронного хранилища с пулом уже созданных экземпляров."""
     storage: Type[AsyncStorage]
+    pool_size: int = 128
+    weak: bool = False
+    _pool: StoragePool = field(init=False, repr=False)
     
-    async def async_get_storage(self, root: str, **kwargs) -> AsyncStorage:
+    def __attrs_post_init__(self):
+        self._pool = StoragePool(self.pool_size, self.weak)
+    
+    async def async_get_storage(self, root: str, pooled: bool = True, **kwargs) -> AsyncStorage:
+        if not pooled:
+            return self._create(root, **kwargs)
+        key = self._pool.key(root, kwargs)
+        storage = self._pool.get(key)
+        if storage is None:
+            storage = self._create(root, **kwargs)
+            evicted = self._pool.put(key, storage)
+            if evicted is not None:
+                await evicted.close()
+        return storage
+    
+    def _create(self, root: str, **kwargs) -> AsyncStorage:
         if not isinstance(self.storage, type) and hasattr(self.storage, 'load'):
             self.storage = self.storage.load()
         
-        return self.storage(root, **kwargs)
+        storage = self.storage(root, **kwargs)
+        if storage.use_cache:
+            from .middleware import AsyncCachingStorage
+            storage = AsyncCachingStorage(storage)
+        return storage
+    
+    async def async_close_all(self):
+        for storage in self._pool.drain():
+            await storage.close()
 
 
 class AsyncFileSystem:
@@ -44,18 +71,78 @@ class AsyncFileSystem:
         cls._registry[scheme] = container
     
     @classmethod
-    async def open(cls, url: str, **kwargs) -> AsyncVPath:
-        cls._ensure_loaded()
-        from avpath import AsyncVPath
-        
+    async def open(cls, url: str, pooled: bool = True, **kwargs) -> AsyncVPath:
+        """
+        Открывает путь по URL. Хранилища переиспользуются между вызовами
+        с одинаковыми (root, kwargs); pooled=False создает новый экземпляр.
+        """
         scheme, folder, file, _, url_args = URLParser.parse(url)
-        
-        if scheme not in cls._registry:
+        container = cls._container(scheme)
+        storage = await container.async_get_storage(root=folder, pooled=pooled, **{**url_args, **kwargs})
+        return AsyncVPath(file, storage=storage)
+    
+    @classmethod
+    async def resolver(cls, url_prefix: str, pooled: bool = True, **kwargs) -> Resolver:
+        """
+        Привязывается к префиксу (он считается директорией) и возвращает Resolver:
+        resolver("a/b.txt") строит путь без разбора URL и без обращения к пулу.
+        """
+        scheme, folder, file, _, url_args = URLParser.parse(url_prefix)
+        root = posixpath.join(folder, file) if file else folder
+        container = cls._container(scheme)
+        storage = await container.async_get_storage(root=root, pooled=pooled, **{**url_args, **kwargs})
+        return Resolver(scheme, root, storage, AsyncVPath)
+    
+    @classmethod
+    def _container(cls, scheme: str) -> BaseStorageContainer:
+        cls._ensure_loaded()
+        container = cls._registry.get(scheme)
+        if container is None:
             raise ValueError(f"Async driver for '{scheme}' not found")
+        return container
+    
+    @classmethod
+    async def stat_many(cls, paths: Iterable[str | AsyncVPath]) -> list[VStat | Exception]:
+        """Пакетный stat: по одному пакетному вызову на хранилище, ошибки — на месте элемента."""
+        return [r if isinstance(r, Exception) else VStat(r) for r in await cls._many("get_info_many", paths)]
+    
+    @classmethod
+    async def exists_many(cls, paths: Iterable[str | AsyncVPath]) -> list[bool | Exception]:
+        return await cls._many("exists_many", paths)
+    
+    @classmethod
+    async def unlink_many(cls, paths: Iterable[str | AsyncVPath]) -> list[None | Exception]:
+        return await cls._many("unlink_many", paths)
+    
+    @classmethod
+    async def read_many(cls, paths: Iterable[str | AsyncVPath]) -> list[bytes | Exception]:
+        return await cls._many("read_many", paths)
+    
+    @classmethod
+    async def _many(cls, method: str, paths: Iterable[str | AsyncVPath]) -> list:
+        opened = []
+        for item in paths:
+            try:
+                opened.append(item if isinstance(item, AsyncVPath) else await cls.open(item))
+            except Exception as e:
+                opened.append(e)
         
-        container = cls._registry[scheme]
-        storage = await container.async_get_storage(root=folder, **{**url_args, **kwargs})
-        return AsyncVPath(file, storage=storage)
+        def route(item):
+            if isinstance(item, Exception):
+                raise item
+            return item.storage, item.as_posix()
+        
+        results, groups = group_batch(opened, route)
+        for storage, slots, posix_paths in groups:
+            for i, res in zip(slots, await getattr(storage, method)(posix_paths)):
+                results[i] = res
+        return results
+    
+    @classmethod
+    async def close_all(cls):
+        """Закрывает и забывает все хранилища из пулов контейнеров."""
+        for container in cls._registry.values():
+            await container.async_close_all()
     
     @classmethod
     def _ensure_loaded(cls):
@@ -63,6 +150,6 @@ class AsyncFileSystem:
         for s, path in cls._built_in.items():
             if s not in cls._registry:
                 cls.add_container(s, DefaultAsyncContainer(LazyLoader(path)))
-        for entry in importlib.metadata.entry_points(group='vpath.async_drivers'):
+        for entry in cached_entry_points('vpath.async_drivers'):
             cls.add_container(entry.name, DefaultAsyncContainer(entry))
         cls._loaded = True
@@ -1,4 +1,24 @@
-from .wrap import AsyncStorageWrapper
-from .sub import AsyncSubStorage
-from .mount import AsyncMountStorage
-from .multi import AsyncMultiStorage
+from typing import TYPE_CHECKING
+
+from vpath.utils import lazy_exports
+
+_EXPORTS = {
+    "AsyncStorageWrapper": ".wrap",
+    "AsyncSubStorage": ".sub",
+    "AsyncMountStorage": ".mount",
+    "AsyncMultiStorage": ".multi",
+    "AsyncCachingStorage": ".cache",
+    "AsyncMetricsStorage": ".metrics",
+    "AsyncTraceStorage": ".trace",
+}
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .wrap import AsyncStorageWrapper
+    from .sub import AsyncSubStorage
+    from .mount import AsyncMountStorage
+    from .multi import AsyncMultiStorage
+    from .cache import AsyncCachingStorage
+    from .metrics import AsyncMetricsStorage
+    from .trace import AsyncTraceStorage
@@ -0,0 +1,90 @@
+from typing import Any, AsyncIterator, Optional
+
+from vpath.middleware.mixins import CacheLogicMixin
+from avpath.utils.proxy import AsyncFileProxy
+from .wrap import AsyncStorageWrapper
+from .. import AsyncStorage
+
+
+class AsyncCachingStorage(AsyncStorageWrapper, CacheLogicMixin):
+    """
+    Асинхронный кэш get_info/exists/list_dir обернутого хранилища.
+    Любая запись через это хранилище сбрасывает затронутые пути и их родителей.
+    """
+    
+    def __init__(self, wrapped: AsyncStorage, maxsize: int = 4096, ttl: Optional[float] = 5.0):
+        AsyncStorageWrapper.__init__(self, wrapped)
+        CacheLogicMixin.__init__(self, maxsize, ttl)
+    
+    async def get_info(self, path: str) -> dict[str, Any]:
+        key = ("info", self._key(path))
+        info = self._cache.get(key)
+        if info is None:
+            info = await self.wrapped.get_info(path)
+            self._cache.set(key, info)
+        return info
+    
+    async def exists(self, path: str) -> bool:
+        key = ("exists", self._key(path))
+        found = self._cache.get(key)
+        if found is None:
+            found = await self.wrapped.exists(path)
+            self._cache.set(key, found)
+        return found
+    
+    async def list_dir(self, path: str) -> AsyncIterator[tuple[str, Optional[dict]]]:
+        entries = self._cache.get(("list", self._key(path)))
+        if entries is None:
+            entries = [item async for item in self.wrapped.list_dir(path)]
+            self._remember_listing(path, entries)
+        for item in entries:
+            yield item
+    
+    async def open(self, path: str, mode: str = "r") -> Any:
+        if not any(m in mode for m in "wax+"):
+            return await self.wrapped.open(path, mode)
+        self._invalidate(path)
+        return AsyncFileProxy(await self.wrapped.open(path, mode), lambda: self._invalidate(path))
+    
+    async def write_bytes(self, path: str, data: bytes):
+        try:
+            await self.wrapped.write_bytes(path, data)
+        finally:
+            self._invalidate(path)
+    
+    async def unlink(self, path: str):
+        try:
+            await self.wrapped.unlink(path)
+        finally:
+            self._invalidate(path, subtree=True)
+    
+    async def mkdir(self, path: str, mode=0o777, parents=False, exist_ok=False):
+        try:
+            await self.wrapped.mkdir(path, mode, parents, exist_ok)
+        finally:
+            self._invalidate(path)
+    
+    # Чтение метаданных пакетом идет через кэш, поэлементно
+    get_info_many = AsyncStorage.get_info_many
+    exists_many = AsyncStorage.exists_many
+    
+    async def unlink_many(self, paths):
+        paths = list(paths)
+        try:
+            return await self.wrapped.unlink_many(paths)
+        finally:
+            for path in paths:
+                self._invalidate(path, subtree=True)
+    
+    async def copy(self, src: str, dest: str, source: Optional[AsyncStorage] = None):
+        try:
+            await AsyncStorageWrapper.copy(self, src, dest, source)
+        finally:
+            self._invalidate(dest)
+    
+    async def rename(self, src: str, dest: str):
+        try:
+            await self.wrapped.rename(src, dest)
+        finally:
+            self._invalidate(src, subtree=True)
+            self._invalidate(dest, subtree=True)
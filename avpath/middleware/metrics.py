@@ -0,0 +1,100 @@
+from time import perf_counter
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
+
+from vpath.middleware.mixins import MetricsLogicMixin
+from avpath.utils.proxy import AsyncCountingFile
+from .wrap import AsyncStorageWrapper
+from .. import AsyncStorage
+
+
+class AsyncMetricsStorage(AsyncStorageWrapper, MetricsLogicMixin):
+    """
+    Асинхронный MetricsStorage. Длительность — время от вызова до результата,
+    включая ожидание в event loop; для итераторов — сумма ожиданий __anext__.
+    """
+    
+    def __init__(self, wrapped: AsyncStorage, labels: Optional[dict[str, str]] = None,
+                 buckets: Optional[Iterable[float]] = None):
+        AsyncStorageWrapper.__init__(self, wrapped)
+        MetricsLogicMixin.__init__(self, labels, buckets)
+    
+    async def _timed(self, method: str, func: Callable, *args) -> Any:
+        start = perf_counter()
+        failed = True
+        try:
+            result = await func(*args)
+            failed = False
+            return result
+        finally:
+            self._observe(method, perf_counter() - start, failed)
+    
+    async def _timed_iter(self, method: str, it: AsyncIterator) -> AsyncIterator:
+        elapsed, failed = 0.0, True
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    item = await it.__anext__()
+                except StopAsyncIteration:
+                    elapsed += perf_counter() - start
+                    failed = False
+                    return
+                elapsed += perf_counter() - start
+                yield item
+        except GeneratorExit:
+            failed = False
+            raise
+        finally:
+            self._observe(method, elapsed, failed)
+    
+    async def get_info(self, path): return await self._timed("get_info", self.wrapped.get_info, path)
+    
+    async def exists(self, path): return await self._timed("exists", self.wrapped.exists, path)
+    
+    def list_dir(self, path): return self._timed_iter("list_dir", self.wrapped.list_dir(path))
+    
+    def walk(self, path, pattern=None): return self._timed_iter("walk", self.wrapped.walk(path, pattern))
+    
+    async def open(self, path, mode="r"):
+        return AsyncCountingFile(await self._timed("open", self.wrapped.open, path, mode), self._count_bytes)
+    
+    async def unlink(self, path): await self._timed("unlink", self.wrapped.unlink, path)
+    
+    async def mkdir(self, path, mode=0o777, parents=False, exist_ok=False):
+        await self._timed("mkdir", self.wrapped.mkdir, path, mode, parents, exist_ok)
+    
+    async def rename(self, src, dest): await self._timed("rename", self.wrapped.rename, src, dest)
+    
+    async def copy(self, src, dest, source=None):
+        await self._timed("copy", AsyncStorageWrapper.copy, self, src, dest, source)
+    
+    async def get_info_many(self, paths):
+        return await self._timed("get_info_many", self.wrapped.get_info_many, paths)
+    
+    async def exists_many(self, paths): return await self._timed("exists_many", self.wrapped.exists_many, paths)
+    
+    async def unlink_many(self, paths): return await self._timed("unlink_many", self.wrapped.unlink_many, paths)
+    
+    async def read_many(self, paths):
+        results = await self._timed("read_many", self.wrapped.read_many, paths)
+        self._count_bytes("read", sum(len(r) for r in results if not isinstance(r, Exception)))
+        return results
+    
+    async def read_bytes(self, path):
+        data = await self._timed("read_bytes", self.wrapped.read_bytes, path)
+        self._count_bytes("read", len(data))
+        return data
+    
+    async def write_bytes(self, path, data):
+        await self._timed("write_bytes", self.wrapped.write_bytes, path, data)
+        self._count_bytes("written", len(data))
+    
+    async def map(self, path):
+        view = await self._timed("map", self.wrapped.map, path)
+        self._count_bytes("read", view.nbytes)
+        return view
+    
+    async def iter_chunks(self, path, size):
+        async for chunk in self._timed_iter("iter_chunks", self.wrapped.iter_chunks(path, size)):
+            self._count_bytes("read", len(chunk))
+            yield chunk
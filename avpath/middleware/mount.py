@@ -1,7 +1,9 @@
 from typing import Any, AsyncIterator, Optional
 
 from avpath import AsyncStorage
+from avpath.storage import copy_tree
 from vpath.middleware.mixins import MountLogicMixin
+from vpath.utils import group_batch
 
 
 class AsyncMountStorage(AsyncStorage, MountLogicMixin):
@@ -10,48 +12,140 @@ class AsyncMountStorage(AsyncStorage, MountLogicMixin):
     """
     
     def __init__(self, use_cache: bool = False):
-        super(AsyncStorage, self).__init__(use_cache)
-        super(MountLogicMixin, self).__init__()
+        AsyncStorage.__init__(self, use_cache)
+        MountLogicMixin.__init__(self)
     
     async def get_info(self, path: str) -> dict[str, Any]:
-        if path.strip("/") == "":
-            return {"name": "/", "type": "dir", "size": 0}
-        target, sub_path = self._resolve(path)
+        target, sub_path, node, _ = self._route(path)
+        if node is not None and node.storage is None:
+            if target is not None:
+                try:
+                    return await target.get_info(sub_path)
+                except FileNotFoundError:
+                    pass
+            return self._virtual_info(path)
+        if target is None:
+            raise FileNotFoundError(f"Mount point for '{path}' not found")
         return await target.get_info(sub_path)
     
     async def exists(self, path: str) -> bool:
-        if path.strip("/") == "":
+        target, sub_path, node, _ = self._route(path)
+        if node is not None:
             return True
-        try:
-            target, sub_path = self._resolve(path)
-            return await target.exists(sub_path)
-        except FileNotFoundError:
-            return False
+        return target is not None and await target.exists(sub_path)
     
     async def list_dir(self, path: str) -> AsyncIterator[tuple[str, Optional[dict]]]:
-        if path.strip("/") == "":
-            for name in self._mounts:
-                yield name, {"type": "dir", "mount": True}
+        target, sub_path, node, _ = self._route(path)
+        if node is None or not node.children:
+            if target is None:
+                raise FileNotFoundError(f"Mount point for '{path}' not found")
+            async for item in target.list_dir(sub_path):
+                yield item
             return
-        target, sub_path = self._resolve(path)
-        async for item in target.list_dir(sub_path):
+        entries = []
+        if target is not None:
+            try:
+                entries = [item async for item in target.list_dir(sub_path)]
+            except FileNotFoundError:
+                if node.storage is not None:
+                    raise
+        for item in self._merge_entries(node, entries):
             yield item
     
+    async def walk(self, path: str, pattern: Optional[str] = None) -> AsyncIterator[tuple[str, list, list]]:
+        """
+        Обход дерева: поддеревья без вложенных точек монтирования целиком делегируются
+        своим хранилищам, а уровни с точками монтирования собираются здесь.
+        """
+        target, sub_path, node, end = self._route(path)
+        if node is None or not node.children:
+            if target is None:
+                return
+            prefix = path[:end]
+            async for dirpath, dirs, files in target.walk(sub_path, pattern):
+                yield self._join_mount(prefix, dirpath), dirs, files
+            return
+        
+        dirs, files = [], []
+        if target is not None:
+            level = target.walk(sub_path, pattern)
+            async for _, dirs, files in level:
+                break
+            await level.aclose()
+        top = self._join_mount(path, "")
+        dirs = self._merge_entries(node, dirs)
+        files = [entry for entry in files if entry[0] not in node.children]
+        yield top, dirs, files
+        for name, _ in dirs:
+            async for item in self.walk(self._join_mount(top, name), pattern):
+                yield item
+    
     async def open(self, path: str, mode: str) -> Any:
-        target, sub_path = self._resolve(path)
+        target, sub_path = self._target(path)
         return await target.open(sub_path, mode)
     
+    async def read_bytes(self, path: str) -> bytes:
+        target, sub_path = self._target(path)
+        return await target.read_bytes(sub_path)
+    
+    async def map(self, path: str) -> memoryview:
+        target, sub_path = self._target(path)
+        return await target.map(sub_path)
+    
+    def iter_chunks(self, path: str, size: int) -> AsyncIterator[memoryview]:
+        target, sub_path = self._target(path)
+        return target.iter_chunks(sub_path, size)
+    
+    async def write_bytes(self, path: str, data: bytes):
+        target, sub_path = self._target(path)
+        await target.write_bytes(sub_path, data)
+    
     async def mkdir(self, path: str, mode: str, parents: bool, exist_ok: bool):
-        target, sub_path = self._resolve(path)
+        target, sub_path = self._target(path)
         await target.mkdir(sub_path, mode, parents, exist_ok)
     
     async def unlink(self, path: str):
-        target, sub_path = self._resolve(path)
+        target, sub_path = self._target(path)
         await target.unlink(sub_path)
     
     async def rename(self, src: str, dest: str):
-        s_target, s_path = self._resolve(src)
-        d_target, d_path = self._resolve(dest)
-        if s_target != d_target:
-            raise PermissionError("Асинхронный перенос между разными точками монтирования запрещен.")
-        await s_target.rename(s_path, d_path)
+        s_target, s_path = self._target(src)
+        d_target, d_path = self._target(dest)
+        if s_target is d_target:
+            return await s_target.rename(s_path, d_path)
+        await copy_tree(s_target, s_path, d_target, d_path)
+        await s_target.unlink(s_path)
+    
+    async def copy(self, src: str, dest: str, source: Optional[AsyncStorage] = None):
+        d_target, d_path = self._target(dest)
+        if source is None or source is self:
+            source, src = self._target(src)
+        await d_target.copy(src, d_path, None if source is d_target else source)
+    
+    async def _many(self, method: str, paths) -> list:
+        """Пакет раскладывается по точкам монтирования: один пакетный вызов на хранилище."""
+        def route(path):
+            target, sub_path, node, _ = self._route(path)
+            if node is not None:
+                return None, path
+            if target is None:
+                raise FileNotFoundError(f"Mount point for '{path}' not found")
+            return target, sub_path
+        
+        results, groups = group_batch(paths, route)
+        for target, slots, subs in groups:
+            if target is None:
+                batch = await getattr(AsyncStorage, method)(self, subs)
+            else:
+                batch = await getattr(target, method)(subs)
+            for i, res in zip(slots, batch):
+                results[i] = res
+        return results
+    
+    async def get_info_many(self, paths): return await self._many("get_info_many", paths)
+    
+    async def exists_many(self, paths): return await self._many("exists_many", paths)
+    
+    async def unlink_many(self, paths): return await self._many("unlink_many", paths)
+    
+    async def read_many(self, paths): return await self._many("read_many", paths)
@@ -1,5 +1,7 @@
 from typing import Any, AsyncIterator, Optional
 
+import anyio
+
 from avpath import AsyncStorage
 from vpath.middleware.mixins import MultiLogicMixin
 
@@ -7,25 +9,73 @@ from vpath.middleware.mixins import MultiLogicMixin
 class AsyncMultiStorage(AsyncStorage, MultiLogicMixin):
     """
     Асинхронная ФС, объединяющая содержимое нескольких слоев.
+    В режиме concurrent все слои опрашиваются одновременно, но приоритет верхнего слоя сохраняется.
     """
     
-    def __init__(self, use_cache: bool = False):
-        super(AsyncStorage, self).__init__(use_cache)
-        super(MultiLogicMixin, self).__init__()
+    def __init__(self, use_cache: bool = False, concurrent: bool = False):
+        AsyncStorage.__init__(self, use_cache)
+        MultiLogicMixin.__init__(self)
+        self.concurrent = concurrent
+    
+    async def _find_layer(self, path: str) -> Optional[AsyncStorage]:
+        """Возвращает самый приоритетный слой, в котором есть путь."""
+        if not self.concurrent:
+            for layer in self._layers:
+                if await layer.exists(path):
+                    return layer
+            return None
+        return await self._probe(path, ordered=True)
+    
+    async def _probe(self, path: str, ordered: bool) -> Optional[AsyncStorage]:
+        """
+        Параллельно спрашивает exists у всех слоев. При ordered ответ готов, как только
+        слой нашелся и все слои выше него ответили "нет"; остальные проверки отменяются.
+        """
+        layers = list(self._layers)
+        found: list[Optional[bool]] = [None] * len(layers)
+        winner = None
+        
+        async with anyio.create_task_group() as tg:
+            def decide():
+                nonlocal winner
+                for i, state in enumerate(found):
+                    if state is None and ordered:
+                        return
+                    if state:
+                        winner = layers[i]
+                        tg.cancel_scope.cancel()
+                        return
+            
+            async def probe(i: int, layer: AsyncStorage):
+                try:
+                    found[i] = bool(await layer.exists(path))
+                except Exception:
+                    found[i] = False
+                decide()
+            
+            for i, layer in enumerate(layers):
+                tg.start_soon(probe, i, layer)
+        return winner
     
     async def get_info(self, path: str) -> dict[str, Any]:
-        for layer in self._layers:
-            if await layer.exists(path):
-                return await layer.get_info(path)
-        raise FileNotFoundError(path)
+        layer = await self._find_layer(path)
+        if layer is None:
+            raise FileNotFoundError(path)
+        return await layer.get_info(path)
     
     async def exists(self, path: str) -> bool:
+        if self.concurrent:
+            return await self._probe(path, ordered=False) is not None
         for layer in self._layers:
             if await layer.exists(path):
                 return True
         return False
     
     async def list_dir(self, path: str) -> AsyncIterator[tuple[str, Optional[dict]]]:
+        if self.concurrent:
+            async for item in self._list_concurrent(path):
+                yield item
+            return
         seen = set()
         for layer in self._layers:
             if await layer.exists(path):
@@ -34,20 +84,78 @@ class AsyncMultiStorage(AsyncStorage, MultiLogicMixin):
                         seen.add(name)
                         yield name, info
     
+    async def _list_concurrent(self, path: str) -> AsyncIterator[tuple[str, Optional[dict]]]:
+        """
+        Листинги всех слоев читаются одновременно, а затем сливаются в порядке приоритета.
+        Группа задач целиком завершается до первого yield: отдавать значения из
+        асинхронного генератора внутри task group нельзя (ранний break ломает cancel scope).
+        """
+        layers = list(self._layers)
+        listings: list[list] = [[] for _ in layers]
+        
+        async def pump(i: int, layer: AsyncStorage):
+            try:
+                if await layer.exists(path):
+                    async for entry in layer.list_dir(path):
+                        listings[i].append(entry)
+            except Exception:
+                listings[i] = []
+        
+        async with anyio.create_task_group() as tg:
+            for i, layer in enumerate(layers):
+                tg.start_soon(pump, i, layer)
+        
+        seen = set()
+        for entries in listings:
+            for name, info in entries:
+                if name not in seen:
+                    seen.add(name)
+                    yield name, info
+    
     async def open(self, path: str, mode: str) -> Any:
         if any(m in mode for m in "wax+"):
             return await self.primary.open(path, mode)
         
-        for layer in self._layers:
-            if await layer.exists(path):
-                return await layer.open(path, mode)
-        raise FileNotFoundError(path)
+        layer = await self._find_layer(path)
+        if layer is None:
+            raise FileNotFoundError(path)
+        return await layer.open(path, mode)
+    
+    async def read_bytes(self, path: str) -> bytes:
+        layer = await self._find_layer(path)
+        if layer is None:
+            raise FileNotFoundError(path)
+        return await layer.read_bytes(path)
+    
+    async def map(self, path: str) -> memoryview:
+        layer = await self._find_layer(path)
+        if layer is None:
+            raise FileNotFoundError(path)
+        return await layer.map(path)
+    
+    async def iter_chunks(self, path: str, size: int) -> AsyncIterator[memoryview]:
+        layer = await self._find_layer(path)
+        if layer is None:
+            raise FileNotFoundError(path)
+        async for chunk in layer.iter_chunks(path, size):
+            yield chunk
+    
+    async def write_bytes(self, path: str, data: bytes):
+        await self.primary.write_bytes(path, data)
+    
+    async def copy(self, src: str, dest: str, source: Optional[AsyncStorage] = None):
+        """Источник берется из верхнего слоя, где он есть; копия всегда ложится в primary слой."""
+        if source is None or source is self:
+            source = await self._find_layer(src)
+            if source is None:
+                raise FileNotFoundError(src)
+        await self.primary.copy(src, dest, None if source is self.primary else source)
     
     async def mkdir(self, path: str, mode: str, parents: bool, exist_ok: bool):
         await self.primary.mkdir(path, mode, parents, exist_ok)
     
     async def rename(self, src: str, dest: str):
-        pass
+        await self.primary.rename(src, dest)
     
     async def unlink(self, path: str):
         found = False
@@ -56,4 +164,4 @@ class AsyncMultiStorage(AsyncStorage, MultiLogicMixin):
                 await layer.unlink(path)
                 found = True
         if not found:
-            raise FileNotFoundError(path)
\ No newline at end of file
+            raise FileNotFoundError(path)
@@ -1,12 +1,13 @@
 from vpath.middleware.mixins import SubPathLogicMixin
+from vpath.utils import group_batch
 from .wrap import AsyncStorageWrapper
 from .. import AsyncStorage
 
 
 class AsyncSubStorage(AsyncStorageWrapper, SubPathLogicMixin):
     def __init__(self, wrapped: AsyncStorage, base_path: str):
-        super(AsyncStorageWrapper, self).__init__(wrapped)
-        super(SubPathLogicMixin, self).__init__(base_path)
+        AsyncStorageWrapper.__init__(self, wrapped)
+        SubPathLogicMixin.__init__(self, base_path)
     
     async def get_info(self, path): return await self.wrapped.get_info(self._fix(path))
     
@@ -24,4 +25,36 @@ class AsyncSubStorage(AsyncStorageWrapper, SubPathLogicMixin):
         self._fix(path), mode, parents, exist_ok)
     
     async def rename(self, src: str, dest: str):
-        return await self.wrapped.rename(self._fix(src), self._fix(dest))
\ No newline at end of file
+        return await self.wrapped.rename(self._fix(src), self._fix(dest))
+    
+    async def walk(self, path, pattern=None):
+        async for dirpath, dirs, files in self.wrapped.walk(self._fix(path), pattern):
+            yield self._unfix(dirpath), dirs, files
+    
+    async def _many(self, method: str, paths) -> list:
+        results, groups = group_batch(paths, lambda p: (self.wrapped, self._fix(p)))
+        for target, slots, fixed in groups:
+            for i, res in zip(slots, await getattr(target, method)(fixed)):
+                results[i] = res
+        return results
+    
+    async def get_info_many(self, paths): return await self._many("get_info_many", paths)
+    
+    async def exists_many(self, paths): return await self._many("exists_many", paths)
+    
+    async def unlink_many(self, paths): return await self._many("unlink_many", paths)
+    
+    async def read_many(self, paths): return await self._many("read_many", paths)
+    
+    async def read_bytes(self, path): return await self.wrapped.read_bytes(self._fix(path))
+    
+    async def write_bytes(self, path, data): return await self.wrapped.write_bytes(self._fix(path), data)
+    
+    async def map(self, path): return await self.wrapped.map(self._fix(path))
+    
+    def iter_chunks(self, path, size): return self.wrapped.iter_chunks(self._fix(path), size)
+    
+    async def copy(self, src, dest, source=None):
+        if source is None or source is self:
+            return await self.wrapped.copy(self._fix(src), self._fix(dest))
+        await self.wrapped.copy(src, self._fix(dest), source)
@@ -0,0 +1,123 @@
+import os
+from time import perf_counter
+from typing import Any, AsyncIterator, Callable, Optional, TextIO
+
+from vpath.middleware.mixins import TraceLogicMixin
+from avpath.utils.proxy import AsyncCountingFile
+from .wrap import AsyncStorageWrapper
+from .. import AsyncStorage
+
+
+class AsyncTraceStorage(AsyncStorageWrapper, TraceLogicMixin):
+    """Асинхронный TraceStorage: тот же формат трассы, replay — avpath.replay."""
+    
+    def __init__(self, wrapped: AsyncStorage, sink: "str | os.PathLike | TextIO"):
+        AsyncStorageWrapper.__init__(self, wrapped)
+        TraceLogicMixin.__init__(self, sink)
+    
+    async def _call(self, op: str, func: Callable, *call_args, path: Optional[str] = None,
+                    measure: Optional[Callable[[Any], int]] = None, **args) -> Any:
+        start = perf_counter()
+        result = error = None
+        try:
+            result = await func(*call_args)
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            nbytes = measure(result) if measure is not None and error is None else None
+            self._record(op, start, perf_counter() - start, path, error, nbytes, **args)
+    
+    async def _iter(self, op: str, it: AsyncIterator, path: str, measure: Optional[Callable[[Any], int]] = None,
+                    **args) -> AsyncIterator:
+        elapsed, error, nbytes = 0.0, None, 0
+        begin = perf_counter()
+        try:
+            while True:
+                start = perf_counter()
+                try:
+                    item = await it.__anext__()
+                except StopAsyncIteration:
+                    elapsed += perf_counter() - start
+                    return
+                elapsed += perf_counter() - start
+                if measure is not None:
+                    nbytes += measure(item)
+                yield item
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._record(op, begin, elapsed, path, error, nbytes if measure is not None else None, **args)
+    
+    async def get_info(self, path): return await self._call("get_info", self.wrapped.get_info, path, path=path)
+    
+    async def exists(self, path): return await self._call("exists", self.wrapped.exists, path, path=path)
+    
+    def list_dir(self, path): return self._iter("list_dir", self.wrapped.list_dir(path), path)
+    
+    def walk(self, path, pattern=None):
+        return self._iter("walk", self.wrapped.walk(path, pattern), path, pattern=pattern)
+    
+    async def open(self, path, mode="r"):
+        start = perf_counter()
+        try:
+            file = await self.wrapped.open(path, mode)
+        except Exception as e:
+            self._record("open", start, perf_counter() - start, path, e, mode=mode)
+            raise
+        dur = perf_counter() - start
+        moved = [0]
+        
+        def count(_direction: str, n: int):
+            moved[0] += n
+        
+        return AsyncCountingFile(file, count,
+                                 lambda: self._record("open", start, dur, path, None, moved[0], mode=mode))
+    
+    async def unlink(self, path): await self._call("unlink", self.wrapped.unlink, path, path=path)
+    
+    async def mkdir(self, path, mode=0o777, parents=False, exist_ok=False):
+        await self._call("mkdir", self.wrapped.mkdir, path, mode, parents, exist_ok,
+                         path=path, parents=parents, exist_ok=exist_ok)
+    
+    async def rename(self, src, dest): await self._call("rename", self.wrapped.rename, src, dest, path=src, dest=dest)
+    
+    async def copy(self, src, dest, source=None):
+        await self._call("copy", AsyncStorageWrapper.copy, self, src, dest, source, path=src, dest=dest)
+    
+    async def get_info_many(self, paths):
+        paths = list(paths)
+        return await self._call("get_info_many", self.wrapped.get_info_many, paths, paths=paths)
+    
+    async def exists_many(self, paths):
+        paths = list(paths)
+        return await self._call("exists_many", self.wrapped.exists_many, paths, paths=paths)
+    
+    async def unlink_many(self, paths):
+        paths = list(paths)
+        return await self._call("unlink_many", self.wrapped.unlink_many, paths, paths=paths)
+    
+    async def read_many(self, paths):
+        paths = list(paths)
+        return await self._call("read_many", self.wrapped.read_many, paths, paths=paths,
+                                measure=lambda rs: sum(len(r) for r in rs if not isinstance(r, Exception)))
+    
+    async def read_bytes(self, path):
+        return await self._call("read_bytes", self.wrapped.read_bytes, path, path=path, measure=len)
+    
+    async def write_bytes(self, path, data):
+        await self._call("write_bytes", self.wrapped.write_bytes, path, data, path=path, measure=lambda _: len(data))
+    
+    async def map(self, path):
+        return await self._call("map", self.wrapped.map, path, path=path, measure=lambda v: v.nbytes)
+    
+    def iter_chunks(self, path, size):
+        return self._iter("iter_chunks", self.wrapped.iter_chunks(path, size), path, len, size=size)
+    
+    async def close(self):
+        try:
+            await self.wrapped.close()
+        finally:
+            self._close_trace()
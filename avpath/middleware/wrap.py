@@ -21,4 +21,29 @@ class AsyncStorageWrapper(AsyncStorage):
     async def mkdir(self, path, mode=0o777, parents=False, exist_ok=False): await self.wrapped.mkdir(path, mode,
                                                                                                      parents, exist_ok)
     
-    async def rename(self, src: str, dest: str): await self.wrapped.rename(src, dest)
\ No newline at end of file
+    async def rename(self, src: str, dest: str): await self.wrapped.rename(src, dest)
+    
+    async def walk(self, path, pattern=None):
+        async for item in self.wrapped.walk(path, pattern):
+            yield item
+    
+    async def get_info_many(self, paths): return await self.wrapped.get_info_many(paths)
+    
+    async def exists_many(self, paths): return await self.wrapped.exists_many(paths)
+    
+    async def unlink_many(self, paths): return await self.wrapped.unlink_many(paths)
+    
+    async def read_many(self, paths): return await self.wrapped.read_many(paths)
+    
+    async def read_bytes(self, path): return await self.wrapped.read_bytes(path)
+    
+    async def write_bytes(self, path, data): return await self.wrapped.write_bytes(path, data)
+    
+    async def map(self, path): return await self.wrapped.map(path)
+    
+    def iter_chunks(self, path, size): return self.wrapped.iter_chunks(path, size)
+    
+    async def copy(self, src, dest, source=None):
+        await self.wrapped.copy(src, dest, None if source is None or source is self else source)
+    
+    async def close(self): await self.wrapped.close()
@@ -1,8 +1,10 @@
+import codecs
 from typing import AsyncIterator, Self
 
-from vpath.utils import VStat
+from vpath.utils import VStat, BufferReader, RecordSplitter, compile_glob, has_magic, decode_text, encode_text
 from vpath.abc import BaseVPath
-from .storage import AsyncStorage
+from .storage import AsyncStorage, copy_tree
+from .utils.proxy import AsyncMemoryFile, AsyncReadAhead
 from .utils.textio import AsyncTextIO
 
 
@@ -18,25 +20,138 @@ class AsyncVPath(BaseVPath):
     
     async def iterdir(self) -> AsyncIterator['AsyncVPath']:
         async for n, m in self.storage.list_dir(self.as_posix()):
-            yield AsyncVPath(self, n, storage=self.storage, info_cache=m)
+            yield self._child(n, m)
+    
+    async def walk(self) -> AsyncIterator[tuple[Self, list[str], list[str]]]:
+        """Обход дерева (по уровням); dirnames можно урезать на месте."""
+        async for dirpath, dirs, files in self.storage.walk(self.as_posix()):
+            dirnames = [name for name, _ in dirs]
+            yield type(self)(dirpath, storage=self.storage), dirnames, [name for name, _ in files]
+            if len(dirnames) != len(dirs):
+                keep = set(dirnames)
+                dirs[:] = [d for d in dirs if d[0] in keep]
+    
+    async def glob(self, pattern: str) -> AsyncIterator[Self]:
+        parts = [part for part in pattern.split("/") if part and part != "."]
+        if not parts:
+            raise ValueError(f"Unacceptable pattern: {pattern!r}")
+        seen = set() if parts.count("**") > 1 else None
+        async for path in self._glob(parts):
+            if seen is not None:
+                if path in seen:
+                    continue
+                seen.add(path)
+            yield path
+    
+    def rglob(self, pattern: str) -> AsyncIterator[Self]:
+        return self.glob("**/" + pattern)
+    
+    async def _glob(self, parts: list[str]) -> AsyncIterator[Self]:
+        head, rest = parts[0], parts[1:]
+        if head == "**":
+            if len(rest) == 1 and rest[0] != "**":
+                # "**/шаблон": фильтр по имени уходит в хранилище
+                match = compile_glob(rest[0])
+                async for dirpath, dirs, files in self.storage.walk(self.as_posix(), rest[0]):
+                    top = type(self)(dirpath, storage=self.storage)
+                    for name, info in dirs:
+                        if match(name):
+                            yield top._child(name, info)
+                    for name, info in files:
+                        yield top._child(name, info)
+                return
+            async for dirpath, _, _ in self.storage.walk(self.as_posix()):
+                top = type(self)(dirpath, storage=self.storage)
+                if rest:
+                    async for path in top._glob(rest):
+                        yield path
+                else:
+                    yield top
+        elif has_magic(head):
+            match = compile_glob(head)
+            try:
+                entries = [item async for item in self.storage.list_dir(self.as_posix())]
+            except (FileNotFoundError, NotADirectoryError):
+                return
+            for name, info in entries:
+                if not match(name) or (rest and info is not None and info.get("type") != "dir"):
+                    continue
+                child = self._child(name, info)
+                if rest:
+                    async for path in child._glob(rest):
+                        yield path
+                else:
+                    yield child
+        else:
+            child = self._child(head)
+            if rest:
+                async for path in child._glob(rest):
+                    yield path
+            elif await child.exists():
+                yield child
     
     def chroot(self) -> Self:
         from .middleware import AsyncSubStorage
         return AsyncVPath("/", storage=AsyncSubStorage(self.storage, self.as_posix()))
     
-    async def open(self, mode="r", encoding="utf-8"):
-        file = await self.storage.open(self.as_posix(), mode=mode.replace("t", ""))
+    async def open(self, mode="r", encoding="utf-8", mmap=False, readahead: int = 0):
+        """
+        readahead=N — внутри async with до N кусков по storage.read_chunk_size читаются
+        фоновой задачей заранее, пока обрабатывается текущий (только для чтения).
+        """
+        if (mmap or readahead) and any(m in mode for m in "wax+"):
+            raise ValueError("mmap=True and readahead support only read modes")
+        if mmap:
+            file = AsyncMemoryFile(BufferReader(await self.map()))
+        else:
+            file = await self.storage.open(self.as_posix(), mode=mode.replace("t", ""))
+            if readahead:
+                file = AsyncReadAhead(file, readahead, self.storage.read_chunk_size)
         if "b" not in mode:
             return AsyncTextIO(file, mode, encoding)
         return file
     
-    async def write_text(self, data: str, encoding: str = "utf-8"):
-        async with await self.open("w", encoding) as f:
-            await f.write(data)
+    async def map(self) -> memoryview:
+        """Read-only memoryview содержимого (mmap для локальных файлов); сам доступ к нему синхронный."""
+        return await self.storage.map(self.as_posix())
+    
+    async def read_bytes(self) -> bytes:
+        return await self.storage.read_bytes(self.as_posix())
+    
+    async def write_bytes(self, data: bytes) -> int:
+        await self.storage.write_bytes(self.as_posix(), data)
+        self._info_cache = None
+        return len(data)
     
-    async def read_text(self, encoding="utf-8") -> str:
-        async with await self.open("r", encoding) as f:
-            return await f.read()
+    def iter_chunks(self, size: int = 64 * 1024) -> AsyncIterator[memoryview]:
+        """Потоковое чтение кусками; кусок может ссылаться на переиспользуемый буфер."""
+        return self.storage.iter_chunks(self.as_posix(), size)
+    
+    async def iter_records(self, sep: bytes = b"\n", size: int = 64 * 1024,
+                           keepends: bool = False) -> AsyncIterator[bytes]:
+        splitter = RecordSplitter(sep, keepends)
+        async for chunk in self.iter_chunks(size):
+            for record in splitter.feed(bytes(chunk)):
+                yield record
+        for record in splitter.finish():
+            yield record
+    
+    async def iter_lines(self, encoding="utf-8", errors="strict", size: int = 64 * 1024) -> AsyncIterator[str]:
+        """Строки без завершающего перевода (\n или \r\n), без AsyncTextIO."""
+        decoder = codecs.getincrementaldecoder(encoding)(errors)
+        splitter = RecordSplitter("\n")
+        async for chunk in self.iter_chunks(size):
+            for line in splitter.feed(decoder.decode(chunk)):
+                yield line[:-1] if line.endswith("\r") else line
+        for line in splitter.feed(decoder.decode(b"", final=True)) + splitter.finish():
+            yield line[:-1] if line.endswith("\r") else line
+    
+    async def read_text(self, encoding="utf-8", errors="strict") -> str:
+        return decode_text(await self.read_bytes(), encoding, errors)
+    
+    async def write_text(self, data: str, encoding: str = "utf-8", errors="strict", newline=None) -> int:
+        await self.write_bytes(encode_text(data, encoding, errors, newline))
+        return len(data)
     
     async def unlink(self):
         await self.storage.unlink(self.as_posix())
@@ -46,3 +161,22 @@ class AsyncVPath(BaseVPath):
     
     async def mkdir(self, mode=0o777, parents=False, exist_ok=False):
         await self.storage.mkdir(self.as_posix(), mode, parents, exist_ok)
+    
+    async def copy_to(self, dest: "str | AsyncVPath", workers: int = 8) -> Self:
+        """Копирует файл или дерево в dest (строка — путь в том же хранилище)."""
+        if not isinstance(dest, AsyncVPath):
+            dest = type(self)(dest, storage=self.storage)
+        await copy_tree(self.storage, self.as_posix(), dest.storage, dest.as_posix(), workers)
+        return dest
+    
+    async def move_to(self, dest: "str | AsyncVPath") -> Self:
+        """Переносит в dest: внутри хранилища — rename, между хранилищами — копия и удаление."""
+        if not isinstance(dest, AsyncVPath):
+            dest = type(self)(dest, storage=self.storage)
+        if dest.storage is self.storage:
+            await self.storage.rename(self.as_posix(), dest.as_posix())
+        else:
+            await self.copy_to(dest)
+            await self.unlink()
+        self._info_cache = None
+        return dest
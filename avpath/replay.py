@@ -0,0 +1,76 @@
+"""Асинхронное воспроизведение трасс; формат и отчет — как в vpath.replay."""
+import time
+from typing import Any, Iterable, Optional
+
+import anyio
+
+from vpath.replay import ReplayReport, WRITE_MODES, load_trace, percentile
+from .storage import AsyncStorage
+
+__all__ = ["replay", "apply_event", "load_trace", "percentile", "ReplayReport"]
+
+
+async def apply_event(storage: AsyncStorage, event: dict[str, Any]) -> int:
+    """Выполняет одно событие трассы; возвращает число перемещенных байт."""
+    op, path, args = event["op"], event.get("path"), event.get("args", {})
+    nbytes = event.get("bytes") or 0
+    if op in ("get_info", "exists", "unlink"):
+        await getattr(storage, op)(path)
+    elif op == "read_bytes":
+        return len(await storage.read_bytes(path))
+    elif op == "write_bytes":
+        await storage.write_bytes(path, bytes(nbytes))
+    elif op == "map":
+        return (await storage.map(path)).nbytes
+    elif op == "list_dir":
+        async for _ in storage.list_dir(path):
+            pass
+    elif op == "walk":
+        async for _ in storage.walk(path, args.get("pattern")):
+            pass
+    elif op == "iter_chunks":
+        return sum([len(chunk) async for chunk in storage.iter_chunks(path, args["size"])])
+    elif op == "mkdir":
+        await storage.mkdir(path, 0o777, args.get("parents", False), args.get("exist_ok", False))
+    elif op in ("rename", "copy"):
+        await getattr(storage, op)(path, args["dest"])
+    elif op in ("get_info_many", "exists_many", "unlink_many", "read_many"):
+        results = await getattr(storage, op)(args["paths"])
+        return sum(len(r) for r in results if isinstance(r, bytes)) if op == "read_many" else 0
+    elif op == "open":
+        mode = args.get("mode", "rb")
+        f = await storage.open(path, mode if "b" in mode else mode + "b")
+        try:
+            if any(m in mode for m in WRITE_MODES):
+                await f.write(bytes(nbytes))
+            else:
+                return len(await f.read())
+        finally:
+            await f.close()
+    else:
+        raise ValueError(f"Unknown trace operation: {op!r}")
+    return nbytes
+
+
+async def replay(events: Iterable[dict[str, Any]], storage: "AsyncStorage | str",
+                 speed: Optional[float] = None) -> ReplayReport:
+    """Воспроизводит события по порядку над storage (хранилище или URL AsyncFileSystem)."""
+    if isinstance(storage, str):
+        from .factory import AsyncFileSystem
+        storage = (await AsyncFileSystem.open(storage, pooled=False)).storage
+    report = ReplayReport()
+    origin = time.perf_counter()
+    for event in events:
+        if speed:
+            delay = event.get("ts", 0) / speed - (time.perf_counter() - origin)
+            if delay > 0:
+                await anyio.sleep(delay)
+        start = time.perf_counter()
+        failed, nbytes = False, 0
+        try:
+            nbytes = await apply_event(storage, event)
+        except OSError:
+            failed = True
+        report.add(event["op"], time.perf_counter() - start, nbytes, failed)
+    report.elapsed = time.perf_counter() - origin
+    return report
@@ -1,16 +1,30 @@
+import posixpath
 from abc import ABC, abstractmethod
-from typing import Any, AsyncIterator, Optional
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Mapping, Optional
+
+import anyio
 
 from vpath.abc import BaseStorage
+from vpath.storage import check_copy_paths, rebase
+from vpath.utils import compile_glob
+
+# Метаданные — EntryInfo или dict с теми же ключами (name, type, size, mtime)
+Info = Mapping[str, Any]
+Entry = tuple[str, Optional[Info]]
 
 
 class AsyncStorage(BaseStorage, ABC):
+    walk_concurrency = 8
+    batch_concurrency = 32
+    copy_chunk_size = 1024 * 1024
+    read_chunk_size = 256 * 1024  # кусок потокового чтения: пачки AsyncLocalFile, open(readahead=N)
     
     @abstractmethod
-    async def get_info(self, path: str) -> dict[str, Any]: ...
+    async def get_info(self, path: str) -> Info: ...
     
     @abstractmethod
-    async def list_dir(self, path: str) -> AsyncIterator[tuple[str, Optional[dict]]]: ...
+    async def list_dir(self, path: str) -> AsyncIterator[Entry]: ...
     
     @abstractmethod
     async def open(self, path: str, mode: str) -> Any: ...
@@ -26,3 +40,172 @@ class AsyncStorage(BaseStorage, ABC):
     
     @abstractmethod
     async def rename(self, src: str, dest: str): ...
+    
+    async def walk(self, path: str, pattern: Optional[str] = None) -> AsyncIterator[tuple[str, list[Entry], list[Entry]]]:
+        """
+        Обход дерева (dirpath, dirs, files), как у синхронного Storage.walk.
+        Соседние директории сканируются параллельно (не более walk_concurrency),
+        поэтому порядок — по уровням; родитель всегда выдается раньше детей,
+        и урезание dirs на месте отменяет обход соответствующих поддеревьев.
+        """
+        match = compile_glob(pattern) if pattern else None
+        pending = deque([path])
+        while pending:
+            batch = [pending.popleft() for _ in range(min(self.walk_concurrency, len(pending)))]
+            results: list = [None] * len(batch)
+            
+            async def scan(index: int, top: str):
+                try:
+                    results[index] = await self._scan_dir(top, match)
+                except OSError:
+                    pass
+            
+            async with anyio.create_task_group() as tg:
+                for i, top in enumerate(batch):
+                    tg.start_soon(scan, i, top)
+            
+            for top, scanned in zip(batch, results):
+                if scanned is None:
+                    continue
+                dirs, files = scanned
+                yield top, dirs, files
+                pending.extend(posixpath.join(top, name) for name, _ in dirs)
+    
+    async def _scan_dir(self, path: str, match: Optional[Callable]) -> tuple[list[Entry], list[Entry]]:
+        """Один шаг walk: делит содержимое директории на (dirs, files)."""
+        dirs, files = [], []
+        async for name, info in self.list_dir(path):
+            if info is None:
+                info = await self.get_info(posixpath.join(path, name))
+            if info.get("type") == "dir":
+                dirs.append((name, info))
+            elif match is None or match(name):
+                files.append((name, info))
+        return dirs, files
+    
+    # Пакетные операции: ошибки возвращаются на месте элемента, а не прерывают пакет
+    
+    async def get_info_many(self, paths: Iterable[str]) -> list[dict | Exception]:
+        return await self._batch(self.get_info, paths)
+    
+    async def exists_many(self, paths: Iterable[str]) -> list[bool | Exception]:
+        return await self._batch(self.exists, paths)
+    
+    async def unlink_many(self, paths: Iterable[str]) -> list[None | Exception]:
+        return await self._batch(self.unlink, paths)
+    
+    async def read_many(self, paths: Iterable[str]) -> list[bytes | Exception]:
+        return await self._batch(self.read_bytes, paths)
+    
+    # Чтение и запись файла целиком: хранилища переопределяют их, чтобы обойтись без файлового объекта
+    
+    async def read_bytes(self, path: str) -> bytes:
+        f = await self.open(path, "rb")
+        try:
+            return await f.read()
+        finally:
+            await f.close()
+    
+    async def write_bytes(self, path: str, data: bytes):
+        f = await self.open(path, "wb")
+        try:
+            await f.write(data)
+        finally:
+            await f.close()
+    
+    async def copy(self, src: str, dest: str, source: Optional["AsyncStorage"] = None):
+        """
+        Копирует файл src хранилища source (по умолчанию — этого же) в dest этого хранилища.
+        По умолчанию — потоковое копирование кусками copy_chunk_size.
+        """
+        if source is None or source is self:
+            source = self
+            check_copy_paths(src, dest)
+        fin = await source.open(src, "rb")
+        try:
+            fout = await self.open(dest, "wb")
+            try:
+                while chunk := await fin.read(self.copy_chunk_size):
+                    await fout.write(chunk)
+            finally:
+                await fout.close()
+        finally:
+            await fin.close()
+    
+    async def iter_chunks(self, path: str, size: int) -> AsyncIterator[memoryview]:
+        """
+        Потоковое чтение кусками до size байт: readinto в один заранее выделенный буфер,
+        кусок действителен только до следующей итерации.
+        """
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        f = await self.open(path, "rb")
+        try:
+            if hasattr(f, "readinto"):
+                while n := await f.readinto(buffer):
+                    yield view[:n]
+            else:
+                while chunk := await f.read(size):
+                    yield memoryview(chunk)
+        finally:
+            await f.close()
+    
+    async def map(self, path: str) -> memoryview:
+        """Содержимое файла как read-only memoryview; по умолчанию — буфер в памяти."""
+        return memoryview(await self.read_bytes(path))
+    
+    async def _batch(self, func: Callable[[str], Awaitable], paths: Iterable[str]) -> list:
+        """Выполняет пакет в группе задач: не более batch_concurrency вызовов одновременно."""
+        items = list(enumerate(paths))
+        results: list = [None] * len(items)
+        queue = iter(items)
+        
+        async def worker():
+            for i, path in queue:
+                try:
+                    results[i] = await func(path)
+                except Exception as e:
+                    results[i] = e
+        
+        async with anyio.create_task_group() as tg:
+            for _ in range(min(self.batch_concurrency, len(items))):
+                tg.start_soon(worker)
+        return results
+    
+    async def close(self):
+        """Освобождает ресурсы хранилища (соединения, дескрипторы)."""
+
+
+async def copy_tree(source: AsyncStorage, src: str, target: AsyncStorage, dest: str, workers: int = 8):
+    """
+    Копирует файл или дерево src хранилища source в dest хранилища target.
+    Обход создает директории и кладет файлы в очередь на 2 * workers мест,
+    workers задач копируют их; первая ошибка отменяет всю группу.
+    """
+    if source is target:
+        check_copy_paths(src, dest)
+    origin = None if source is target else source
+    if (await source.get_info(src)).get("type") != "dir":
+        await target.copy(src, dest, origin)
+        return
+    
+    send, receive = anyio.create_memory_object_stream(workers * 2)
+    
+    async def produce():
+        async with send:
+            async for dirpath, _, files in source.walk(src):
+                folder = rebase(dirpath, src, dest)
+                await target.mkdir(folder, 0o777, True, True)
+                for name, _ in files:
+                    await send.send((posixpath.join(dirpath, name), posixpath.join(folder, name)))
+    
+    async def consume(stream):
+        async with stream:
+            async for s_path, d_path in stream:
+                await target.copy(s_path, d_path, origin)
+    
+    async with anyio.create_task_group() as tg:
+        tg.start_soon(produce)
+        async with receive:
+            for _ in range(workers):
+                tg.start_soon(consume, receive.clone())
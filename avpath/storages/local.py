@@ -1,71 +1,118 @@
-import anyio
-import aiofiles
+import os
 import shutil
-from typing import Any, AsyncIterator, Optional
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Optional
+
+import anyio
+import aiofiles.threadpool
+
 from avpath import AsyncStorage
-from vpath.factory import FileSystem
+from avpath.factory import AsyncFileSystem
+from avpath.utils.proxy import AsyncLocalFile
+from vpath.storages.local import (stat_info, scan_entries, scan_walk_dir, open_file, remove,
+                                  write_file, map_file, copy_file)
+from vpath.utils import EntryInfo, as_bool
 
 
-@FileSystem.register("file")
+@AsyncFileSystem.register("file")
 class AsyncLocalStorage(AsyncStorage):
-    async def get_info(self, path: str) -> dict[str, Any]:
-        p = await self._full(path)
-        
-        try:
-            stat = await p.stat()
-            return {
-                "name": p.name,
-                "size": stat.st_size,
-                "type": "dir" if await p.is_dir() else "file",
-                "mtime": stat.st_mtime
-            }
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Path not found: {path}")
+    """
+    Локальный диск. Каждая логическая операция (stat, открытие, чтение или запись
+    целиком, пачка листинга) — ровно один переход в поток. Под asyncio вызовы идут
+    в собственный ThreadPoolExecutor хранилища на thread_workers потоков, а не в общий
+    пул anyio; на других бэкендах anyio — в потоки anyio под лимитером того же размера.
+    batched=True отдает вместо aiofiles AsyncLocalFile, читающий пачками.
+    """
+    list_batch_size = 1024
     
-    def __init__(self, base_path: str, **kwargs):
+    def __init__(self, base_path: str, thread_workers: int = 16, batched: bool = False, **kwargs):
         super().__init__(**kwargs)
-        self.base = anyio.Path(base_path)
+        self.base = Path(base_path)
+        self.batched = as_bool(batched)
+        self._executor = ThreadPoolExecutor(int(thread_workers), thread_name_prefix="avpath-local")
+        self._limiter = anyio.CapacityLimiter(int(thread_workers))
     
-    async def _full(self, path: str) -> anyio.Path:
-        p = anyio.Path(path)
-        if p.is_absolute():
-            return p
-        
+    def _full(self, path: str) -> Path:
         return self.base / path.lstrip("/")
     
+    async def _run(self, func: Callable, *args) -> Any:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return await anyio.to_thread.run_sync(func, *args, limiter=self._limiter)
+        future = loop.run_in_executor(self._executor, func, *args)
+        # Как и to_thread.run_sync: отмена дожидается завершения вызова в потоке
+        with anyio.CancelScope(shield=True):
+            return await future
+    
+    async def get_info(self, path: str) -> EntryInfo:
+        p = self._full(path)
+        try:
+            return stat_info(p.name, await self._run(os.stat, p))
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Path not found: {path}")
+    
     async def list_dir(self, path: str) -> AsyncIterator[tuple[str, Optional[dict]]]:
-        p = await self._full(path)
-        async for entry in p.iterdir():
-            stat = await entry.stat()
-            info = {
-                "name": entry.name,
-                "size": stat.st_size,
-                "type": "dir" if await entry.is_dir() else "file",
-                "mtime": stat.st_mtime
-            }
-            yield entry.name, info
+        """Сканирует директорию через os.scandir, по одному переходу в поток на пачку записей."""
+        it = await self._run(os.scandir, self._full(path))
+        try:
+            while batch := await self._run(scan_entries, it, self.list_batch_size):
+                for item in batch:
+                    yield item
+        finally:
+            it.close()
+    
+    async def _scan_dir(self, path: str, match: Optional[Callable]) -> tuple[list, list]:
+        return await self._run(scan_walk_dir, self._full(path), match)
     
     async def open(self, path: str, mode: str) -> Any:
-        p = await self._full(path)
-        if "w" in mode or "a" in mode:
-            await p.parent.mkdir(parents=True, exist_ok=True)
-        return await aiofiles.open(p.as_posix(), mode if "b" in mode else mode + "b")
+        """Создание родителей и открытие — один переход в поток."""
+        file = await self._run(open_file, self._full(path), mode)
+        if self.batched:
+            return AsyncLocalFile(file, self._run, self.read_chunk_size)
+        return aiofiles.threadpool.wrap(file)
+    
+    async def read_bytes(self, path: str) -> bytes:
+        """Файл целиком за один переход в поток."""
+        return await self._run(self._full(path).read_bytes)
+    
+    async def write_bytes(self, path: str, data: bytes):
+        await self._run(write_file, self._full(path), data)
+    
+    async def map(self, path: str) -> memoryview:
+        """mmap создается в потоке; дальше срезы читаются из page cache без копий."""
+        return await self._run(map_file, self._full(path))
+    
+    async def iter_chunks(self, path: str, size: int) -> AsyncIterator[memoryview]:
+        """По одному переходу в поток на кусок, readinto в переиспользуемый буфер."""
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        f = await self._run(open_file, self._full(path), "rb")
+        try:
+            while n := await self._run(f.readinto, buffer):
+                yield view[:n]
+        finally:
+            f.close()
+    
+    async def copy(self, src: str, dest: str, source: Optional[AsyncStorage] = None):
+        """Между локальными хранилищами — один переход в поток, данные копирует ядро."""
+        if source is not None and not isinstance(source, AsyncLocalStorage):
+            return await super().copy(src, dest, source)
+        await self._run(copy_file, (source or self)._full(src), self._full(dest), self.copy_chunk_size)
     
     async def exists(self, path: str) -> bool:
-        p = await self._full(path)
-        return await p.exists()
+        return await self._run(self._full(path).exists)
     
     async def unlink(self, path: str):
-        p = await self._full(path)
-        if await p.is_dir():
-            await anyio.to_thread.run_sync(shutil.rmtree, p.as_posix())
-        else:
-            await p.unlink()
+        await self._run(remove, self._full(path))
     
     async def mkdir(self, path: str, mode: int = 0o777, parents: bool = False, exist_ok: bool = False):
-        p = await self._full(path)
-        await p.mkdir(mode=mode, parents=parents, exist_ok=exist_ok)
+        await self._run(lambda: self._full(path).mkdir(mode=mode, parents=parents, exist_ok=exist_ok))
     
     async def rename(self, src: str, dest: str):
-        s, d = await self._full(src), await self._full(dest)
-        await anyio.to_thread.run_sync(shutil.move, s.as_posix(), d.as_posix())
+        await self._run(shutil.move, str(self._full(src)), str(self._full(dest)))
+    
+    async def close(self):
+        self._executor.shutdown(wait=False)
@@ -1,103 +1,71 @@
-import io
-import time
-from typing import Any, AsyncIterator, Optional
-
-import anyio
+from typing import Any, AsyncIterator, Callable, Iterable, Optional
 
 from avpath import AsyncStorage
-from vpath.factory import FileSystem
+from avpath.factory import AsyncFileSystem
+from vpath.storages.memory import MemoryTreeLogicMixin
+from avpath.utils.proxy import AsyncMemoryFile
+from vpath.utils import EntryInfo
 
 
-@FileSystem.register("memory")
-class AsyncMemoryStorage(AsyncStorage):
+@AsyncFileSystem.register("memory")
+class AsyncMemoryStorage(AsyncStorage, MemoryTreeLogicMixin):
     def __init__(self, _base_path, **kwargs):
-        super().__init__(**kwargs)
-        self._files: dict[str, bytes] = {}
-        self._metadata: dict[str, float] = {}
-        self._dirs: set[str] = {"/"}
-    
-    @staticmethod
-    def _normalize(path: str) -> str:
-        return "/" + path.strip("/")
-    
-    async def get_info(self, path: str) -> dict[str, Any]:
-        p = self._normalize(path)
-        
-        # СНАЧАЛА проверяем файлы
-        if p in self._files:
-            return {
-                "name": p.split("/")[-1],
-                "type": "file",
-                "size": len(self._files[p]),
-                "mtime": self._metadata.get(p, 0.0)
-            }
-        
-        # ТОЛЬКО ПОТОМ директории
-        if p in self._dirs:
-            return {
-                "name": p.split("/")[-1],
-                "type": "dir",
-                "size": 0,
-                "mtime": self._metadata.get(p, 0.0)
-            }
-            
-        raise FileNotFoundError(p)
+        AsyncStorage.__init__(self, **kwargs)
+        MemoryTreeLogicMixin.__init__(self)
+    
+    async def get_info(self, path: str) -> EntryInfo:
+        return self._info(path)
     
     async def list_dir(self, path: str) -> AsyncIterator[tuple[str, Optional[dict]]]:
-        p = self._normalize(path)
-        p_slash = p if p.endswith("/") else p + "/"
-        
-        found = set()
-        for f_path in list(self._files.keys()) + list(self._dirs):
-            if f_path.startswith(p_slash) and f_path != p:
-                name = f_path[len(p_slash):].split("/")[0]
-                if name not in found:
-                    found.add(name)
-                    info = await self.get_info(p_slash + name)
-                    yield name, info
+        for item in self._list(path):
+            yield item
+    
+    async def _scan_dir(self, path: str, match: Optional[Callable]) -> tuple[list, list]:
+        return self._scan_tree(path, match)
     
     async def open(self, path: str, mode: str) -> Any:
-        p = self._normalize(path)
-        
-        if "w" in mode:
-            # Создаем цепочку папок, если нужно (логика как в синхронке)
-            parts = p.split("/")
-            for i in range(2, len(parts)):
-                self._dirs.add("/".join(parts[:i]))
-            
-            buf = io.BytesIO()
-            orig_close = buf.close
-            
-            def _save():
-                self._files[p] = buf.getvalue()
-                self._metadata[p] = time.time()
-                orig_close()
-            
-            buf.close = _save
-            return anyio.wrap_file(buf)
-        
-        if p not in self._files:
-            raise FileNotFoundError(p)
-        
-        return anyio.wrap_file(io.BytesIO(self._files[p]))
+        if any(m in mode for m in "wax+"):
+            return AsyncMemoryFile(self._writer(path, mode))
+        return AsyncMemoryFile(self._reader(path))
     
     async def exists(self, path: str) -> bool:
-        return self._normalize(path) in self._files or self._normalize(path) in self._dirs
+        return self._exists(path)
     
     async def unlink(self, path: str):
-        p = self._normalize(path)
-        self._files.pop(p, None)
-        self._dirs.discard(p)
+        self._unlink(path)
     
-    async def mkdir(self, path: str, mode: str = "0o777", parents: bool = False, exist_ok: bool = False):
-        p = self._normalize(path)
-        self._dirs.add(p)
-        self._metadata[p] = time.time()
+    async def mkdir(self, path: str, mode: int = 0o777, parents: bool = False, exist_ok: bool = False):
+        self._mkdir(path, parents, exist_ok)
     
     async def rename(self, src: str, dest: str):
-        s, d = self._normalize(src), self._normalize(dest)
-        if s in self._files:
-            self._files[d] = self._files.pop(s)
-        elif s in self._dirs:
-            self._dirs.remove(s)
-            self._dirs.add(d)
+        self._rename(src, dest)
+    
+    async def get_info_many(self, paths: Iterable[str]) -> list[dict | Exception]:
+        return self._info_many(paths)
+    
+    async def exists_many(self, paths: Iterable[str]) -> list[bool | Exception]:
+        return self._exists_many(paths)
+    
+    async def unlink_many(self, paths: Iterable[str]) -> list[None | Exception]:
+        return self._unlink_many(paths)
+    
+    async def read_many(self, paths: Iterable[str]) -> list[bytes | Exception]:
+        return self._read_many(paths)
+    
+    async def read_bytes(self, path: str) -> bytes:
+        return self._read(path)
+    
+    async def map(self, path: str) -> memoryview:
+        return self._map(path)
+    
+    async def iter_chunks(self, path: str, size: int) -> AsyncIterator[memoryview]:
+        for chunk in self._chunks(path, size):
+            yield chunk
+    
+    async def copy(self, src: str, dest: str, source: Optional[AsyncStorage] = None):
+        if source is not None and not isinstance(source, AsyncMemoryStorage):
+            return await super().copy(src, dest, source)
+        self._copy_node(source or self, src, dest)
+    
+    async def write_bytes(self, path: str, data: bytes):
+        self._write(path, data if type(data) is bytes else bytes(data))
@@ -1,9 +1,10 @@
+from importlib.util import find_spec
+
+
 def check_lib():
-    try:
-        import anyio
-        import aiofiles
-    except ImportError:
+    """Проверяет наличие асинхронных зависимостей, не импортируя их."""
+    if find_spec("anyio") is None or find_spec("aiofiles") is None:
         raise ImportError(
             "Пакет avpath требует дополнительных зависимостей. "
             "Установите их командой: pip install vpath[async]"
-        ) from None
\ No newline at end of file
+        )
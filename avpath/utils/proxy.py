@@ -0,0 +1,431 @@
+import io
+import sys
+import inspect
+from typing import Awaitable, Callable, Optional
+
+import anyio
+import anyio.abc
+
+__all__ = ["AsyncFileProxy", "AsyncCountingFile", "AsyncMemoryFile", "AsyncLocalFile", "AsyncReadAhead"]
+
+
+class AsyncFileProxy:
+    """Прозрачная обертка над асинхронным файловым объектом с хуком на закрытие."""
+    
+    def __init__(self, file, on_close: Optional[Callable[[], None]] = None):
+        self._file = file
+        self._on_close = on_close
+    
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+    
+    async def close(self):
+        try:
+            res = self._file.close()
+            if inspect.isawaitable(res):
+                await res
+        finally:
+            callback, self._on_close = self._on_close, None
+            if callback is not None:
+                callback()
+    
+    def __aiter__(self):
+        return self._file.__aiter__()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+class AsyncCountingFile(AsyncFileProxy):
+    """AsyncFileProxy, сообщающий on_bytes(direction, n) о каждом прочитанном и записанном куске."""
+    
+    def __init__(self, file, on_bytes: Callable[[str, int], None], on_close: Optional[Callable[[], None]] = None):
+        super().__init__(file, on_close)
+        self._on_bytes = on_bytes
+    
+    async def read(self, size: int = -1) -> bytes:
+        data = await self._file.read(size)
+        self._on_bytes("read", len(data))
+        return data
+    
+    async def read1(self, size: int = -1) -> bytes:
+        data = await self._file.read1(size)
+        self._on_bytes("read", len(data))
+        return data
+    
+    async def readinto(self, buffer) -> int:
+        n = await self._file.readinto(buffer)
+        self._on_bytes("read", n or 0)
+        return n
+    
+    async def readline(self, size: int = -1) -> bytes:
+        line = await self._file.readline(size)
+        self._on_bytes("read", len(line))
+        return line
+    
+    async def write(self, data) -> int:
+        n = await self._file.write(data)
+        self._on_bytes("written", n if n is not None else len(data))
+        return n
+    
+    async def __aiter__(self):
+        async for line in self._file:
+            self._on_bytes("read", len(line))
+            yield line
+
+
+class AsyncMemoryFile:
+    """
+    Асинхронный интерфейс над файлом в памяти (BufferReader, MemoryWriter, MemoryUpdater).
+    Вся работа идет в памяти, поэтому методы выполняются прямо в event loop, без перехода в поток.
+    """
+    
+    def __init__(self, file: io.BufferedIOBase):
+        self._file = file
+    
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+    
+    def getbuffer(self) -> memoryview:
+        return self._file.getbuffer()
+    
+    async def read(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+    
+    async def read1(self, size: int = -1) -> bytes:
+        return self._file.read(size)
+    
+    async def readinto(self, buffer) -> int:
+        return self._file.readinto(buffer)
+    
+    async def readline(self, size: int = -1) -> bytes:
+        return self._file.readline(size)
+    
+    async def write(self, data) -> int:
+        return self._file.write(data)
+    
+    async def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._file.seek(offset, whence)
+    
+    async def tell(self) -> int:
+        return self._file.tell()
+    
+    async def flush(self):
+        pass
+    
+    async def close(self):
+        self._file.close()
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> bytes:
+        line = self._file.readline()
+        if not line:
+            raise StopAsyncIteration
+        return line
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._file.close()
+
+
+class AsyncLocalFile:
+    """
+    Асинхронный интерфейс над обычным файлом без aiofiles. Чтение идет пачками по
+    chunk_size за один переход в поток, мелкие read/readline обслуживаются из буфера
+    прямо в event loop. run — функция хранилища, выполняющая вызов в его пуле потоков.
+    """
+    
+    def __init__(self, file, run: Callable[..., Awaitable], chunk_size: int = 256 * 1024):
+        self._file = file
+        self._run = run
+        self.chunk_size = chunk_size
+        self._buf = b""
+        self._pos = 0
+    
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+    
+    def _take(self, size: int) -> bytes:
+        end = self._pos + size
+        data = self._buf[self._pos:end] if self._pos or end < len(self._buf) else self._buf
+        self._pos = min(end, len(self._buf))
+        return data
+    
+    async def _fill(self, size: int) -> bool:
+        """Дочитывает в буфер не меньше chunk_size байт; False — конец файла."""
+        chunk = await self._run(self._file.read, max(size, self.chunk_size))
+        if not chunk:
+            return False
+        self._buf = self._buf[self._pos:] + chunk if self._pos < len(self._buf) else chunk
+        self._pos = 0
+        return True
+    
+    async def _rewind(self):
+        """Возвращает позицию файла к логической: непрочитанный остаток буфера отбрасывается."""
+        unread = len(self._buf) - self._pos
+        self._buf, self._pos = b"", 0
+        if unread:
+            await self._run(self._file.seek, -unread, io.SEEK_CUR)
+    
+    async def read(self, size: int = -1) -> bytes:
+        available = len(self._buf) - self._pos
+        if size is None or size < 0:
+            rest = self._take(available)
+            tail = await self._run(self._file.read)
+            return rest + tail if rest else tail
+        if available < size:
+            await self._fill(size - available)
+        return self._take(size)
+    
+    async def read1(self, size: int = -1) -> bytes:
+        if self._pos >= len(self._buf) and not await self._fill(0):
+            return b""
+        return self._take(len(self._buf) - self._pos if size is None or size < 0 else size)
+    
+    async def readinto(self, buffer) -> int:
+        data = await self.read(len(memoryview(buffer).cast("B")))
+        memoryview(buffer).cast("B")[:len(data)] = data
+        return len(data)
+    
+    async def readline(self, size: int = -1) -> bytes:
+        start = self._pos
+        while True:
+            end = self._buf.find(b"\n", start)
+            if end >= 0:
+                return self._take(min(end + 1 - self._pos, size) if size >= 0 else end + 1 - self._pos)
+            if 0 <= size <= len(self._buf) - self._pos:
+                return self._take(size)
+            start = len(self._buf) - self._pos  # после _fill буфер начинается с непрочитанного остатка
+            if not await self._fill(0):
+                return self._take(len(self._buf) - self._pos)
+    
+    async def write(self, data) -> int:
+        if self._buf:
+            await self._rewind()
+        return await self._run(self._file.write, data)
+    
+    async def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset -= len(self._buf) - self._pos
+        self._buf, self._pos = b"", 0
+        return await self._run(self._file.seek, offset, whence)
+    
+    async def tell(self) -> int:
+        return await self._run(self._file.tell) - (len(self._buf) - self._pos)
+    
+    async def flush(self):
+        await self._run(self._file.flush)
+    
+    async def close(self):
+        self._buf, self._pos = b"", 0
+        await self._run(self._file.close)
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> bytes:
+        line = await self.readline()
+        if not line:
+            raise StopAsyncIteration
+        return line
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+class AsyncReadAhead(AsyncFileProxy):
+    """
+    Упреждающее чтение поверх любого асинхронного файла с read/seek/tell. Внутри async with
+    фоновая задача держит до depth кусков по chunk_size прочитанными наперед, пока потребитель
+    обрабатывает текущий: в памяти не больше depth + 2 кусков. Вне async with чтение идет
+    напрямую, без упреждения. seek за пределы текущего куска перезапускает задачу с новой позиции.
+    """
+    
+    def __init__(self, file, depth: int = 4, chunk_size: int = 256 * 1024,
+                 on_close: Optional[Callable[[], None]] = None):
+        super().__init__(file, on_close)
+        self.depth = depth
+        self.chunk_size = chunk_size
+        self._group: Optional[anyio.abc.TaskGroup] = None
+        self._scope: Optional[anyio.CancelScope] = None  # задача-читатель; None — упреждение выключено
+        self._done: Optional[anyio.Event] = None
+        self._receive = None
+        self._head = b""
+        self._offset = 0
+        self._pos = 0  # логическая позиция для потребителя
+        self._error: Optional[BaseException] = None
+    
+    def _start(self):
+        send, self._receive = anyio.create_memory_object_stream(self.depth)
+        self._scope, self._done = anyio.CancelScope(), anyio.Event()
+        self._head, self._offset, self._error = b"", 0, None
+        self._group.start_soon(self._produce, send, self._scope, self._done)
+    
+    async def _produce(self, send, scope: anyio.CancelScope, done: anyio.Event):
+        try:
+            with scope, send:
+                while True:
+                    try:
+                        chunk = await self._file.read(self.chunk_size)
+                    except Exception as e:
+                        await send.send(e)
+                        return
+                    await send.send(chunk)
+                    if not chunk:
+                        return
+        finally:
+            done.set()
+    
+    async def _stop(self):
+        """Останавливает задачу-читатель и дожидается ее; прерванный read уже не важен — позиция задается заново."""
+        if self._scope is None:
+            return
+        scope, self._scope = self._scope, None
+        scope.cancel()
+        with anyio.CancelScope(shield=True):
+            await self._done.wait()
+        self._receive.close()
+        self._head, self._offset = b"", 0
+    
+    async def _refill(self) -> bool:
+        """Берет следующий кусок из очереди; False — конец файла."""
+        if self._error is not None:
+            raise self._error
+        try:
+            item = await self._receive.receive()
+        except anyio.EndOfStream:
+            item = b""
+        if isinstance(item, Exception):
+            self._error = item
+            raise item
+        self._head, self._offset = item, 0
+        return bool(item)
+    
+    def _unread(self, parts: list[bytes]):
+        """Возвращает уже взятые куски в начало буфера: отмена или ошибка посреди read не теряет данные."""
+        if parts:
+            taken = b"".join(parts)
+            self._head, self._offset = taken + self._head[self._offset:], 0
+            self._pos -= len(taken)
+    
+    def _take(self, size: int) -> bytes:
+        head, start = self._head, self._offset
+        end = min(start + size, len(head))
+        self._offset = end
+        self._pos += end - start
+        return head if start == 0 and end == len(head) else head[start:end]
+    
+    async def read(self, size: int = -1) -> bytes:
+        if self._scope is None:
+            return await self._file.read(size)
+        left = sys.maxsize if size is None or size < 0 else size
+        parts = []
+        try:
+            while left > 0:
+                if self._offset >= len(self._head) and not await self._refill():
+                    break
+                data = self._take(left)
+                parts.append(data)
+                left -= len(data)
+        except BaseException:
+            self._unread(parts)
+            raise
+        return parts[0] if len(parts) == 1 else b"".join(parts)
+    
+    async def read1(self, size: int = -1) -> bytes:
+        if self._scope is None:
+            return await self._file.read1(size)
+        if self._offset >= len(self._head) and not await self._refill():
+            return b""
+        return self._take(sys.maxsize if size is None or size < 0 else size)
+    
+    async def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        data = await self.read(len(view))
+        view[:len(data)] = data
+        return len(data)
+    
+    async def readline(self, size: int = -1) -> bytes:
+        if self._scope is None:
+            return await self._file.readline(size)
+        left = sys.maxsize if size is None or size < 0 else size
+        parts = []
+        try:
+            while left > 0:
+                if self._offset >= len(self._head) and not await self._refill():
+                    break
+                end = self._head.find(b"\n", self._offset, self._offset + left)
+                data = self._take(end + 1 - self._offset if end >= 0 else left)
+                parts.append(data)
+                left -= len(data)
+                if end >= 0:
+                    break
+        except BaseException:
+            self._unread(parts)
+            raise
+        return b"".join(parts)
+    
+    async def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if self._scope is None:
+            return await self._file.seek(offset, whence)
+        if whence == io.SEEK_CUR:
+            offset, whence = self._pos + offset, io.SEEK_SET
+        if whence == io.SEEK_SET and -self._offset <= offset - self._pos <= len(self._head) - self._offset:
+            self._offset += offset - self._pos  # внутри текущего куска — без перезапуска
+            self._pos = offset
+            return offset
+        await self._stop()
+        self._pos = await self._file.seek(offset, whence)
+        self._start()
+        return self._pos
+    
+    async def tell(self) -> int:
+        if self._scope is None:
+            return await self._file.tell()
+        return self._pos
+    
+    async def close(self):
+        await self._stop()
+        await super().close()
+    
+    def __aiter__(self):
+        return self
+    
+    async def __anext__(self) -> bytes:
+        line = await self.readline()
+        if not line:
+            raise StopAsyncIteration
+        return line
+    
+    async def __aenter__(self):
+        group = anyio.create_task_group()
+        await group.__aenter__()
+        self._group = group
+        try:
+            self._pos = await self._file.tell()
+        except BaseException:
+            await group.__aexit__(None, None, None)
+            self._group = None
+            raise
+        self._start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            await self.close()
+        finally:
+            group, self._group = self._group, None
+            if group is not None:
+                await group.__aexit__(None, None, None)
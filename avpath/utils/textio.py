@@ -4,57 +4,131 @@ from collections import deque
 from collections.abc import AsyncIterable, AsyncIterator
 from typing import Optional
 
+from .proxy import AsyncReadAhead
+
 __all__ = ["AsyncTextIO", "AsyncTextReader", "AsyncTextWriter"]
 
 
 class AsyncTextReader(AsyncIterable):
-    def __init__(self, stream, encoding: str, chunk_size: int, history_limit: int):
+    """
+    Читатель текста поверх асинхронного байтового потока.
+    Декодированные куски лежат списком, первый прочитан до _offset; строка собирается
+    одним join, и каждый символ просматривается один раз — чтение линейно по размеру файла.
+    История строк ведется, только если задан history_limit.
+    """
+    
+    def __init__(self, stream, encoding: str, chunk_size: int, history_limit: int = 0):
         self.stream = stream
         self.encoding = encoding
-        self.decoder = codecs.getincrementaldecoder(encoding)()
-        self.buffer = ""
         self.chunk_size = chunk_size
-        self._eof = False
-        self.history = deque(maxlen=history_limit)
+        self.history: Optional[deque] = deque(maxlen=history_limit) if history_limit else None
+        self._reset()
     
     def _reset(self):
         self.decoder = codecs.getincrementaldecoder(self.encoding)()
-        self.buffer = ""
+        self._chunks: deque[str] = deque()
+        self._offset = 0
+        self._size = 0
         self._eof = False
     
-    async def read(self, size: int = -1) -> str:
-        while not self._eof and (size < 0 or len(self.buffer) < size):
-            chunk = await self.stream.read(self.chunk_size)
-            if not chunk:
-                self._eof = True
-                self.buffer += self.decoder.decode(b'', final=True)
+    async def _fill(self) -> bool:
+        """Дочитывает и декодирует еще один кусок; False — поток исчерпан."""
+        if self._eof:
+            return False
+        chunk = await self.stream.read(self.chunk_size)
+        if not chunk:
+            self._eof = True
+        text = self.decoder.decode(chunk, final=self._eof)
+        if text:
+            self._chunks.append(text)
+            self._size += len(text)
+        return not self._eof
+    
+    def _take(self, size: int) -> str:
+        """Забирает size символов из начала буфера."""
+        parts = []
+        self._size -= size
+        while size > 0:
+            head = self._chunks[0]
+            rest = len(head) - self._offset
+            if rest > size:
+                parts.append(head[self._offset:self._offset + size])
+                self._offset += size
                 break
-            self.buffer += self.decoder.decode(chunk, final=False)
-        
-        if size < 0:
-            res, self.buffer = self.buffer, ""
-        else:
-            res, self.buffer = self.buffer[:size], self.buffer[size:]
-        return res
+            parts.append(head[self._offset:] if self._offset else head)
+            self._chunks.popleft()
+            self._offset = 0
+            size -= rest
+        return parts[0] if len(parts) == 1 else "".join(parts)
+    
+    def _find(self, searched: int, last: bool = False) -> tuple[int, int]:
+        """
+        Ищет перевод строки в кусках начиная с индекса searched (first или last вхождение).
+        Возвращает (длина текста до него включительно или -1, сколько кусков просмотрено).
+        """
+        chunks, count = self._chunks, len(self._chunks)
+        order = range(count - 1, searched - 1, -1) if last else range(searched, count)
+        for i in order:
+            start = self._offset if i == 0 else 0
+            pos = chunks[i].rfind("\n", start) if last else chunks[i].find("\n", start)
+            if pos >= 0:
+                return sum(len(chunks[j]) for j in range(i)) - self._offset + pos + 1, count
+        return -1, count
+    
+    async def read(self, size: int = -1) -> str:
+        while (size < 0 or self._size < size) and await self._fill():
+            pass
+        return self._take(self._size if size < 0 else min(size, self._size))
     
     async def readline(self) -> str:
-        while not self._eof and '\n' not in self.buffer:
-            chunk = await self.stream.read(self.chunk_size)
-            if not chunk:
-                self._eof = True
-                self.buffer += self.decoder.decode(b'', final=True)
+        searched = 0
+        while True:
+            length, searched = self._find(searched)
+            if length >= 0:
                 break
-            self.buffer += self.decoder.decode(chunk, final=False)
-        
-        if '\n' in self.buffer:
-            line, sep, self.buffer = self.buffer.partition('\n')
-            full_line = line + sep
-        else:
-            full_line, self.buffer = self.buffer, ""
-        
-        if full_line:
-            self.history.append(full_line)
-        return full_line
+            if not await self._fill():
+                length = self._size
+                break
+        line = self._take(length)
+        if line and self.history is not None:
+            self.history.append(line)
+        return line
+    
+    async def readlines(self, hint: int = -1) -> list[str]:
+        """Строки до конца файла или до первой, на которой суммарная длина достигла hint."""
+        if hint is None or hint <= 0:
+            return [line async for batch in self.iter_batches() for line in batch]
+        lines, total = [], 0
+        while total < hint and (line := await self.readline()):
+            lines.append(line)
+            total += len(line)
+        return lines
+    
+    async def iter_batches(self, size: int = 1024) -> AsyncIterator[list[str]]:
+        """
+        Выдает строки списками до size штук: все полные строки из буфера режутся за раз,
+        так что на строку не приходится ни await, ни отдельного поиска.
+        """
+        searched = 0
+        while True:
+            length, searched = self._find(searched, last=True)
+            if length < 0:
+                if await self._fill():
+                    continue
+                length = self._size
+                if not length:
+                    return
+            text = self._take(length)
+            searched = 0
+            lines = text.split("\n")
+            tail = lines.pop()
+            lines = [line + "\n" for line in lines]
+            if tail:
+                lines.append(tail)
+            if self.history is not None:
+                self.history.extend(lines)
+            for i in range(0, len(lines), size):
+                yield lines[i:i + size]
     
     def __aiter__(self) -> AsyncIterator:
         return self
@@ -67,34 +141,59 @@ class AsyncTextReader(AsyncIterable):
 
 
 class AsyncTextWriter:
+    """
+    Писатель текста поверх асинхронного байтового потока. Текст сразу кодируется
+    инкрементальным кодировщиком, порог буфера считается в байтах; строки длиннее
+    порога уходят в поток напрямую, минуя буфер. flush самого потока — забота AsyncTextIO.
+    """
+    
     def __init__(self, stream, encoding: str, buffer_size: int):
         self.stream = stream
         self.encoding = encoding
         self.buffer_size = buffer_size
-        self._buffer = []
+        self.encoder = codecs.getincrementalencoder(encoding)()
+        self._buffer: list[bytes] = []
         self._current_size = 0
     
-    async def write(self, text: str):
-        self._buffer.append(text)
-        self._current_size += len(text)
+    async def write(self, text: str) -> int:
+        await self._put(self.encoder.encode(text))
+        return len(text)
+    
+    async def writelines(self, lines) -> None:
+        """Много мелких строк — одно кодирование и в лучшем случае одна запись в поток."""
+        await self._put(self.encoder.encode("".join(lines)))
+    
+    async def _put(self, data: bytes):
+        if len(data) >= self.buffer_size:
+            await self.flush()
+            await self.stream.write(data)
+            return
+        self._buffer.append(data)
+        self._current_size += len(data)
         if self._current_size >= self.buffer_size:
             await self.flush()
     
     async def flush(self):
+        """Сбрасывает накопленные байты в поток одной записью."""
         if self._buffer:
-            data = "".join(self._buffer).encode(self.encoding)
-            await self.stream.write(data)
+            data = self._buffer[0] if len(self._buffer) == 1 else b"".join(self._buffer)
             self._buffer = []
             self._current_size = 0
-        if hasattr(self.stream, 'flush'):
-            await self.stream.flush()
+            await self.stream.write(data)
+    
+    async def close(self):
+        """Дописывает хвост кодировщика и сбрасывает буфер."""
+        tail = self.encoder.encode("", final=True)
+        if tail:
+            self._buffer.append(tail)
+        await self.flush()
 
 
 class AsyncTextIO(AsyncIterable):
     """Полноценный асинхронный текстовый IO с проверкой режимов доступа."""
     
     def __init__(self, stream, mode: str = 'r', encoding: str = 'utf-8',
-                 history_limit: int = 10, buffer_size: int = 16384):
+                 history_limit: int = 0, buffer_size: int = 16384):
         self.stream = stream
         self.mode = mode
         
@@ -113,15 +212,28 @@ class AsyncTextIO(AsyncIterable):
         if not self._reader: raise IOError("File not open for reading")
         return await self._reader.readline()
     
+    async def readlines(self, hint: int = -1) -> list[str]:
+        if not self._reader: raise IOError("File not open for reading")
+        return await self._reader.readlines(hint)
+    
+    def iter_batches(self, size: int = 1024) -> AsyncIterator[list[str]]:
+        """Строки списками до size штук — меньше await на строку при обходе больших файлов."""
+        if not self._reader: raise IOError("File not open for reading")
+        return self._reader.iter_batches(size)
+    
     # Методы записи
     async def write(self, text: str):
         if not self._writer: raise IOError("File not open for writing")
         return await self._writer.write(text)
     
+    async def writelines(self, lines):
+        if not self._writer: raise IOError("File not open for writing")
+        await self._writer.writelines(lines)
+    
     async def flush(self):
+        """Буфер писателя уходит в поток, затем поток сбрасывается — ровно один раз."""
         if self._writer:
             await self._writer.flush()
-            
         if hasattr(self.stream, 'flush'):
             res = self.stream.flush()
             if inspect.isawaitable(res):
@@ -129,7 +241,8 @@ class AsyncTextIO(AsyncIterable):
     
     # Навигация и управление
     async def seek(self, offset: int, whence: int = 0):
-        await self.flush()
+        if self._writer:
+            await self._writer.flush()
         res = await self.stream.seek(offset, whence)
         if self._reader:
             self._reader._reset()
@@ -142,10 +255,14 @@ class AsyncTextIO(AsyncIterable):
     
     @property
     def history(self):
-        return self._reader.history if self._reader else deque()
+        """Последние прочитанные строки; ведется, только если задан history_limit."""
+        if self._reader is None or self._reader.history is None:
+            return deque()
+        return self._reader.history
     
     async def close(self):
-        await self.flush()
+        if self._writer:
+            await self._writer.close()  # Закрытие потока само сбросит его буферы
         if hasattr(self.stream, 'close'):
             res = self.stream.close()
             if inspect.isawaitable(res):  # Проверяем, можно ли это авейтить
@@ -156,7 +273,13 @@ class AsyncTextIO(AsyncIterable):
         return self._reader.__aiter__()
     
     async def __aenter__(self):
+        if isinstance(self.stream, AsyncReadAhead):
+            await self.stream.__aenter__()  # упреждающему чтению нужна фоновая задача
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        await self.close()
\ No newline at end of file
+        try:
+            await self.close()
+        finally:
+            if isinstance(self.stream, AsyncReadAhead):
+                await self.stream.__aexit__(exc_type, exc_val, exc_tb)
\ No newline at end of file
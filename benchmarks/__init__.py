@@ -0,0 +1,8 @@
+"""
+Бенчмарки горячих путей VPath.
+
+    python -m benchmarks [--scale quick|full] [--filter PATTERN] [--json results.json]
+
+Результат — JSON с метаданными окружения и по строке на кейс (секунды на операцию),
+пригодный для сравнения прогонов во времени.
+"""
@@ -0,0 +1,22 @@
+import argparse
+import json
+
+from . import bench_paths, bench_listing, bench_multi, bench_io, bench_import  # noqa: F401 — регистрируют группы
+from .harness import run, to_json, SCALES
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="VPath hot-path benchmarks.")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="quick")
+    parser.add_argument("--filter", help="glob over group.case names, e.g. 'listing.*'")
+    parser.add_argument("--json", help="write machine-readable results to this file")
+    options = parser.parse_args(argv)
+    
+    results = run(options.scale, options.filter)
+    if options.json:
+        with open(options.json, "w", encoding="utf-8") as f:
+            json.dump(to_json(results, options.scale), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
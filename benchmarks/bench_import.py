@@ -0,0 +1,28 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+from .harness import Case, suite
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Каждый кейс — свежий интерпретатор: модули не остаются в sys.modules между замерами.
+SCRIPTS = {
+    "baseline": "pass",
+    "vpath": "import vpath",
+    "avpath": "import avpath",
+    "vpath_open": "from vpath import FileSystem; FileSystem.open('mem://bench/a.txt')",
+    "avpath_open": "import anyio; from avpath import AsyncFileSystem; anyio.run(AsyncFileSystem.open, 'mem://bench/a.txt')",
+}
+
+
+def _python(code: str, env: dict[str, str]):
+    subprocess.run([sys.executable, "-c", code], env=env, cwd=ROOT, check=True)
+
+
+@suite("import")
+def import_cases(scale):
+    env = {**os.environ, "PYTHONPATH": ROOT, "VPATH_CACHE_DIR": tempfile.mkdtemp(prefix="vpath-bench-")}
+    for name, code in SCRIPTS.items():
+        yield Case("subprocess", lambda code=code: _python(code, env), 1, {"code": name}, repeat=7)
@@ -0,0 +1,112 @@
+import hashlib
+import io
+import tempfile
+from functools import partial
+
+from vpath import FileSystem
+from avpath import AsyncFileSystem
+
+from .harness import Case, suite
+
+LINE = b"2024-01-01T00:00:00Z INFO request handled in 12ms path=/api/v1/items\n"
+
+
+@suite("io")
+def io_cases(scale):
+    size = scale["io_mb"] * 2 ** 20
+    payload = LINE * (size // len(LINE))
+    with tempfile.TemporaryDirectory(prefix="vpath-bench-") as tmp:
+        roots = {"mem": "mem://bench-io/", "local": tmp + "/"}
+        for name, url in roots.items():
+            path = FileSystem.open(url + "log.txt", pooled=False)
+            apath = _async_path(url + "log.txt", payload)
+            params = {"storage": name, "mb": scale["io_mb"]}
+            
+            yield Case("write_bytes", lambda path=path: path.write_bytes(payload), 1, params, len(payload))
+            yield Case("read_bytes", lambda path=path: path.read_bytes(), 1, params, len(payload))
+            yield Case("read_binary_chunks", lambda path=path: _read_chunks(path), 1, params, len(payload))
+            yield Case("read_text_lines", lambda path=path: _read_lines(path), 1, params, len(payload))
+            yield Case("async_read_text_lines", partial(_aread_lines, apath), 1, params, len(payload))
+            yield Case("async_read_text_batches", partial(_aread_batches, apath), 1, params, len(payload))
+            for readahead in (0, 4):
+                yield Case("async_scan_hash", partial(_ascan_hash, apath, readahead), 1,
+                           {**params, "readahead": readahead}, len(payload))
+            
+            yield Case("stat_latency", lambda path=path: path.storage.get_info(path.as_posix()), 5_000,
+                       {"storage": name, "mode": "sync"})
+            yield Case("stat_latency", partial(apath.storage.get_info, apath.as_posix()), 5_000,
+                       {"storage": name, "mode": "async"})
+
+
+@suite("readahead")
+def readahead_cases(scale):
+    """Устройство с задержкой на read и потребитель с задержкой на кусок: упреждение их перекрывает."""
+    chunks = 64
+    for readahead in (0, 2, 4):
+        yield Case("latency_scan", partial(_latency_scan, readahead, chunks), 1,
+                   {"device_ms": 1, "consumer_ms": 1, "chunks": chunks, "readahead": readahead},
+                   chunks * 64 * 1024, repeat=3)
+
+
+async def _latency_scan(readahead, chunks):
+    import anyio
+    from avpath.utils.proxy import AsyncMemoryFile, AsyncReadAhead
+    
+    class SlowDevice(AsyncMemoryFile):
+        async def read(self, size=-1):
+            await anyio.sleep(0.001)
+            return await super().read(size)
+    
+    file = SlowDevice(io.BytesIO(bytes(chunks * 64 * 1024)))
+    async with (AsyncReadAhead(file, readahead, 64 * 1024) if readahead else file) as f:
+        while await f.read(64 * 1024):
+            await anyio.sleep(0.001)
+
+
+def _async_path(url, payload):
+    """Асинхронный путь с тем же содержимым (у асинхронной памяти свое дерево)."""
+    import anyio
+    
+    async def prepare():
+        path = await AsyncFileSystem.open(url, pooled=False)
+        await path.write_bytes(payload)
+        return path
+    
+    return anyio.run(prepare)
+
+
+def _read_chunks(path):
+    with path.open("rb") as f:
+        while f.read(64 * 1024):
+            pass
+
+
+def _read_lines(path):
+    with path.open("r") as f:
+        for _ in f:
+            pass
+
+
+async def _aread_lines(path):
+    async with await path.open("r") as f:
+        async for _ in f:
+            pass
+
+
+async def _aread_batches(path):
+    async with await path.open("r") as f:
+        async for _ in f.iter_batches():
+            pass
+
+
+async def _ascan_hash(path, readahead):
+    """Последовательное чтение с обработкой каждого куска: при readahead диск не простаивает."""
+    digest = hashlib.sha256()
+    f = await path.open("rb", readahead=readahead)
+    if readahead:
+        await f.__aenter__()  # aiofiles-файл без упреждения не поддерживает async with
+    try:
+        while chunk := await f.read(256 * 1024):
+            digest.update(chunk)
+    finally:
+        await (f.__aexit__(None, None, None) if readahead else f.close())
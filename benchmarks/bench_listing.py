@@ -0,0 +1,67 @@
+import os
+import tempfile
+import tracemalloc
+
+from vpath.storages import LocalStorage, MemoryStorage
+from vpath.utils import EntryInfo, ListingBatch, VStat, make_entry
+
+from .harness import Case, suite
+
+
+def _consume(iterator):
+    for _ in iterator:
+        pass
+
+
+@suite("listing")
+def listing_cases(scale):
+    for entries in scale["entries"]:
+        memory = MemoryStorage("")
+        memory.mkdir("/big", 0o777, False, False)
+        for i in range(entries):
+            memory.write_bytes(f"/big/f{i:07d}", b"")
+        yield Case("list_dir", lambda memory=memory: _consume(memory.list_dir("/big")), 1,
+                   {"storage": "mem", "entries": entries}, repeat=3)
+        del memory
+        
+        with tempfile.TemporaryDirectory(prefix="vpath-bench-") as tmp:
+            folder = os.path.join(tmp, "big")
+            os.mkdir(folder)
+            for i in range(entries):
+                open(os.path.join(folder, f"f{i:07d}"), "wb").close()
+            local = LocalStorage(tmp)
+            yield Case("list_dir", lambda local=local: _consume(local.list_dir("/big")), 1,
+                       {"storage": "local", "entries": entries}, repeat=3)
+
+
+def _footprint(build) -> int:
+    """Сколько байт удерживает результат build() (по tracemalloc)."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = build()
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    return size
+
+
+@suite("records")
+def records_cases(scale):
+    for entries in scale["entries"]:
+        names = [f"f{i:07d}" for i in range(entries)]
+        builders = {
+            "dict": lambda: [(n, {"name": n, "type": "file", "size": i, "mtime": 1.5}) for i, n in enumerate(names)],
+            "entry_info": lambda: [(n, make_entry((n, "file", i, 1.5))) for i, n in enumerate(names)],
+            "batch": lambda: ListingBatch.from_entries((n, make_entry((n, "file", i, 1.5))) for i, n in enumerate(names)),
+        }
+        for kind, build in builders.items():
+            per_entry = _footprint(build) // entries
+            yield Case("snapshot", build, 1, {"kind": kind, "entries": entries, "bytes_per_entry": per_entry}, repeat=3)
+    
+    stats = {"dict": VStat({"name": "a", "type": "file", "size": 1, "mtime": 1.5}), "entry_info": VStat(EntryInfo("a", "file", 1, 1.5))}
+    for kind, stat in stats.items():
+        yield Case("vstat_fields", lambda stat=stat: (stat.st_size, stat.st_mtime, stat.is_dir), 100_000, {"kind": kind})
+    yield Case("vstat_wrap", lambda: VStat({"name": "a", "type": "file", "size": 1, "mtime": 1.5}), 100_000, {"kind": "dict"})
+    yield Case("vstat_wrap", lambda: VStat(EntryInfo("a", "file", 1, 1.5)), 100_000, {"kind": "entry_info"})
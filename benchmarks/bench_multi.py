@@ -0,0 +1,27 @@
+from vpath import MultiStorage
+from vpath.storages import MemoryStorage
+
+from .harness import Case, suite
+
+
+@suite("multi")
+def multi_cases(scale):
+    for layers in scale["layers"]:
+        multi = MultiStorage(index_size=1024)
+        for i in range(layers):
+            layer = MemoryStorage("")
+            if i == 0:
+                layer.write_bytes("/deep/bottom.txt", b"x")  # Первый добавленный слой — самый нижний
+            multi.add_layer(layer)
+        
+        def cold(multi=multi):
+            multi._index.clear()
+            multi.exists("/deep/bottom.txt")
+        
+        yield Case("lookup_bottom_cold", cold, 5_000, {"layers": layers})
+        yield Case("lookup_bottom_indexed", lambda multi=multi: multi.exists("/deep/bottom.txt"), 20_000,
+                   {"layers": layers})
+        yield Case("lookup_miss_indexed", lambda multi=multi: multi.exists("/nowhere.txt"), 20_000,
+                   {"layers": layers})
+        multi.build_bloom()
+        yield Case("lookup_bottom_cold_bloom", cold, 5_000, {"layers": layers})
@@ -0,0 +1,57 @@
+from pathlib import Path, PurePosixPath
+
+from vpath import FileSystem, VPath, SubStorage
+from vpath.storages import MemoryStorage
+from vpath.utils import URLParser
+
+from .harness import Case, suite
+
+URLS = {
+    "file": "file:///srv/data/reports/2024/summary.csv",
+    "absolute": "/srv/data/reports/2024/summary.csv",
+    "mem": "mem://bucket/a/b/c.bin",
+    "query": "mem://bucket/a/b/c.bin?use_cache=1&pool_size=8",
+}
+
+
+@suite("paths")
+def paths_cases(scale):
+    for kind, url in URLS.items():
+        yield Case("url_parse", lambda url=url: URLParser.parse(url), 20_000, {"url": kind})
+        yield Case("url_parse_uncached", lambda url=url: URLParser.parse.__wrapped__(url), 20_000, {"url": kind})
+    
+    yield Case("fs_open", lambda: FileSystem.open("mem://bench/a/b.txt"), 20_000, {"url": "mem"})
+    yield Case("fs_open", lambda: FileSystem.open("/tmp/bench/a/b.txt"), 20_000, {"url": "absolute"})
+    resolve = FileSystem.resolver("mem://bench/a/")
+    yield Case("fs_resolver", lambda: resolve("b.txt"), 20_000, {"url": "mem"})
+    
+    storage = MemoryStorage("")
+    base = VPath("/data/reports", storage=storage)
+    plain = PurePosixPath("/data/reports")
+    concrete = Path("/data/reports")
+    for impl, root in (("vpath", base), ("pathlib", plain)):
+        cls = type(root)
+        yield Case("construct", lambda cls=cls: cls("/data/reports/2024/summary.csv"), 50_000, {"impl": impl})
+        yield Case("join", lambda root=root: root / "summary.csv", 50_000, {"impl": impl, "parts": 1})
+        yield Case("join", lambda root=root: root / "2024" / "q1" / "summary.csv", 20_000, {"impl": impl, "parts": 3})
+        yield Case("joinpath", lambda root=root: root.joinpath("2024", "summary.csv"), 50_000, {"impl": impl})
+        yield Case("parent", lambda root=root: root.parent, 50_000, {"impl": impl})
+        yield Case("with_name", lambda root=root: root.with_name("archive"), 50_000, {"impl": impl})
+    # Ребенок из листинга: так строятся пути в iterdir/glob
+    yield Case("listing_child", lambda: base._child("summary.csv", None), 50_000, {"impl": "vpath"})
+    yield Case("listing_child", lambda: VPath(base, "summary.csv", storage=storage), 50_000, {"impl": "vpath_parse"})
+    yield Case("listing_child", lambda: concrete._make_child_relpath("summary.csv"), 50_000, {"impl": "pathlib"})
+    
+    names = [f"f{i:07d}" for i in range(scale["entries"][0])]
+    flat = VPath("/listing", storage=storage)
+    flat_plain = PurePosixPath("/listing")
+    yield Case("iterdir_children", lambda: [flat._child(n, None) for n in names], 5, {"impl": "vpath", "entries": len(names)})
+    yield Case("iterdir_children", lambda: [flat_plain / n for n in names], 5, {"impl": "pathlib", "entries": len(names)})
+    
+    for depth in scale["depth"]:
+        inner = MemoryStorage("")
+        inner.write_bytes("/" + "/".join(["d"] * depth) + "/file.txt", b"x")
+        top = inner
+        for _ in range(depth):
+            top = SubStorage(top, "/d")
+        yield Case("sub_fix_get_info", lambda top=top: top.get_info("/file.txt"), 10_000, {"depth": depth})
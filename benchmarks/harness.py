@@ -0,0 +1,120 @@
+import fnmatch
+import inspect
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Any, Callable, Iterator, Optional
+
+from attrs import define, field, asdict
+
+SCALES = {
+    "quick": {"entries": (10_000,), "layers": (1, 4, 16), "depth": (1, 4, 16), "io_mb": 8},
+    "full": {"entries": (10_000, 100_000, 1_000_000), "layers": (1, 4, 16, 64), "depth": (1, 4, 16, 64), "io_mb": 128},
+}
+
+
+@define
+class Case:
+    """Один измеряемый кейс: func вызывается number раз подряд, замер повторяется repeat раз."""
+    name: str
+    func: Callable[[], Any]
+    number: int = 1
+    params: dict[str, Any] = field(factory=dict)
+    unit_bytes: int = 0  # байт за вызов, для пропускной способности
+    repeat: int = 5
+
+
+@define
+class Result:
+    group: str
+    name: str
+    params: dict[str, Any]
+    number: int
+    best: float
+    median: float
+    mean: float
+    ops_per_sec: float
+    mb_per_sec: Optional[float]
+
+
+Suite = Callable[[dict[str, Any]], Iterator[Case]]
+SUITES: dict[str, Suite] = {}
+
+
+def suite(group: str) -> Callable[[Suite], Suite]:
+    """Регистрирует генератор кейсов группы; генератор получает параметры масштаба."""
+    def register(func: Suite) -> Suite:
+        SUITES[group] = func
+        return func
+    
+    return register
+
+
+def _measure(case: Case) -> list[float]:
+    func, number = case.func, case.number
+    if inspect.iscoroutinefunction(func):
+        import anyio
+        
+        async def loop() -> list[float]:
+            samples = []
+            for _ in range(case.repeat):
+                start = time.perf_counter()
+                for _ in range(number):
+                    await func()
+                samples.append((time.perf_counter() - start) / number)
+            return samples
+        
+        return anyio.run(loop)
+    samples = []
+    for _ in range(case.repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - start) / number)
+    return samples
+
+
+def run(scale: str = "quick", pattern: Optional[str] = None, echo: Callable[[str], None] = print) -> list[Result]:
+    params = SCALES[scale]
+    results = []
+    for group, make in SUITES.items():
+        for case in make(params):
+            full = f"{group}.{case.name}"
+            if pattern and not fnmatch.fnmatch(full, pattern):
+                continue
+            samples = _measure(case)
+            best, median = min(samples), statistics.median(samples)
+            result = Result(group, case.name, case.params, case.number, best, median, statistics.fmean(samples),
+                            1 / median if median else float("inf"),
+                            case.unit_bytes / median / 2 ** 20 if case.unit_bytes and median else None)
+            results.append(result)
+            rate = f"{result.mb_per_sec:10.1f} MB/s" if result.mb_per_sec is not None else f"{result.ops_per_sec:12.0f} op/s"
+            echo(f"{full:<48} {_params(case.params):<28} {median * 1e6:12.3f} us  {rate}")
+    return results
+
+
+def _params(params: dict[str, Any]) -> str:
+    return ",".join(f"{k}={v}" for k, v in params.items())
+
+
+def metadata(scale: str) -> dict[str, Any]:
+    from importlib.metadata import version, PackageNotFoundError
+    try:
+        package = version("vpath")
+    except PackageNotFoundError:
+        package = None
+    return {
+        "timestamp": time.time(),
+        "scale": scale,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "vpath": package,
+    }
+
+
+def to_json(results: list[Result], scale: str) -> dict[str, Any]:
+    return {"meta": metadata(scale), "results": [asdict(r) for r in results]}
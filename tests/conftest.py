@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def entry_points_cache(tmp_path_factory, monkeypatch):
+    # кэш entry points не должен попадать в домашнюю директорию (в т.ч. из subprocess)
+    monkeypatch.setenv("VPATH_CACHE_DIR", str(tmp_path_factory.mktemp("vpath-cache")))
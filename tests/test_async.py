@@ -1,4 +1,5 @@
 import pytest
+from collections import deque
 from avpath import AsyncFileSystem
 
 
@@ -13,6 +14,23 @@ async def test_async_memory_flow():
     assert await path.read_text() == "hello async"
 
 
+@pytest.mark.asyncio
+async def test_async_memory_update_modes():
+    path = await AsyncFileSystem.open("mem://update/data.bin", pooled=False)
+    
+    async with await path.open("w+b") as f:
+        await f.write(b"hello world")
+        await f.seek(0)
+        assert await f.read(5) == b"hello"
+    
+    async with await path.open("r+b") as f:
+        await f.seek(6)
+        await f.write(b"there")
+        await f.seek(0)
+        assert await f.read() == b"hello there"
+    assert await path.read_bytes() == b"hello there"
+
+
 @pytest.mark.asyncio
 async def test_async_local_io(tmp_path):
     root = await AsyncFileSystem.open(tmp_path.as_posix())
@@ -23,7 +41,7 @@ async def test_async_local_io(tmp_path):
     found = []
     async for item in root.iterdir():
         found.append(item.name)
-        
+    
     print(found)
     
     assert "async_file.txt" in found
@@ -39,3 +57,360 @@ async def test_async_mkdir_unlink(tmp_path):
     
     await folder.unlink()
     assert not await folder.exists()
+
+
+@pytest.mark.asyncio
+async def test_async_caching_storage_invalidation():
+    from avpath import AsyncVPath, AsyncCachingStorage
+    from avpath.storages import AsyncMemoryStorage
+    
+    storage = AsyncCachingStorage(AsyncMemoryStorage(""))
+    file_path = AsyncVPath("/data", storage=storage) / "a.txt"
+    
+    assert await file_path.exists() is False
+    assert await file_path.exists() is False
+    assert storage.hits == 1
+    
+    await file_path.write_text("cached")
+    assert await file_path.exists() is True
+    assert await file_path.read_text() == "cached"
+
+
+@pytest.mark.asyncio
+async def test_async_storage_pool_reuse():
+    first = await AsyncFileSystem.open("mem://pool/a.txt")
+    await first.write_text("shared")
+    
+    second = await AsyncFileSystem.open("mem://pool/a.txt")
+    assert second.storage is first.storage
+    assert await second.read_text() == "shared"
+    
+    await AsyncFileSystem.close_all()
+    assert (await AsyncFileSystem.open("mem://pool/a.txt")).storage is not first.storage
+
+
+@pytest.mark.asyncio
+async def test_async_walk_and_rglob(tmp_path):
+    root = await AsyncFileSystem.open(tmp_path.as_posix() + "/")
+    for name in ("a.py", "pkg/b.py", "pkg/sub/c.txt", "skip/d.py"):
+        await (root / name).write_text(name)
+    
+    assert sorted([p.name async for p in root.rglob("*.py")]) == ["a.py", "b.py", "d.py"]
+    assert [p.name async for p in root.glob("pkg/*.py")] == ["b.py"]
+    
+    seen = []
+    async for top, dirs, files in root.walk():
+        if "skip" in dirs:
+            dirs.remove("skip")
+        seen.extend(files)
+    assert sorted(seen) == ["a.py", "b.py", "c.txt"]
+
+
+@pytest.mark.asyncio
+async def test_async_batch_operations(tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"aa")
+    paths = [f"{tmp_path.as_posix()}/a.txt", f"{tmp_path.as_posix()}/missing.txt"]
+    
+    stats = await AsyncFileSystem.stat_many(paths)
+    assert stats[0].st_size == 2
+    assert isinstance(stats[1], FileNotFoundError)
+    assert await AsyncFileSystem.read_many(paths[:1]) == [b"aa"]
+    assert await AsyncFileSystem.exists_many(paths) == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_async_multi_concurrent_priority():
+    import anyio
+    from avpath import AsyncVPath, AsyncMultiStorage, AsyncStorageWrapper
+    from avpath.storages import AsyncMemoryStorage
+    
+    class SlowLayer(AsyncStorageWrapper):
+        async def exists(self, path):
+            await anyio.sleep(0.05)
+            return await self.wrapped.exists(path)
+    
+    base, patch = AsyncMemoryStorage(""), AsyncMemoryStorage("")
+    for storage, names in ((base, ("shared.txt", "base.txt")), (patch, ("shared.txt", "patch.txt"))):
+        for name in names:
+            async with await storage.open(f"/etc/{name}", "wb") as f:
+                await f.write(name.encode() + b"@" + (b"base" if storage is base else b"patch"))
+    
+    overlay = AsyncMultiStorage(concurrent=True)
+    overlay.add_layer(SlowLayer(base))
+    overlay.add_layer(SlowLayer(patch))
+    overlay.add_layer(SlowLayer(AsyncMemoryStorage("")))
+    
+    root = AsyncVPath("/etc", storage=overlay)
+    start = anyio.current_time()
+    assert await (root / "shared.txt").read_text() == "shared.txt@patch"
+    assert anyio.current_time() - start < 0.09
+    
+    assert await (root / "base.txt").exists() is True
+    assert sorted([p.name async for p in root.iterdir()]) == ["base.txt", "patch.txt", "shared.txt"]
+    
+    async for _ in root.iterdir():
+        break
+    await anyio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_async_nested_mounts():
+    from avpath import AsyncVPath, AsyncMountStorage
+    from avpath.storages import AsyncMemoryStorage
+    
+    mounts = AsyncMountStorage()
+    mounts.mount("data", AsyncMemoryStorage(""))
+    mounts.mount("data/hot", AsyncMemoryStorage(""))
+    root = AsyncVPath("/", storage=mounts)
+    
+    await (root / "data/a.txt").write_text("cold")
+    await (root / "data/hot/b.txt").write_text("hot")
+    assert sorted([p.name async for p in (root / "data").iterdir()]) == ["a.txt", "hot"]
+    assert sorted([p.as_posix() async for p in root.rglob("*.txt")]) == ["/data/a.txt", "/data/hot/b.txt"]
+
+
+@pytest.mark.asyncio
+async def test_async_whole_file_fast_paths(tmp_path):
+    from avpath import AsyncFileSystem
+    
+    for root in (await AsyncFileSystem.open("mem://fast/", pooled=False),
+                 await AsyncFileSystem.open(tmp_path.as_posix() + "/")):
+        target = root / "cfg" / "app.ini"
+        assert await target.write_bytes(b"k=v\r\n") == 5
+        assert await target.read_bytes() == b"k=v\r\n"
+        assert await target.read_text() == "k=v\n"
+
+
+@pytest.mark.asyncio
+async def test_async_map(tmp_path):
+    from avpath import AsyncFileSystem
+    
+    path = await AsyncFileSystem.open(tmp_path.as_posix() + "/data.bin")
+    await path.write_bytes(b"0123456789")
+    view = await path.map()
+    assert view[3:6] == b"345"
+    async with await path.open("rb", mmap=True) as f:
+        await f.seek(8)
+        assert await f.read() == b"89"
+
+
+@pytest.mark.asyncio
+async def test_async_copy_to_and_move_to(tmp_path):
+    from avpath import AsyncVPath, AsyncMountStorage
+    from avpath.storages import AsyncMemoryStorage, AsyncLocalStorage
+    
+    mounts = AsyncMountStorage()
+    mounts.mount("mem", AsyncMemoryStorage(""))
+    mounts.mount("disk", AsyncLocalStorage(tmp_path.as_posix()))
+    root = AsyncVPath("/", storage=mounts)
+    
+    for i in range(20):
+        await (root / f"mem/src/d{i % 3}/f{i}.txt").write_text(str(i))
+    
+    await (root / "mem/src").copy_to(root / "disk/dst", workers=4)
+    assert (tmp_path / "dst/d2/f5.txt").read_text() == "5"
+    
+    await mounts.rename("/disk/dst", "/mem/back")
+    assert not (tmp_path / "dst").exists()
+    assert await (root / "mem/back/d1/f19.txt").read_text() == "19"
+    
+    # Копия в себя отклоняется до открытия приемника и не обнуляет файлы
+    for target in ("disk", "mem"):
+        folder = root / target / "self"
+        await (folder / "a.txt").write_text("keep")
+        for src, dest in ((folder / "a.txt", folder / "a.txt"), (folder, folder), (folder, folder / "inner")):
+            with pytest.raises(OSError):
+                await src.copy_to(dest)
+        assert await (folder / "a.txt").read_text() == "keep"
+
+
+@pytest.mark.asyncio
+async def test_async_local_batched_handle(tmp_path):
+    from avpath import AsyncFileSystem
+    from avpath.utils.proxy import AsyncLocalFile
+    
+    path = await AsyncFileSystem.open(tmp_path.as_posix() + "/new/log.txt?batched=1&thread_workers=2")
+    assert path.storage.batched is True
+    await path.write_text("".join(f"line {i}\n" for i in range(1000)))
+    assert (await path.stat()).st_size == 8890
+    
+    f = await path.storage.open(path.as_posix(), "rb")
+    assert isinstance(f, AsyncLocalFile)
+    async with f:
+        assert await f.readline() == b"line 0\n"
+        assert await f.read(7) == b"line 1\n"
+        assert await f.tell() == 14
+        await f.seek(-7, 1)
+        lines = [line async for line in f]
+        assert lines[0] == b"line 1\n" and lines[-1] == b"line 999\n" and len(lines) == 999
+    
+    async with await path.open() as text:
+        assert (await text.readline()) == "line 0\n"
+    
+    # Потоки — собственный пул хранилища размером thread_workers
+    import threading
+    assert await path.storage._run(lambda: threading.current_thread().name.startswith("avpath-local"))
+    assert path.storage._executor._max_workers == 2
+
+
+@pytest.mark.asyncio
+async def test_async_text_reader_batches_and_history():
+    from avpath import AsyncFileSystem
+    from avpath.utils.textio import AsyncTextIO
+    
+    path = await AsyncFileSystem.open("mem://text/log.txt", pooled=False)
+    await path.write_text("".join(f"строка {i}\n" for i in range(100)) + "хвост")
+    
+    async with await path.open() as f:
+        assert await f.readline() == "строка 0\n"
+        assert f.history == deque()
+        assert await f.readlines(10) == ["строка 1\n", "строка 2\n"]
+        batches = [batch async for batch in f.iter_batches(size=40)]
+        assert max(map(len, batches)) == 40 and sum(map(len, batches)) == 98
+        assert batches[-1][-1] == "хвост"
+    
+    stream = await path.storage.open(path.as_posix(), "rb")
+    f = AsyncTextIO(stream, "r", history_limit=2, buffer_size=5)
+    assert [line async for line in f][-1] == "хвост"
+    assert list(f.history) == ["строка 99\n", "хвост"]
+
+
+@pytest.mark.asyncio
+async def test_async_text_writer_counts_bytes():
+    from avpath.utils.textio import AsyncTextIO
+    
+    class Recorder:
+        def __init__(self):
+            self.writes, self.flushes = [], 0
+        
+        async def write(self, data):
+            self.writes.append(bytes(data))
+        
+        async def flush(self):
+            self.flushes += 1
+        
+        async def close(self):
+            pass
+    
+    stream = Recorder()
+    f = AsyncTextIO(stream, "w", encoding="utf-16", buffer_size=64)
+    await f.write("я" * 20)  # 20 символов, но 42 байта с BOM
+    await f.writelines(["abcd"] * 6)
+    assert [len(w) for w in stream.writes] == [90]
+    await f.write("x" * 100)  # Длиннее порога — мимо буфера
+    assert [len(w) for w in stream.writes] == [90, 200]
+    await f.flush()
+    assert stream.flushes == 1
+    await f.close()
+    assert b"".join(stream.writes).decode("utf-16") == "я" * 20 + "abcd" * 6 + "x" * 100
+
+
+@pytest.mark.asyncio
+async def test_async_streaming_chunks_lines_records(tmp_path):
+    for root in (await AsyncFileSystem.open("mem://stream/", pooled=False),
+                 await AsyncFileSystem.open(tmp_path.as_posix() + "/")):
+        path = root / "data.txt"
+        await path.write_bytes("один\nдва\r\nтри".encode())
+        assert b"".join([bytes(c) async for c in path.iter_chunks(3)]) == "один\nдва\r\nтри".encode()
+        assert [line async for line in path.iter_lines(size=3)] == ["один", "два", "три"]
+        records = [r async for r in path.iter_records(b"\n", size=2)]
+        assert records == ["один".encode(), "два\r".encode(), "три".encode()]
+
+
+@pytest.mark.asyncio
+async def test_async_metrics_storage():
+    from avpath import AsyncVPath, AsyncMetricsStorage
+    from avpath.storages import AsyncMemoryStorage
+    
+    storage = AsyncMetricsStorage(AsyncMemoryStorage(""), labels={"layer": "base"})
+    path = AsyncVPath("/log.txt", storage=storage)
+    await path.write_text("a\nb\n")
+    async with await path.open("rb") as f:
+        assert [line async for line in f] == [b"a\n", b"b\n"]
+    assert [bytes(c) async for c in path.iter_chunks(3)] == [b"a\nb", b"\n"]
+    
+    snap = storage.snapshot()
+    assert snap["bytes"] == {"read": 8, "written": 4}
+    assert snap["methods"]["iter_chunks"]["calls"] == 1
+    assert 'vpath_calls_total{layer="base",method="open"} 1' in storage.to_prometheus()
+
+
+@pytest.mark.asyncio
+async def test_async_trace_and_replay(tmp_path):
+    from avpath import AsyncVPath, AsyncTraceStorage
+    from avpath.storages import AsyncMemoryStorage
+    from avpath.replay import replay, load_trace
+    
+    trace = tmp_path / "trace.jsonl"
+    storage = AsyncTraceStorage(AsyncMemoryStorage(""), trace.as_posix())
+    path = AsyncVPath("/data/x.bin", storage=storage)
+    await path.write_bytes(b"x" * 100)
+    assert [len(c) async for c in path.iter_chunks(64)] == [64, 36]
+    await storage.close()
+    
+    report = await replay(load_trace(trace.as_posix()), tmp_path.as_posix() + "/out/")
+    assert report.summary()["operations"]["iter_chunks"]["count"] == 1
+    assert (tmp_path / "out/data/x.bin").stat().st_size == 100
+
+
+@pytest.mark.asyncio
+async def test_async_resolver():
+    resolve = await AsyncFileSystem.resolver("mem://resolver/base/")
+    await resolve("a/b.txt").write_text("hi")
+    assert await resolve("a", "b.txt").read_text() == "hi"
+    assert resolve("x").storage is resolve.storage and resolve.root == "resolver/base"
+
+
+@pytest.mark.asyncio
+async def test_async_readahead(tmp_path):
+    import io
+    import anyio
+    from avpath.utils.proxy import AsyncMemoryFile, AsyncReadAhead
+    
+    data = bytes(range(256)) * 100
+    
+    class SlowFile(AsyncMemoryFile):
+        """Отдает первые куски сразу, дальше ждет gate; после fail_at байт — ошибка."""
+        reads, gate, fail_at = 0, None, None
+        
+        async def read(self, size=-1):
+            self.reads += 1
+            if self.gate is not None and self.reads > 3:
+                await self.gate.wait()
+            if self.fail_at is not None and self._file.tell() >= self.fail_at:
+                raise OSError("disk gone")
+            return await super().read(size)
+    
+    f = SlowFile(io.BytesIO(data))
+    async with AsyncReadAhead(f, depth=2, chunk_size=1000) as ra:
+        await anyio.sleep(0.01)
+        assert f.reads == 3  # depth в очереди + один ждет места
+        assert await ra.read(10) == data[:10] and await ra.tell() == 10
+        assert await ra.seek(500) == 500 and await ra.read(700) == data[500:1200]
+        await ra.seek(-6, io.SEEK_END)
+        assert await ra.read() == data[-6:] and await ra.read() == b""
+        assert await ra.seek(0) == 0 and await ra.read() == data
+    
+    f = SlowFile(io.BytesIO(data))
+    f.gate = anyio.Event()
+    async with AsyncReadAhead(f, depth=4, chunk_size=1000) as ra:
+        with anyio.move_on_after(0.05):
+            await ra.read(len(data))  # отменяется, получив только часть кусков
+        assert await ra.tell() == 0
+        f.gate.set()
+        assert await ra.read() == data
+    
+    f = SlowFile(io.BytesIO(data))
+    f.fail_at = 3000
+    async with AsyncReadAhead(f, depth=4, chunk_size=1000) as ra:
+        assert await ra.read(3000) == data[:3000]
+        with pytest.raises(OSError):
+            await ra.read(1)
+    
+    path = await AsyncFileSystem.open(tmp_path.as_posix() + "/log.txt")
+    await path.write_text("".join(f"line {i}\n" for i in range(5000)))
+    async with await path.open("r", readahead=3) as text:
+        assert await text.readline() == "line 0\n"
+        assert len([line async for line in text]) == 4999
+    with pytest.raises(ValueError):
+        await path.open("wb", readahead=2)
@@ -27,4 +27,631 @@ def test_local_storage_tmp(tmp_path):
     
     file_path.write_text("data")
     assert (tmp_path / "subdir" / "file.log").exists()
-    assert file_path.read_text() == "data"
\ No newline at end of file
+    assert file_path.read_text() == "data"
+
+
+def test_caching_storage_invalidation():
+    from vpath import VPath, CachingStorage
+    from vpath.storages import MemoryStorage
+    
+    storage = CachingStorage(MemoryStorage(""))
+    folder = VPath("/data", storage=storage)
+    file_path = folder / "a.txt"
+    
+    assert file_path.exists() is False
+    assert file_path.exists() is False
+    assert storage.hits == 1
+    
+    file_path.write_text("cached")
+    assert file_path.exists() is True
+    assert [p.name for p in folder.iterdir()] == ["a.txt"]
+    
+    hits = storage.hits
+    assert [p.name for p in folder.iterdir()] == ["a.txt"]
+    assert storage.hits == hits + 1
+    
+    (folder / "b.txt").write_text("new")
+    assert sorted(p.name for p in folder.iterdir()) == ["a.txt", "b.txt"]
+    
+    file_path.unlink()
+    assert file_path.exists() is False
+
+
+def test_lru_cache_ttl_semantics():
+    from vpath.utils import LRUCache
+    
+    disabled = LRUCache(ttl=0)
+    disabled.set("k", 1)
+    assert disabled.get("k") is None
+    
+    forever = LRUCache(ttl=None)
+    forever.set("k", 1)
+    assert forever.get("k") == 1
+
+
+def test_use_cache_enables_caching():
+    from vpath import CachingStorage
+    
+    path = FileSystem.open("mem://cached.txt?use_cache=1")
+    assert isinstance(path.storage, CachingStorage)
+    assert isinstance(FileSystem.open("mem://plain.txt").storage, CachingStorage) is False
+
+
+def test_storage_pool_reuse():
+    first = FileSystem.open("mem://pool/a.txt")
+    first.write_text("shared")
+    
+    second = FileSystem.open("mem://pool/a.txt")
+    assert second.storage is first.storage
+    assert second.read_text() == "shared"
+    
+    assert FileSystem.open("mem://pool/a.txt", pooled=False).storage is not first.storage
+    
+    FileSystem.close_all()
+    assert FileSystem.open("mem://pool/a.txt").storage is not first.storage
+    
+    from_query = FileSystem.open("mem://pool/b.txt?use_cache=1").storage
+    assert FileSystem.open("mem://pool/b.txt", use_cache=True).storage is from_query
+
+
+def test_storage_pool_closes_evicted():
+    from vpath.utils import StoragePool
+    
+    class Closable:
+        closed = False
+        
+        def close(self):
+            self.closed = True
+    
+    pool = StoragePool(maxsize=1)
+    first = Closable()
+    assert pool.put(pool.key("a", {}), first) is None
+    assert pool.put(pool.key("b", {}), Closable()) is first
+    assert pool.key("a", {"use_cache": ["yes"]}) == pool.key("a", {"use_cache": True})
+
+
+def test_local_list_dir_metadata(tmp_path):
+    (tmp_path / "folder").mkdir()
+    (tmp_path / "file.bin").write_bytes(b"12345")
+    
+    root = FileSystem.open(tmp_path.as_posix() + "/")
+    entries = {p.name: p.stat() for p in root.iterdir()}
+    
+    assert entries["folder"].is_dir is True
+    assert entries["file.bin"].is_dir is False
+    assert entries["file.bin"].st_size == 5
+
+
+def test_memory_tree_rename_moves_subtree():
+    from vpath.storages import MemoryStorage
+    
+    storage = MemoryStorage("")
+    with storage.open("/a/b/c.txt", "wb") as f:
+        f.write(b"deep")
+    storage.mkdir("/a/empty")
+    
+    assert sorted(name for name, _ in storage.list_dir("/a")) == ["b", "empty"]
+    
+    storage.rename("/a", "/moved")
+    assert storage.exists("/a") is False
+    assert storage.open("/moved/b/c.txt", "rb").read() == b"deep"
+    
+    storage.unlink("/moved/b")
+    assert [name for name, _ in storage.list_dir("/moved")] == ["empty"]
+    
+    for name in ("x", "y"):
+        with storage.open(f"/moved/empty/{name}", "wb") as f:
+            f.write(b"")
+    errors = storage.unlink_many(["/moved/empty/x", "/moved/empty", "/moved/empty/y", "/nope"])
+    assert errors[:2] == [None, None]
+    assert [type(e) for e in errors[2:]] == [FileNotFoundError, FileNotFoundError]
+
+
+def test_memory_handles_share_stored_buffer():
+    from vpath.storages import MemoryStorage
+    
+    storage = MemoryStorage("")
+    with storage.open("/blob.bin", "wb") as f:
+        f.write(b"abc")
+        f.write(memoryview(b"def"))
+    stored = storage._lookup("/blob.bin").data
+    
+    with storage.open("/blob.bin", "rb") as f:
+        assert f.getbuffer().obj is stored
+        chunk = bytearray(4)
+        assert f.readinto(chunk) == 4 and chunk == b"abcd"
+        assert f.read() == b"ef"
+    
+    with storage.open("/blob.bin", "ab") as f:
+        f.write(b"!")
+    assert storage.read_many(["/blob.bin"]) == [b"abcdef!"]
+    with storage.open("/blob.bin", "rb") as f:
+        assert f.read() is storage._lookup("/blob.bin").data
+
+
+def test_memory_update_modes():
+    from vpath.storages import MemoryStorage
+    
+    storage = MemoryStorage("")
+    with storage.open("/data.bin", "w+b") as f:
+        f.write(b"hello world")
+        f.seek(0)
+        assert f.read(5) == b"hello"
+    assert storage.read_bytes("/data.bin") == b"hello world"
+    
+    with storage.open("/data.bin", "r+b") as f:
+        assert f.read(5) == b"hello"
+        f.seek(6)
+        f.write(b"there")
+        f.seek(0)
+        assert f.read() == b"hello there"
+    assert storage.read_bytes("/data.bin") == b"hello there"
+    
+    with storage.open("/data.bin", "a+b") as f:
+        f.seek(0)
+        f.write(b"!")
+        f.seek(0)
+        assert f.read() == b"hello there!"
+    with pytest.raises(FileNotFoundError):
+        storage.open("/missing.bin", "r+b")
+    with pytest.raises(FileExistsError):
+        storage.open("/data.bin", "x+b")
+    
+    path = FileSystem.open("mem://update/notes.txt", pooled=False)
+    path.write_text("abc")
+    with path.open("r+") as f:
+        assert f.read() == "abc"
+        f.write("def")
+    assert path.read_text() == "abcdef"
+
+
+@pytest.mark.parametrize("backend", ["mem", "local"])
+def test_whole_file_fast_paths(backend, tmp_path):
+    if backend == "mem":
+        root = FileSystem.open("mem://fast/", pooled=False)
+    else:
+        root = FileSystem.open(tmp_path.as_posix() + "/", pooled=False)
+    root.storage.open = None  # Быстрые пути не должны открывать файловый объект
+    
+    target = root / "cfg" / "app.ini"
+    assert target.write_bytes(b"a=1\r\nb=2\rc=3\n") == 13
+    assert target.read_bytes() == b"a=1\r\nb=2\rc=3\n"
+    assert target.read_text() == "a=1\nb=2\nc=3\n"
+    
+    target.write_text("x\ny", newline="\r\n")
+    assert target.read_bytes() == b"x\r\ny"
+
+
+@pytest.mark.parametrize("backend", ["mem", "local"])
+def test_map_gives_read_only_view(backend, tmp_path):
+    import mmap
+    
+    if backend == "mem":
+        root = FileSystem.open("mem://mapped/", pooled=False)
+    else:
+        root = FileSystem.open(tmp_path.as_posix() + "/")
+    index = root / "index.bin"
+    index.write_bytes(b"header\nrecord-1\nrecord-2\n")
+    
+    with index.map() as view:
+        assert view.readonly and view[7:15] == b"record-1"
+        if backend == "local":
+            assert isinstance(view.obj, mmap.mmap)
+    
+    with index.open("rb", mmap=True) as f:
+        f.seek(7)
+        assert f.readline() == b"record-1\n"
+    with index.open("r", mmap=True) as f:
+        assert f.readlines()[-1] == "record-2\n"
+    with pytest.raises(ValueError):
+        index.open("wb", mmap=True)
+    
+    (root / "empty.bin").write_bytes(b"")
+    assert len((root / "empty.bin").map()) == 0
+
+
+@pytest.mark.parametrize("backend", ["mem", "local"])
+def test_walk_glob_rglob(backend, tmp_path):
+    if backend == "mem":
+        root = FileSystem.open("mem://glob/", pooled=False)
+    else:
+        root = FileSystem.open(tmp_path.as_posix() + "/")
+    for name in ("a.py", "b.txt", "pkg/c.py", "pkg/sub/d.py", "skip/e.py"):
+        (root / name).write_text(name)
+    
+    assert sorted(p.name for p in root.glob("*.py")) == ["a.py"]
+    assert sorted(p.name for p in root.glob("*/*.py")) == ["c.py", "e.py"]
+    assert sorted(p.name for p in root.rglob("*.py")) == ["a.py", "c.py", "d.py", "e.py"]
+    assert sorted(p.name for p in root.glob("pkg/**/*.py")) == ["c.py", "d.py"]
+    
+    seen = []
+    for top, dirs, files in root.walk():
+        if "skip" in dirs:
+            dirs.remove("skip")
+        seen.extend(files)
+    assert sorted(seen) == ["a.py", "b.txt", "c.py", "d.py"]
+
+
+def test_chroot_and_mount_walk():
+    from vpath import VPath, MountStorage
+    from vpath.storages import MemoryStorage
+    
+    data = MemoryStorage("")
+    with data.open("/inner/x.log", "wb") as f:
+        f.write(b"x")
+    
+    jail = VPath("/inner", storage=data).chroot()
+    assert [p.as_posix() for p in jail.rglob("*.log")] == ["/x.log"]
+    
+    mounts = MountStorage()
+    mounts.mount("data", data)
+    root = VPath("/", storage=mounts)
+    assert [p.as_posix() for p in root.rglob("*.log")] == ["/data/inner/x.log"]
+
+
+def test_nested_mounts_route_longest_prefix():
+    from vpath import VPath, MountStorage
+    from vpath.storages import MemoryStorage
+    
+    cold, hot, logs = MemoryStorage(""), MemoryStorage(""), MemoryStorage("")
+    mounts = MountStorage()
+    mounts.mount("data", cold)
+    mounts.mount("data/hot", hot)
+    mounts.mount("var/log/app", logs)
+    root = VPath("/", storage=mounts)
+    
+    (root / "data/a.txt").write_text("cold")
+    (root / "data/hot/b.txt").write_text("hot")
+    (root / "var/log/app/c.log").write_text("log")
+    assert hot.exists("/b.txt") and cold.exists("/a.txt") and not cold.exists("/hot")
+    
+    assert sorted(p.name for p in root.iterdir()) == ["data", "var"]
+    assert sorted(p.name for p in (root / "data").iterdir()) == ["a.txt", "hot"]
+    assert [p.name for p in (root / "var/log").iterdir()] == ["app"]
+    assert (root / "var/log").stat().is_dir and (root / "var").exists()
+    assert (root / "nowhere").exists() is False
+    assert sorted(p.as_posix() for p in root.rglob("*.*")) == [
+        "/data/a.txt", "/data/hot/b.txt", "/var/log/app/c.log"]
+    
+    with pytest.raises(PermissionError):
+        (root / "var/log").unlink()
+    mounts.unmount("var/log/app")
+    assert sorted(mounts.mounts) == ["/data", "/data/hot"]
+    assert (root / "var").exists() is False
+
+
+def test_batch_operations_report_errors_per_item(tmp_path):
+    (tmp_path / "a.txt").write_bytes(b"aa")
+    (tmp_path / "b.txt").write_bytes(b"b")
+    root = tmp_path.as_posix()
+    
+    paths = [f"{root}/a.txt", f"{root}/missing.txt", "mem://batch/c.txt", f"{root}/b.txt"]
+    FileSystem.open("mem://batch/c.txt").write_text("ccc")
+    
+    stats = FileSystem.stat_many(paths)
+    assert [s.st_size for s in stats if not isinstance(s, Exception)] == [2, 3, 1]
+    assert isinstance(stats[1], FileNotFoundError)
+    
+    assert FileSystem.exists_many(paths) == [True, False, True, True]
+    assert FileSystem.read_many(paths)[3] == b"b"
+    
+    errors = FileSystem.unlink_many(paths)
+    assert isinstance(errors[1], FileNotFoundError)
+    assert FileSystem.exists_many(paths) == [False, False, False, False]
+
+
+def test_multi_storage_index_and_bloom():
+    from vpath import VPath, MultiStorage, StorageWrapper
+    from vpath.storages import MemoryStorage
+    
+    class Counting(StorageWrapper):
+        calls = 0
+        
+        def get_info(self, path):
+            Counting.calls += 1
+            return self.wrapped.get_info(path)
+        
+        def exists(self, path):
+            Counting.calls += 1
+            return self.wrapped.exists(path)
+    
+    base = MemoryStorage("")
+    with base.open("/etc/base.conf", "wb") as f:
+        f.write(b"base")
+    
+    overlay = MultiStorage()
+    overlay.add_layer(Counting(base))
+    overlay.add_layer(Counting(MemoryStorage("")))
+    overlay.build_bloom()
+    
+    conf = VPath("/etc/base.conf", storage=overlay)
+    assert conf.read_text() == "base"
+    Counting.calls = 0
+    assert conf.exists() is True
+    assert VPath("/etc/missing", storage=overlay).exists() is False
+    assert Counting.calls == 0
+    
+    conf.write_text("patched")
+    assert conf.read_text() == "patched"
+    assert overlay.get_info("/etc/base.conf")["size"] == len("patched")
+    
+    conf.unlink()
+    assert conf.exists() is False
+    with pytest.raises(FileNotFoundError):
+        list(overlay.list_dir("/nowhere"))
+    
+    class Unreadable(MemoryStorage):
+        def _scan_dir(self, path, match):
+            if path != "/":
+                raise PermissionError(path)
+            return super()._scan_dir(path, match)
+    
+    locked = Unreadable("")
+    locked.mkdir("/secret")
+    overlay.add_layer(locked)
+    with pytest.raises(PermissionError):
+        overlay.build_bloom(0)
+    assert overlay._blooms[0] is None
+    
+    # Предки добавленного пути попадают в фильтр, даже если сам родитель — ложное срабатывание
+    overlay._blooms[1].add("/new/dir")
+    overlay._add_to_bloom(1, "/new/dir/file")
+    assert "/new" in overlay._blooms[1]
+
+
+def test_multi_storage_bloom_skips_linked_layers(tmp_path):
+    from vpath import VPath, MultiStorage
+    from vpath.storages import LocalStorage
+    
+    (tmp_path / "real").mkdir()
+    (tmp_path / "real" / "data.txt").write_text("linked")
+    (tmp_path / "link").symlink_to(tmp_path / "real", target_is_directory=True)
+    
+    overlay = MultiStorage()
+    overlay.add_layer(LocalStorage(tmp_path.as_posix()))
+    overlay.build_bloom()
+    assert overlay._blooms[0] is None
+    assert VPath("/link/data.txt", storage=overlay).read_text() == "linked"
+
+
+def test_copy_to_and_move_to_across_mounts(tmp_path):
+    from vpath import VPath, MountStorage
+    from vpath.storages import MemoryStorage, LocalStorage
+    
+    mem = MemoryStorage("")
+    mounts = MountStorage()
+    mounts.mount("mem", mem)
+    mounts.mount("disk", LocalStorage(tmp_path))
+    root = VPath("/", storage=mounts)
+    
+    (root / "mem/src/a.txt").write_text("a")
+    (root / "mem/src/deep/b.bin").write_bytes(b"b" * 10)
+    (root / "mem/src/empty").mkdir()
+    
+    copied = (root / "mem/src").copy_to(root / "disk/dst")
+    assert (tmp_path / "dst/deep/b.bin").read_bytes() == b"b" * 10
+    assert (tmp_path / "dst/empty").is_dir()
+    assert (copied / "a.txt").read_text() == "a"
+    
+    # Копия внутри памяти делит неизменяемый буфер с оригиналом
+    (root / "mem/src/a.txt").copy_to("/mem/twin.txt")
+    assert mem._node("/twin.txt").data is mem._node("/src/a.txt").data
+    
+    (root / "disk/dst").move_to(root / "mem/moved")
+    assert not (tmp_path / "dst").exists()
+    assert (root / "mem/moved/deep/b.bin").read_bytes() == b"b" * 10
+
+
+@pytest.mark.parametrize("backend", ["mem", "local"])
+def test_copy_onto_itself_is_rejected(backend, tmp_path):
+    import os
+    import shutil
+    from vpath.storages import LocalStorage
+    
+    root = FileSystem.open("mem://self-copy/", pooled=False) if backend == "mem" else FileSystem.open(tmp_path.as_posix() + "/")
+    (root / "dir/a.txt").write_bytes(b"hello world")
+    (root / "dir/sub/b.txt").write_bytes(b"b")
+    for src, dest in [("dir/a.txt", "dir/a.txt"), ("dir/a.txt", "dir/./a.txt"), ("dir", "dir/"), ("dir", "dir/sub/x")]:
+        with pytest.raises(OSError):
+            (root / src).copy_to(root / dest)
+    with pytest.raises(shutil.SameFileError):
+        root.storage.copy("dir/a.txt", "dir/a.txt")
+    assert (root / "dir/a.txt").read_bytes() == b"hello world"
+    assert (root / "dir/sub/b.txt").read_bytes() == b"b"
+    
+    if backend == "local":
+        # Тот же файл под другим именем: ловит samefile, а не сравнение путей
+        os.symlink(tmp_path / "dir/a.txt", tmp_path / "link.txt")
+        with pytest.raises(shutil.SameFileError):
+            LocalStorage(tmp_path).copy("link.txt", "dir/a.txt")
+        assert (tmp_path / "dir/a.txt").read_bytes() == b"hello world"
+
+
+@pytest.mark.parametrize("backend", ["mem", "local"])
+def test_streaming_chunks_lines_records(backend, tmp_path):
+    root = FileSystem.open("mem://stream/", pooled=False) if backend == "mem" else FileSystem.open(tmp_path.as_posix() + "/")
+    path = root / "data.txt"
+    path.write_bytes(b"alpha\r\nbeta\n\ngamma")
+    
+    chunks = list(path.iter_chunks(4))
+    assert [len(c) for c in chunks] == [4, 4, 4, 4, 2]
+    if backend == "mem":  # Срезы хранимого буфера, без копий
+        assert all(c.obj is chunks[0].obj for c in chunks)
+    assert list(path.iter_lines(size=3)) == ["alpha", "beta", "", "gamma"]
+    assert list(path.iter_records(b"\n", size=5, keepends=True)) == [b"alpha\r\n", b"beta\n", b"\n", b"gamma"]
+
+
+def test_metrics_storage_per_mount():
+    from vpath import VPath, MountStorage, MetricsStorage
+    from vpath.storages import MemoryStorage
+    from vpath.middleware.metrics import render_prometheus
+    
+    hot = MetricsStorage(MemoryStorage(""), labels={"mount": "hot"})
+    cold = MetricsStorage(MemoryStorage(""), labels={"mount": "cold"})
+    mounts = MountStorage()
+    mounts.mount("hot", hot)
+    mounts.mount("cold", cold)
+    root = VPath("/", storage=mounts)
+    
+    (root / "hot/a.bin").write_bytes(b"12345")
+    with (root / "hot/a.bin").open("rb") as f:
+        assert f.read(2) == b"12" and f.read() == b"345"
+    with pytest.raises(FileNotFoundError):
+        (root / "cold/missing").stat()
+    assert [p.name for p in (root / "hot").iterdir()] == ["a.bin"]
+    
+    snap = hot.snapshot()
+    assert snap["bytes"] == {"read": 5, "written": 5}
+    assert snap["methods"]["open"]["calls"] == 1
+    assert snap["methods"]["list_dir"]["buckets"][float("inf")] == 1
+    assert cold.snapshot()["methods"]["get_info"]["errors"] == 1
+    
+    text = render_prometheus([hot, cold])
+    assert text.count("# TYPE vpath_calls_total counter") == 1
+    assert 'vpath_errors_total{mount="cold",method="get_info"} 1' in text
+    assert 'vpath_bytes_total{mount="hot",direction="read"} 5' in text
+
+
+def test_trace_and_replay(tmp_path):
+    import io
+    import json
+    from vpath import VPath, TraceStorage
+    from vpath.storages import MemoryStorage
+    from vpath.replay import load_trace, replay
+    
+    sink = io.StringIO()
+    root = VPath("/", storage=TraceStorage(MemoryStorage(""), sink))
+    (root / "logs").mkdir()
+    (root / "logs/a.txt").write_bytes(b"abc")
+    with (root / "logs/b.txt").open("wb") as f:
+        f.write(b"12345")
+    assert sorted(p.name for p in (root / "logs").iterdir()) == ["a.txt", "b.txt"]
+    assert not (root / "missing").exists()
+    with pytest.raises(FileNotFoundError):
+        (root / "missing").read_bytes()
+    
+    events = list(load_trace(sink.getvalue().splitlines()))
+    assert [e["op"] for e in events] == ["mkdir", "write_bytes", "open", "list_dir", "exists", "read_bytes"]
+    assert events[2]["bytes"] == 5 and events[2]["args"] == {"mode": "wb"}
+    assert events[-1]["error"] == "FileNotFoundError"
+    
+    trace = tmp_path / "trace.jsonl"
+    trace.write_text(sink.getvalue())
+    report = replay(load_trace(str(trace)), "mem://replay/")
+    summary = report.summary()
+    assert summary["ops"] == 6 and summary["errors"] == 1
+    assert summary["operations"]["open"]["count"] == 1 and report.bytes == 8
+    json.dumps(summary)
+
+
+def test_lazy_imports_and_entry_point_cache(tmp_path, monkeypatch):
+    import subprocess
+    import sys
+    import importlib.metadata
+    from vpath.utils import cached_entry_points, _environment_key
+    
+    code = ("import sys, vpath, avpath; "
+            "print(sorted(m for m in sys.modules if m.split('.')[0] in ('vpath', 'avpath', 'anyio', 'aiofiles')))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "['avpath', 'avpath.utils', 'vpath', 'vpath.utils']"
+    
+    import vpath
+    assert "MultiStorage" in dir(vpath) and vpath.MultiStorage.__name__ == "MultiStorage"
+    with pytest.raises(AttributeError):
+        vpath.Missing
+    
+    calls = []
+    real = importlib.metadata.entry_points
+    monkeypatch.setattr(importlib.metadata, "entry_points", lambda **kw: calls.append(kw) or real(**kw))
+    monkeypatch.setenv("VPATH_CACHE_DIR", str(tmp_path))
+    interpreter, state = _environment_key()
+    (tmp_path / f"entry_points-{interpreter}-0000.json").write_text("{}")
+    (tmp_path / "entry_points-other-0000.json").write_text("{}")
+    first = cached_entry_points("console_scripts")
+    second = cached_entry_points("console_scripts")
+    assert calls == [{"group": "console_scripts"}]
+    assert [(e.name, e.value, e.group) for e in first] == [(e.name, e.value, e.group) for e in second]
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([
+        "entry_points-other-0000.json", f"entry_points-{interpreter}-{state}.json"])
+    
+    # вторая группа дописывается в тот же файл, не вытесняя первую
+    cached_entry_points("vpath.sync_drivers")
+    cached_entry_points("vpath.sync_drivers")
+    cached_entry_points("console_scripts")
+    assert calls == [{"group": "console_scripts"}, {"group": "vpath.sync_drivers"}]
+
+
+def test_url_parse_cache_and_resolver(tmp_path):
+    from vpath.utils import URLParser
+    
+    urls = ["mem://bucket/a/b.bin", "mem:///x/y", "file:///srv/a.csv", "/srv/a/", "/",
+            "mem://b/a?use_cache=1", "rel/x.txt", "mem://user:pw@host:1/a"]
+    for url in urls:
+        assert URLParser.parse(url) == URLParser._parse_full(url)
+    parsed = URLParser.parse("mem://bucket/a/b.bin")
+    assert parsed is URLParser.parse("mem://bucket/a/b.bin")
+    assert parsed.folder == "bucket/a" and parsed.ext == ".bin"
+    with pytest.raises(TypeError):
+        parsed.kwargs["host"] = "other"
+    
+    resolve = FileSystem.resolver(tmp_path.as_posix() + "/data")
+    assert resolve.root == tmp_path.as_posix() + "/data"
+    resolve("logs/a.txt").write_text("hello")
+    assert FileSystem.open(tmp_path.as_posix() + "/data/logs/a.txt").read_text() == "hello"
+    assert resolve("logs", "a.txt").storage is resolve.storage
+    with pytest.raises(ValueError):
+        FileSystem.resolver("nope://x")
+
+
+def test_derived_paths_keep_storage():
+    from vpath import VPath
+    from vpath.storages import MemoryStorage
+    
+    storage = MemoryStorage("")
+    base = VPath("/data/reports", storage=storage)
+    derived = [base / "a.txt", base.joinpath("x", "y.csv"), base.parent, base.with_name("logs"),
+               (base / "a.txt").with_suffix(".gz"), base.parents[0], base / "/abs"]
+    assert [str(p) for p in derived] == ["/data/reports/a.txt", "/data/reports/x/y.csv", "/data", "/data/logs",
+                                         "/data/reports/a.gz", "/data", "/abs"]
+    assert all(p.storage is storage for p in derived[:5])
+    assert VPath("/").parent == VPath("/")
+    
+    (base / "a.txt").write_bytes(b"abc")
+    (base / "sub").mkdir()
+    children = sorted(base.iterdir())
+    assert children == [VPath("/data/reports/a.txt"), VPath("/data/reports/sub")]
+    assert children[0].stat().st_size == 3 and children[0].storage is storage
+    assert children[0].parts == ("/", "data", "reports", "a.txt") and hash(children[0]) == hash(derived[0])
+    assert [p.name for p in base.glob("*.txt")] == ["a.txt"]
+
+
+def test_entry_info_and_listing_batch(tmp_path):
+    from vpath.utils import EntryInfo, ListingBatch, VStat
+    from vpath.storages import LocalStorage
+    
+    info = EntryInfo("a.txt", "file", 3, 1.5)
+    assert info["size"] == 3 and info.get("mount") is None and info[0] == "a.txt"
+    assert dict(info) == {"name": "a.txt", "type": "file", "size": 3, "mtime": 1.5}
+    assert "type" in info and "file" not in info
+    with pytest.raises(KeyError):
+        info["mount"]
+    
+    # Старые хранилища с dict и новые с EntryInfo читаются одинаково
+    for data in (info, {"name": "a.txt", "type": "file", "size": 3, "mtime": 1.5}):
+        stat = VStat(data)
+        assert (stat.st_size, stat.st_mtime, stat.is_dir, stat.name, stat["type"]) == (3, 1.5, False, "a.txt", "file")
+    assert VStat({"type": "dir", "mount": True}).mount is True
+    
+    batch = ListingBatch.from_entries([("a.txt", info), ("d", {"type": "dir", "size": 0, "mtime": 2.0}),
+                                       ("?", None), ("l", {"type": "symlink"})])
+    assert len(batch) == 4 and batch.sizes.tolist() == [3, 0, 0, 0]
+    assert list(batch) == [("a.txt", info), ("d", EntryInfo("d", "dir", 0, 2.0)), ("?", None),
+                           ("l", EntryInfo("l", "symlink"))]
+    assert batch[1][1].is_dir and batch.entry(2) is None
+    
+    (tmp_path / "x.bin").write_bytes(b"12345")
+    (tmp_path / "sub").mkdir()
+    local = LocalStorage(tmp_path)
+    entries = dict(local.list_dir("/"))
+    assert isinstance(entries["x.bin"], EntryInfo) and entries["x.bin"].size == 5 and entries["sub"].is_dir
+    assert local.get_info("/x.bin") == entries["x.bin"]
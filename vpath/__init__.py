@@ -1,4 +1,25 @@
-from .paths import VPath
-from .storage import Storage
-from .factory import FileSystem
-from .middleware import *
+from typing import TYPE_CHECKING
+
+from .utils import lazy_exports
+
+# Имена пакета импортируются при первом обращении: `import vpath` не тянет middleware.
+_EXPORTS = {
+    "VPath": ".paths",
+    "Storage": ".storage",
+    "FileSystem": ".factory",
+    "StorageWrapper": ".middleware",
+    "SubStorage": ".middleware",
+    "MountStorage": ".middleware",
+    "MultiStorage": ".middleware",
+    "CachingStorage": ".middleware",
+    "MetricsStorage": ".middleware",
+    "TraceStorage": ".middleware",
+}
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .paths import VPath
+    from .storage import Storage
+    from .factory import FileSystem
+    from .middleware import *
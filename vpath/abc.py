@@ -4,17 +4,23 @@ from typing import Optional, Self
 
 from attrs import define
 
+from .utils import as_bool
+
 
 class BaseStorage(ABC):
     def __init__(self, use_cache=False, **kwargs):
-        self.use_cache = use_cache
+        self.use_cache = as_bool(use_cache)
 
 
 @define
 class BaseStorageContainer(ABC):
-    def get_storage(self, root: str, **kwargs) -> BaseStorage: ...
+    def get_storage(self, root: str, pooled: bool = True, **kwargs) -> BaseStorage: ...
+    
+    async def async_get_storage(self, root: str, pooled: bool = True, **kwargs) -> BaseStorage: ...
+    
+    def close_all(self): ...
     
-    async def async_get_storage(self, root: str, **kwargs) -> BaseStorage: ...
+    async def async_close_all(self): ...
 
 
 class BaseVPath(PurePosixPath, ABC):
@@ -33,13 +39,56 @@ class BaseVPath(PurePosixPath, ABC):
         obj._info_cache = None
         return obj
     
+    @classmethod
+    def _from_parsed_parts(cls, drv, root, parts):
+        obj = super()._from_parsed_parts(drv, root, parts)
+        obj._storage = None
+        obj._info_cache = None
+        return obj
+    
+    def _derive(self, drv: str, root: str, parts: list[str], info_cache=None) -> Self:
+        """Путь из уже разобранных частей с хранилищем этого пути — без разбора строк."""
+        obj = object.__new__(type(self))
+        obj._drv = drv
+        obj._root = root
+        obj._parts = parts
+        obj._storage = self._storage
+        obj._info_cache = info_cache
+        return obj
+    
+    def _child(self, name: str, info_cache=None) -> Self:
+        """Дочерний путь для одного имени из листинга (iterdir, glob): части родителя плюс name."""
+        return self._derive(self._drv, self._root, self._parts + [name], info_cache)
+    
+    _make_child_relpath = _child
+    
+    def _make_child(self, args) -> Self:
+        # __truediv__ и joinpath: разбираются только новые аргументы
+        drv, root, parts = self._parse_args(args)
+        drv, root, parts = self._flavour.join_parsed_parts(self._drv, self._root, self._parts, drv, root, parts)
+        return self._derive(drv, root, parts)
+    
+    @property
+    def parent(self) -> Self:
+        parts = self._parts
+        if len(parts) == 1 and (self._drv or self._root):
+            return self
+        return self._derive(self._drv, self._root, parts[:-1])
+    
+    def with_name(self, name: str) -> Self:
+        obj = super().with_name(name)
+        obj._storage = self._storage
+        return obj
+    
+    def with_suffix(self, suffix: str) -> Self:
+        obj = super().with_suffix(suffix)
+        obj._storage = self._storage
+        return obj
+    
     @property
     def storage(self) -> BaseStorage:
         if self._storage is None: raise ValueError("VPath detached")
         return self._storage
     
-    def __truediv__(self, other) -> Self:
-        return type(self)(super().__truediv__(other), storage=self.storage)
-    
     @abstractmethod
     def chroot(self) -> Self: ...
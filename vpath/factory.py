@@ -1,23 +1,63 @@
 from __future__ import annotations
-import importlib.metadata
-from typing import Type, Optional
+import posixpath
+from typing import Iterable, Type, Optional
 
-from attrs import define
+from attrs import define, field
 
 from .abc import BaseStorageContainer
-from .utils import MetaSingleton, URLParser, LazyLoader
+from .utils import MetaSingleton, URLParser, LazyLoader, cached_entry_points, StoragePool, VStat, group_batch
 from .paths import VPath
 from .storage import Storage
+from .abc import BaseStorage
+
+
+@define(frozen=True)
+class Resolver:
+    """Префикс URL, разобранный один раз: схема, корень и хранилище уже известны."""
+    scheme: str
+    root: str
+    storage: BaseStorage
+    path_type: type
+    
+    def __call__(self, *parts: str):
+        return self.path_type(*parts, storage=self.storage)
 
 
 @define
 class DefaultStorageContainer(BaseStorageContainer):
+    """Контейнер синхронного хранилища с пулом уже созданных экземпляров."""
     storage: Type[Storage]
+    pool_size: int = 128
+    weak: bool = False
+    _pool: StoragePool = field(init=False, repr=False)
+    
+    def __attrs_post_init__(self):
+        self._pool = StoragePool(self.pool_size, self.weak)
     
-    def get_storage(self, root: str, **kwargs) -> Storage:
+    def get_storage(self, root: str, pooled: bool = True, **kwargs) -> Storage:
+        if not pooled:
+            return self._create(root, **kwargs)
+        key = self._pool.key(root, kwargs)
+        storage = self._pool.get(key)
+        if storage is None:
+            storage = self._create(root, **kwargs)
+            evicted = self._pool.put(key, storage)
+            if evicted is not None:
+                evicted.close()
+        return storage
+    
+    def _create(self, root: str, **kwargs) -> Storage:
         if not isinstance(self.storage, type) and hasattr(self.storage, 'load'):
             self.storage = self.storage.load()
-        return self.storage(root, **kwargs)
+        storage = self.storage(root, **kwargs)
+        if storage.use_cache:
+            from .middleware import CachingStorage
+            storage = CachingStorage(storage)
+        return storage
+    
+    def close_all(self):
+        for storage in self._pool.drain():
+            storage.close()
 
 
 class FileSystem(metaclass=MetaSingleton):
@@ -42,16 +82,68 @@ class FileSystem(metaclass=MetaSingleton):
         cls._registry[scheme] = container
     
     @classmethod
-    def open(cls, url: str, **kwargs) -> VPath:
-        cls._ensure_loaded()
+    def open(cls, url: str, pooled: bool = True, **kwargs) -> VPath:
+        """
+        Открывает путь по URL. Хранилища переиспользуются между вызовами
+        с одинаковыми (root, kwargs); pooled=False создает новый экземпляр.
+        """
         scheme, folder, file, _, url_args = URLParser.parse(url)
-        
-        if scheme not in cls._registry:
+        storage = cls._container(scheme).get_storage(root=folder, pooled=pooled, **{**url_args, **kwargs})
+        return VPath(file, storage=storage)
+    
+    @classmethod
+    def resolver(cls, url_prefix: str, pooled: bool = True, **kwargs) -> Resolver:
+        """
+        Привязывается к префиксу (он считается директорией) и возвращает Resolver:
+        resolver("a/b.txt") строит путь без разбора URL и без обращения к пулу.
+        """
+        scheme, folder, file, _, url_args = URLParser.parse(url_prefix)
+        root = posixpath.join(folder, file) if file else folder
+        storage = cls._container(scheme).get_storage(root=root, pooled=pooled, **{**url_args, **kwargs})
+        return Resolver(scheme, root, storage, VPath)
+    
+    @classmethod
+    def _container(cls, scheme: str) -> BaseStorageContainer:
+        cls._ensure_loaded()
+        container = cls._registry.get(scheme)
+        if container is None:
             raise ValueError(f"Sync driver for '{scheme}' not found")
+        return container
+    
+    @classmethod
+    def stat_many(cls, paths: Iterable[str | VPath]) -> list[VStat | Exception]:
+        """Пакетный stat: по одному пакетному вызову на хранилище, ошибки — на месте элемента."""
+        return [r if isinstance(r, Exception) else VStat(r) for r in cls._many("get_info_many", paths)]
+    
+    @classmethod
+    def exists_many(cls, paths: Iterable[str | VPath]) -> list[bool | Exception]:
+        return cls._many("exists_many", paths)
+    
+    @classmethod
+    def unlink_many(cls, paths: Iterable[str | VPath]) -> list[None | Exception]:
+        return cls._many("unlink_many", paths)
+    
+    @classmethod
+    def read_many(cls, paths: Iterable[str | VPath]) -> list[bytes | Exception]:
+        return cls._many("read_many", paths)
+    
+    @classmethod
+    def _many(cls, method: str, paths: Iterable[str | VPath]) -> list:
+        def route(item):
+            path = item if isinstance(item, VPath) else cls.open(item)
+            return path.storage, path.as_posix()
         
-        container = cls._registry[scheme]
-        storage = container.get_storage(root=folder, **{**url_args, **kwargs})
-        return VPath(file, storage=storage)
+        results, groups = group_batch(paths, route)
+        for storage, slots, posix_paths in groups:
+            for i, res in zip(slots, getattr(storage, method)(posix_paths)):
+                results[i] = res
+        return results
+    
+    @classmethod
+    def close_all(cls):
+        """Закрывает и забывает все хранилища из пулов контейнеров."""
+        for container in cls._registry.values():
+            container.close_all()
     
     @classmethod
     def _ensure_loaded(cls):
@@ -59,6 +151,6 @@ class FileSystem(metaclass=MetaSingleton):
         for s, path in cls._built_in.items():
             if s not in cls._registry:
                 cls.add_container(s, DefaultStorageContainer(LazyLoader(path)))
-        for entry in importlib.metadata.entry_points(group='vpath.sync_drivers'):
+        for entry in cached_entry_points('vpath.sync_drivers'):
             cls.add_container(entry.name, DefaultStorageContainer(entry))
         cls._loaded = True
@@ -1,4 +1,24 @@
-from .wrap import StorageWrapper
-from .sub import SubStorage
-from .mount import MountStorage
-from .multi import MultiStorage
+from typing import TYPE_CHECKING
+
+from ..utils import lazy_exports
+
+_EXPORTS = {
+    "StorageWrapper": ".wrap",
+    "SubStorage": ".sub",
+    "MountStorage": ".mount",
+    "MultiStorage": ".multi",
+    "CachingStorage": ".cache",
+    "MetricsStorage": ".metrics",
+    "TraceStorage": ".trace",
+}
+__all__ = list(_EXPORTS)
+__getattr__, __dir__ = lazy_exports(__name__, _EXPORTS)
+
+if TYPE_CHECKING:
+    from .wrap import StorageWrapper
+    from .sub import SubStorage
+    from .mount import MountStorage
+    from .multi import MultiStorage
+    from .cache import CachingStorage
+    from .metrics import MetricsStorage
+    from .trace import TraceStorage
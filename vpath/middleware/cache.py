@@ -0,0 +1,89 @@
+from typing import Any, Iterator, Optional
+
+from ..storage import Storage
+from ..utils import FileProxy
+from .mixins import CacheLogicMixin
+from .wrap import StorageWrapper
+
+
+class CachingStorage(StorageWrapper, CacheLogicMixin):
+    """
+    Кэширует get_info/exists/list_dir обернутого хранилища.
+    Любая запись через это хранилище сбрасывает затронутые пути и их родителей.
+    """
+    
+    def __init__(self, wrapped: Storage, maxsize: int = 4096, ttl: Optional[float] = 5.0):
+        StorageWrapper.__init__(self, wrapped)
+        CacheLogicMixin.__init__(self, maxsize, ttl)
+    
+    def get_info(self, path: str) -> dict[str, Any]:
+        key = ("info", self._key(path))
+        info = self._cache.get(key)
+        if info is None:
+            info = self.wrapped.get_info(path)
+            self._cache.set(key, info)
+        return info
+    
+    def exists(self, path: str) -> bool:
+        key = ("exists", self._key(path))
+        found = self._cache.get(key)
+        if found is None:
+            found = self.wrapped.exists(path)
+            self._cache.set(key, found)
+        return found
+    
+    def list_dir(self, path: str) -> Iterator[tuple[str, Optional[dict]]]:
+        entries = self._cache.get(("list", self._key(path)))
+        if entries is None:
+            entries = list(self.wrapped.list_dir(path))
+            self._remember_listing(path, entries)
+        yield from entries
+    
+    def open(self, path: str, mode: str = "r") -> Any:
+        if not any(m in mode for m in "wax+"):
+            return self.wrapped.open(path, mode)
+        self._invalidate(path)
+        return FileProxy(self.wrapped.open(path, mode), lambda: self._invalidate(path))
+    
+    def write_bytes(self, path: str, data: bytes):
+        try:
+            return self.wrapped.write_bytes(path, data)
+        finally:
+            self._invalidate(path)
+    
+    def copy(self, src: str, dest: str, source: Optional[Storage] = None):
+        try:
+            return StorageWrapper.copy(self, src, dest, source)
+        finally:
+            self._invalidate(dest)
+    
+    def unlink(self, path: str):
+        try:
+            return self.wrapped.unlink(path)
+        finally:
+            self._invalidate(path, subtree=True)
+    
+    def mkdir(self, path: str, mode=0o777, parents=False, exist_ok=False):
+        try:
+            return self.wrapped.mkdir(path, mode, parents, exist_ok)
+        finally:
+            self._invalidate(path)
+    
+    # Чтение метаданных пакетом идет через кэш, поэлементно
+    get_info_many = Storage.get_info_many
+    exists_many = Storage.exists_many
+    
+    def unlink_many(self, paths):
+        paths = list(paths)
+        try:
+            return self.wrapped.unlink_many(paths)
+        finally:
+            for path in paths:
+                self._invalidate(path, subtree=True)
+    
+    def rename(self, src: str, dest: str):
+        try:
+            return self.wrapped.rename(src, dest)
+        finally:
+            self._invalidate(src, subtree=True)
+            self._invalidate(dest, subtree=True)
@@ -0,0 +1,106 @@
+from time import perf_counter
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from ..storage import Storage
+from ..utils import CountingFile
+from .mixins import MetricsLogicMixin, render_prometheus
+from .wrap import StorageWrapper
+
+
+class MetricsStorage(StorageWrapper, MetricsLogicMixin):
+    """
+    Снимает метрики с обернутого хранилища: вызовы, ошибки, гистограммы задержек
+    и байты по каждому методу. Метки (labels) различают экземпляры, например
+    точки монтирования: mounts.mount("data", MetricsStorage(s, labels={"mount": "data"})).
+    Для итераторов (list_dir, walk, iter_chunks) учитывается только время внутри next().
+    """
+    
+    def __init__(self, wrapped: Storage, labels: Optional[dict[str, str]] = None,
+                 buckets: Optional[Iterable[float]] = None):
+        StorageWrapper.__init__(self, wrapped)
+        MetricsLogicMixin.__init__(self, labels, buckets)
+    
+    def _timed(self, method: str, func: Callable, *args) -> Any:
+        start = perf_counter()
+        failed = True
+        try:
+            result = func(*args)
+            failed = False
+            return result
+        finally:
+            self._observe(method, perf_counter() - start, failed)
+    
+    def _timed_iter(self, method: str, it: Iterator) -> Iterator:
+        """Время — сумма всех next(); ошибка на любом шаге считается ошибкой вызова."""
+        elapsed, failed = 0.0, True
+        try:
+            start = perf_counter()
+            it = iter(it)
+            elapsed += perf_counter() - start
+            while True:
+                start = perf_counter()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    elapsed += perf_counter() - start
+                    failed = False
+                    return
+                elapsed += perf_counter() - start
+                yield item
+        except GeneratorExit:
+            failed = False
+            raise
+        finally:
+            self._observe(method, elapsed, failed)
+    
+    def get_info(self, path): return self._timed("get_info", self.wrapped.get_info, path)
+    
+    def exists(self, path): return self._timed("exists", self.wrapped.exists, path)
+    
+    def list_dir(self, path): return self._timed_iter("list_dir", self.wrapped.list_dir(path))
+    
+    def walk(self, path, pattern=None, onerror=None):
+        return self._timed_iter("walk", self.wrapped.walk(path, pattern, onerror))
+    
+    def open(self, path, mode="r"):
+        return CountingFile(self._timed("open", self.wrapped.open, path, mode), self._count_bytes)
+    
+    def unlink(self, path): return self._timed("unlink", self.wrapped.unlink, path)
+    
+    def mkdir(self, path, mode=0o777, parents=False, exist_ok=False):
+        return self._timed("mkdir", self.wrapped.mkdir, path, mode, parents, exist_ok)
+    
+    def rename(self, src, dest): return self._timed("rename", self.wrapped.rename, src, dest)
+    
+    def copy(self, src, dest, source=None):
+        return self._timed("copy", StorageWrapper.copy, self, src, dest, source)
+    
+    def get_info_many(self, paths): return self._timed("get_info_many", self.wrapped.get_info_many, paths)
+    
+    def exists_many(self, paths): return self._timed("exists_many", self.wrapped.exists_many, paths)
+    
+    def unlink_many(self, paths): return self._timed("unlink_many", self.wrapped.unlink_many, paths)
+    
+    def read_many(self, paths):
+        results = self._timed("read_many", self.wrapped.read_many, paths)
+        self._count_bytes("read", sum(len(r) for r in results if not isinstance(r, Exception)))
+        return results
+    
+    def read_bytes(self, path):
+        data = self._timed("read_bytes", self.wrapped.read_bytes, path)
+        self._count_bytes("read", len(data))
+        return data
+    
+    def write_bytes(self, path, data):
+        self._timed("write_bytes", self.wrapped.write_bytes, path, data)
+        self._count_bytes("written", len(data))
+    
+    def map(self, path):
+        view = self._timed("map", self.wrapped.map, path)
+        self._count_bytes("read", view.nbytes)
+        return view
+    
+    def iter_chunks(self, path, size):
+        for chunk in self._timed_iter("iter_chunks", self.wrapped.iter_chunks(path, size)):
+            self._count_bytes("read", len(chunk))
+            yield chunk
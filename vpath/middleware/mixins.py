@@ -1,6 +1,13 @@
 import os
+import json
+import time
+import bisect
+import posixpath
+import threading
 from pathlib import PurePosixPath
-from typing import Any
+from typing import Any, Iterable, Optional, TextIO
+
+from vpath.utils import LRUCache, BloomFilter
 
 
 class SubPathLogicMixin:
@@ -14,40 +21,386 @@ class SubPathLogicMixin:
         if not str(full_path).startswith(str(self.base)):
             raise PermissionError(f"Access denied: outside of {self.base}")
         return str(full_path)
+    
+    def _unfix(self, path: str) -> str:
+        """Обратное к _fix: путь обернутого хранилища -> путь внутри chroot."""
+        return "/" + path[len(str(self.base)):].lstrip("/")
+
+
+class MountNode:
+    """Узел префиксного дерева точек монтирования: ребро — один сегмент пути."""
+    __slots__ = ("children", "storage")
+    
+    def __init__(self):
+        self.children: dict[str, "MountNode"] = {}
+        self.storage: Any = None
 
 
 class MountLogicMixin:
-    """Логика монтирования (Mount Point)."""
+    """
+    Логика монтирования (Mount Point).
+    Точки хранятся в префиксном дереве по сегментам, поэтому допускаются вложенные
+    точки (/data и /data/hot), а путь разрешается одним проходом по строке:
+    выигрывает самая длинная смонтированная приставка. Корень и промежуточные
+    директории, ведущие к точкам, синтезируются.
+    """
     
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self._mounts: dict[str, Any] = {}
+    MOUNT_INFO = {"type": "dir", "size": 0, "mount": True}
+    
+    def __init__(self):
+        self._tree = MountNode()
     
     def mount(self, name: str, storage: Any):
-        self._mounts[name.strip("/")] = storage
+        node = self._tree
+        for part in name.strip("/").split("/"):
+            if part:
+                node = node.children.setdefault(part, MountNode())
+        node.storage = storage
+    
+    def unmount(self, name: str):
+        """Отключает точку монтирования и удаляет опустевшие ветви дерева."""
+        trail = [self._tree]
+        parts = [part for part in name.strip("/").split("/") if part]
+        for part in parts:
+            child = trail[-1].children.get(part)
+            if child is None:
+                raise FileNotFoundError(f"Mount point '{name}' not found")
+            trail.append(child)
+        if trail[-1].storage is None:
+            raise FileNotFoundError(f"Mount point '{name}' not found")
+        trail[-1].storage = None
+        for part, parent, node in zip(reversed(parts), reversed(trail[:-1]), reversed(trail)):
+            if node.storage is not None or node.children:
+                break
+            del parent.children[part]
+    
+    @property
+    def mounts(self) -> dict[str, Any]:
+        """Плоский словарь {точка монтирования: хранилище}."""
+        found, stack = {}, [("", self._tree)]
+        while stack:
+            prefix, node = stack.pop()
+            if node.storage is not None:
+                found[prefix or "/"] = node.storage
+            stack.extend((f"{prefix}/{name}", child) for name, child in node.children.items())
+        return found
+    
+    def _locate(self, path: str) -> tuple[Any, int, Optional[MountNode]]:
+        """
+        Один проход по строке без split: (хранилище самой длинной приставки или None,
+        позиция, с которой начинается путь внутри него, узел дерева, если путь целиком
+        совпал с узлом — т.е. ведет к точкам монтирования).
+        """
+        node = self._tree
+        storage, end = node.storage, 0
+        size, i = len(path), 0
+        children = node.children
+        while True:
+            while i < size and path[i] == "/":
+                i += 1
+            if i >= size:
+                return storage, end, node
+            j = path.find("/", i)
+            if j < 0:
+                j = size
+            if j - i == 1 and path[i] == ".":
+                i = j
+                continue
+            node = children.get(path[i:j]) if children else None
+            if node is None:
+                return storage, end, None
+            children = node.children
+            if node.storage is not None:
+                storage, end = node.storage, j
+            i = j
+    
+    def _route(self, path: str) -> tuple[Any, str, Optional[MountNode], int]:
+        """(хранилище или None, путь внутри него, узел дерева или None, длина приставки монтирования)."""
+        storage, end, node = self._locate(path)
+        return storage, (path[end:] or "/") if storage is not None else path, node, end
     
     def _resolve(self, path: str) -> tuple[Any, str]:
-        path = path.lstrip("/")
-        if not path: return None, "/"
-        parts = path.split("/", 1)
-        prefix = parts[0]
-        sub = "/" + (parts[1] if len(parts) > 1 else "")
-        if prefix in self._mounts:
-            return self._mounts[prefix], sub
-        raise FileNotFoundError(f"Mount point '{prefix}' not found")
+        """Хранилище и путь внутри него; для синтезированных директорий — (None, path)."""
+        storage, sub, node, _ = self._route(path)
+        if storage is None and node is None:
+            raise FileNotFoundError(f"Mount point for '{path}' not found")
+        return storage, sub
+    
+    def _target(self, path: str) -> tuple[Any, str]:
+        """Как _resolve, но для операций записи: точки монтирования и синтезированные директории неизменяемы."""
+        storage, sub, node, _ = self._route(path)
+        if node is not None:
+            raise PermissionError(f"'{path}' is a mount point or a virtual mount directory")
+        if storage is None:
+            raise FileNotFoundError(f"Mount point for '{path}' not found")
+        return storage, sub
+    
+    def _virtual_entries(self, node: MountNode) -> list[tuple[str, dict]]:
+        return [(name, {"name": name, **self.MOUNT_INFO}) for name in node.children]
+    
+    def _merge_entries(self, node: Optional[MountNode], entries: list) -> list:
+        """Записи хранилища, перекрытые точками монтирования, заменяются синтезированными."""
+        if node is None or not node.children:
+            return entries
+        return [e for e in entries if e[0] not in node.children] + self._virtual_entries(node)
+    
+    def _virtual_info(self, path: str) -> dict[str, Any]:
+        return {"name": path.rstrip("/").rpartition("/")[2] or "/", **self.MOUNT_INFO}
+    
+    @staticmethod
+    def _join_mount(prefix: str, sub: str) -> str:
+        """Путь из обернутого хранилища обратно в пространство MountStorage."""
+        return (prefix.rstrip("/") + "/" + sub.strip("/")).rstrip("/") or "/"
 
 
 class MultiLogicMixin:
-    """Логика Overlay (объединение слоев)."""
+    """
+    Логика Overlay (объединение слоев).
+    Индекс помнит, какой слой обслуживает путь (-1 — ни один), а необязательные
+    фильтры Блума по слоям позволяют не спрашивать слой о путях, которых в нем точно нет.
+    Индекс предполагает, что слои меняются только через overlay.
+    """
     
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, index_size: int = 65536, **kwargs):
         super().__init__(*args, **kwargs)
         self._layers: list[Any] = []
+        self._index = LRUCache(index_size)
+        self._blooms: list[Optional[BloomFilter]] = []
     
     def add_layer(self, storage: Any):
         self._layers.insert(0, storage)  # Новый слой всегда сверху (приоритет)
+        self._blooms.insert(0, None)
+        self._index.clear()
+    
+    @staticmethod
+    def _key(path: str) -> str:
+        return posixpath.normpath("/" + path.lstrip("/"))
+    
+    def _may_contain(self, layer_index: int, key: str) -> bool:
+        bloom = self._blooms[layer_index]
+        return bloom is None or key in bloom
+    
+    def _add_to_bloom(self, layer_index: int, key: str):
+        bloom = self._blooms[layer_index]
+        if bloom is not None:
+            # Без проверки "уже есть": ложное срабатывание на потомке не должно оставить предков вне фильтра
+            while True:
+                bloom.add(key)
+                if key == "/":
+                    break
+                key = posixpath.dirname(key)
+    
+    def _set_bloom(self, layer_index: int, keys: list[str], error_rate: float):
+        bloom = BloomFilter(len(keys), error_rate)
+        for key in keys:
+            bloom.add(key)
+        self._blooms[layer_index] = bloom
+    
+    def _forget(self, path: str, subtree: bool = False):
+        """Сбрасывает индекс пути, его родителей (они могли быть "нет нигде") и, при subtree, потомков."""
+        key = self._key(path)
+        current = key
+        while True:
+            self._index.pop(current)
+            if current == "/":
+                break
+            current = posixpath.dirname(current)
+        if subtree:
+            prefix = key.rstrip("/") + "/"
+            self._index.discard_if(lambda k: k.startswith(prefix))
+    
+    def _note_write(self, path: str):
+        """Путь появился в primary-слое."""
+        self._forget(path)
+        self._add_to_bloom(0, self._key(path))
     
     @property
     def primary(self) -> Any:
         if not self._layers: raise RuntimeError("No layers in OverlayStorage")
         return self._layers[0]
+
+
+class CacheLogicMixin:
+    """Логика кэширования метаданных (LRU + TTL) с инвалидацией по записи."""
+    
+    _KINDS = ("info", "exists", "list")
+    
+    def __init__(self, maxsize: int = 4096, ttl: Optional[float] = 5.0):
+        self._cache = LRUCache(maxsize, ttl)
+    
+    @staticmethod
+    def _key(path: str) -> str:
+        return "/" + path.strip("/")
+    
+    @property
+    def hits(self) -> int:
+        return self._cache.hits
+    
+    @property
+    def misses(self) -> int:
+        return self._cache.misses
+    
+    def cache_clear(self):
+        self._cache.clear()
+    
+    def _remember_listing(self, path: str, entries: list):
+        p = self._key(path)
+        self._cache.set(("list", p), entries)
+        base = p.rstrip("/")
+        for name, _ in entries:
+            self._cache.set(("exists", f"{base}/{name}"), True)
+    
+    def _invalidate(self, path: str, subtree: bool = False):
+        """Сбрасывает записи пути и всех его родителей (их листинги и mtime меняются)."""
+        p = self._key(path)
+        current = p
+        while True:
+            for kind in self._KINDS:
+                self._cache.pop((kind, current))
+            if current == "/":
+                break
+            current = current.rsplit("/", 1)[0] or "/"
+        
+        if subtree and p != "/":
+            prefix = p + "/"
+            self._cache.discard_if(lambda k: k[1].startswith(prefix))
+        elif subtree:
+            self._cache.clear()
+
+
+class MetricsLogicMixin:
+    """
+    Логика метрик: по каждому методу — число вызовов, ошибок, сумма и гистограмма
+    длительностей, плюс прочитанные и записанные байты. Запись наблюдения — пара
+    perf_counter, bisect по границам корзин и несколько сложений под блокировкой.
+    """
+    
+    BUCKETS = (1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+    
+    def __init__(self, labels: Optional[dict[str, str]] = None, buckets: Optional[Iterable[float]] = None):
+        self.labels = dict(labels or {})
+        self.buckets = tuple(sorted(buckets)) if buckets is not None else self.BUCKETS
+        self._stats: dict[str, list] = {}  # method -> [calls, errors, seconds, counts по корзинам + inf]
+        self._bytes = {"read": 0, "written": 0}
+        self._lock = threading.Lock()
+    
+    def _observe(self, method: str, elapsed: float, failed: bool):
+        stats = self._stats.get(method) or self._new_stats(method)
+        slot = bisect.bisect_left(self.buckets, elapsed)
+        with self._lock:
+            stats[0] += 1
+            if failed:
+                stats[1] += 1
+            stats[2] += elapsed
+            stats[3][slot] += 1
+    
+    def _new_stats(self, method: str) -> list:
+        with self._lock:
+            return self._stats.setdefault(method, [0, 0, 0.0, [0] * (len(self.buckets) + 1)])
+    
+    def _count_bytes(self, direction: str, n: int):
+        with self._lock:
+            self._bytes[direction] += n
+    
+    def reset_metrics(self):
+        with self._lock:
+            self._stats = {}
+            self._bytes = {"read": 0, "written": 0}
+    
+    def snapshot(self) -> dict[str, Any]:
+        """Копия метрик: {"labels", "methods": {метод: {calls, errors, seconds, buckets}}, "bytes"}."""
+        with self._lock:
+            methods = {}
+            for method, (calls, errors, seconds, counts) in self._stats.items():
+                cumulative, running = {}, 0
+                for bound, count in zip(self.buckets + (float("inf"),), counts):
+                    running += count
+                    cumulative[bound] = running
+                methods[method] = {"calls": calls, "errors": errors, "seconds": seconds, "buckets": cumulative}
+            return {"labels": dict(self.labels), "methods": methods, "bytes": dict(self._bytes)}
+    
+    def to_prometheus(self, prefix: str = "vpath") -> str:
+        return render_prometheus([self], prefix)
+
+
+def _escape_label(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus(sources: Iterable[MetricsLogicMixin], prefix: str = "vpath") -> str:
+    """
+    Текстовый формат экспозиции Prometheus для нескольких хранилищ с метриками
+    (например, по одному на точку монтирования или слой): семейства не дублируются.
+    """
+    def fmt(labels: dict) -> str:
+        body = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+        return "{" + body + "}" if body else ""
+    
+    def num(value: float) -> str:
+        return "+Inf" if value == float("inf") else repr(float(value)) if isinstance(value, float) else str(value)
+    
+    calls, errors, hist, traffic = [], [], [], []
+    for source in sources:
+        snap = source.snapshot()
+        for method, m in snap["methods"].items():
+            labels = {**snap["labels"], "method": method}
+            calls.append(f"{prefix}_calls_total{fmt(labels)} {m['calls']}")
+            errors.append(f"{prefix}_errors_total{fmt(labels)} {m['errors']}")
+            for bound, count in m["buckets"].items():
+                hist.append(f"{prefix}_call_duration_seconds_bucket{fmt({**labels, 'le': num(bound)})} {count}")
+            hist.append(f"{prefix}_call_duration_seconds_sum{fmt(labels)} {num(m['seconds'])}")
+            hist.append(f"{prefix}_call_duration_seconds_count{fmt(labels)} {m['calls']}")
+        for direction, n in snap["bytes"].items():
+            traffic.append(f"{prefix}_bytes_total{fmt({**snap['labels'], 'direction': direction})} {n}")
+    
+    families = [
+        ("calls_total", "counter", "Storage calls.", calls),
+        ("errors_total", "counter", "Storage calls that raised.", errors),
+        ("call_duration_seconds", "histogram", "Storage call latency.", hist),
+        ("bytes_total", "counter", "Bytes read and written through the storage.", traffic),
+    ]
+    lines = []
+    for name, kind, help_text, samples in families:
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        lines.extend(samples)
+    return "\n".join(lines) + "\n"
+
+
+class TraceLogicMixin:
+    """
+    Логика записи трассы: каждая операция — строка JSONL
+    {"ts": смещение от начала, "op", "path", "args", "dur", "bytes", "error"}.
+    sink — путь к файлу (дописывается) или текстовый поток.
+    """
+    
+    def __init__(self, sink: "str | os.PathLike | TextIO"):
+        if isinstance(sink, (str, os.PathLike)):
+            self._sink, self._owns_sink = open(sink, "a", encoding="utf-8"), True
+        else:
+            self._sink, self._owns_sink = sink, False
+        self._origin = time.perf_counter()
+        self._trace_lock = threading.Lock()
+    
+    def _record(self, op: str, start: float, dur: float, path: Optional[str] = None,
+                error: Optional[BaseException] = None, nbytes: Optional[int] = None, **args):
+        event: dict[str, Any] = {"ts": round(start - self._origin, 6), "op": op}
+        if path is not None:
+            event["path"] = path
+        if args:
+            event["args"] = args
+        event["dur"] = round(dur, 9)
+        if nbytes is not None:
+            event["bytes"] = nbytes
+        if error is not None:
+            event["error"] = type(error).__name__
+        line = json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._trace_lock:
+            self._sink.write(line)
+    
+    def _close_trace(self):
+        with self._trace_lock:
+            if self._owns_sink:
+                self._sink.close()
+            else:
+                self._sink.flush()
@@ -1,6 +1,7 @@
 from typing import Any, Iterator, Optional
 
-from ..storage import Storage
+from ..storage import Storage, copy_tree
+from ..utils import group_batch
 from .mixins import MountLogicMixin
 
 
@@ -15,49 +16,142 @@ class MountStorage(Storage, MountLogicMixin):
     
     def get_info(self, path: str) -> dict[str, Any]:
         """Возвращает информацию о файле или виртуальной папке монтирования."""
-        if path.strip("/") == "":
-            return {"name": "/", "type": "dir", "size": 0}
-        target, sub_path = self._resolve(path)
+        target, sub_path, node, _ = self._route(path)
+        if node is not None and node.storage is None:
+            if target is not None:
+                try:
+                    return target.get_info(sub_path)
+                except FileNotFoundError:
+                    pass
+            return self._virtual_info(path)
+        if target is None:
+            raise FileNotFoundError(f"Mount point for '{path}' not found")
         return target.get_info(sub_path)
     
     def exists(self, path: str) -> bool:
         """Проверяет существование пути или точки монтирования."""
-        if path.strip("/") == "":
+        target, sub_path, node, _ = self._route(path)
+        if node is not None:
             return True
-        try:
-            target, sub_path = self._resolve(path)
-            return target.exists(sub_path)
-        except FileNotFoundError:
-            return False
+        return target is not None and target.exists(sub_path)
     
     def list_dir(self, path: str) -> Iterator[tuple[str, Optional[dict]]]:
-        """Листинг директории: либо список точек монтирования, либо содержимое конкретной ФС."""
-        if path.strip("/") == "":
-            for name in self._mounts:
-                yield name, {"type": "dir", "mount": True}
+        """Листинг директории: содержимое ФС плюс синтезированные точки монтирования."""
+        target, sub_path, node, _ = self._route(path)
+        if node is None or not node.children:
+            if target is None:
+                raise FileNotFoundError(f"Mount point for '{path}' not found")
+            yield from target.list_dir(sub_path)
             return
-        target, sub_path = self._resolve(path)
-        yield from target.list_dir(sub_path)
+        entries = []
+        if target is not None:
+            try:
+                entries = list(target.list_dir(sub_path))
+            except FileNotFoundError:
+                if node.storage is not None:
+                    raise
+        yield from self._merge_entries(node, entries)
+    
+    def walk(self, path: str, pattern: Optional[str] = None, onerror=None) -> Iterator[tuple[str, list, list]]:
+        """
+        Обход дерева: поддеревья без вложенных точек монтирования целиком делегируются
+        своим хранилищам, а уровни с точками монтирования собираются здесь.
+        """
+        target, sub_path, node, end = self._route(path)
+        if node is None or not node.children:
+            if target is None:
+                if onerror is not None:
+                    onerror(FileNotFoundError(path))
+                return
+            prefix = path[:end]
+            for dirpath, dirs, files in target.walk(sub_path, pattern, onerror):
+                yield self._join_mount(prefix, dirpath), dirs, files
+            return
+        
+        dirs, files = [], []
+        if target is not None:
+            level = target.walk(sub_path, pattern, onerror)
+            for _, dirs, files in level:
+                break
+            level.close()
+        top = self._join_mount(path, "")
+        dirs = self._merge_entries(node, dirs)
+        files = [entry for entry in files if entry[0] not in node.children]
+        yield top, dirs, files
+        for name, _ in dirs:
+            yield from self.walk(self._join_mount(top, name), pattern, onerror)
     
     def open(self, path: str, mode: str) -> Any:
         """Открывает файл в соответствующем хранилище."""
-        target, sub_path = self._resolve(path)
+        target, sub_path = self._target(path)
         return target.open(sub_path, mode)
     
+    def read_bytes(self, path: str) -> bytes:
+        target, sub_path = self._target(path)
+        return target.read_bytes(sub_path)
+    
+    def map(self, path: str) -> memoryview:
+        target, sub_path = self._target(path)
+        return target.map(sub_path)
+    
+    def iter_chunks(self, path: str, size: int) -> Iterator[memoryview]:
+        target, sub_path = self._target(path)
+        return target.iter_chunks(sub_path, size)
+    
+    def write_bytes(self, path: str, data: bytes):
+        target, sub_path = self._target(path)
+        target.write_bytes(sub_path, data)
+    
     def mkdir(self, path: str, mode: str, parents: bool, exist_ok: bool):
         """Создает директорию в целевом хранилище."""
-        target, sub_path = self._resolve(path)
+        target, sub_path = self._target(path)
         target.mkdir(sub_path, mode, parents, exist_ok)
     
     def unlink(self, path: str):
         """Удаляет файл в целевом хранилище."""
-        target, sub_path = self._resolve(path)
+        target, sub_path = self._target(path)
         target.unlink(sub_path)
     
     def rename(self, src: str, dest: str):
-        """Переименовывает объект. Перенос между разными хранилищами не поддерживается."""
-        s_target, s_path = self._resolve(src)
-        d_target, d_path = self._resolve(dest)
-        if s_target != d_target:
-            raise PermissionError("Перенос файлов между разными точками монтирования запрещен.")
-        s_target.rename(s_path, d_path)
\ No newline at end of file
+        """Переименовывает объект. Между точками монтирования — копирование дерева и удаление источника."""
+        s_target, s_path = self._target(src)
+        d_target, d_path = self._target(dest)
+        if s_target is d_target:
+            return s_target.rename(s_path, d_path)
+        copy_tree(s_target, s_path, d_target, d_path)
+        s_target.unlink(s_path)
+    
+    def copy(self, src: str, dest: str, source: Optional[Storage] = None):
+        """Копия внутри одного хранилища идет его хуком, между точками монтирования — хуком приемника."""
+        d_target, d_path = self._target(dest)
+        if source is None or source is self:
+            source, src = self._target(src)
+        d_target.copy(src, d_path, None if source is d_target else source)
+    
+    def _many(self, method: str, paths) -> list:
+        """
+        Пакет раскладывается по точкам монтирования: один пакетный вызов на хранилище.
+        Синтезированные директории обрабатываются поэлементно самим MountStorage.
+        """
+        def route(path):
+            target, sub_path, node, _ = self._route(path)
+            if node is not None:
+                return None, path
+            if target is None:
+                raise FileNotFoundError(f"Mount point for '{path}' not found")
+            return target, sub_path
+        
+        results, groups = group_batch(paths, route)
+        for target, slots, subs in groups:
+            batch = getattr(Storage, method)(self, subs) if target is None else getattr(target, method)(subs)
+            for i, res in zip(slots, batch):
+                results[i] = res
+        return results
+    
+    def get_info_many(self, paths): return self._many("get_info_many", paths)
+    
+    def exists_many(self, paths): return self._many("exists_many", paths)
+    
+    def unlink_many(self, paths): return self._many("unlink_many", paths)
+    
+    def read_many(self, paths): return self._many("read_many", paths)
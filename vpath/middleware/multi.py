@@ -1,44 +1,112 @@
+import posixpath
 from typing import Any, Optional, Iterator
 
 from ..storage import Storage
+from ..utils import FileProxy
 from .mixins import MultiLogicMixin
 
+_MISSING = (FileNotFoundError, NotADirectoryError)
+
+
+def _reraise(error: OSError):
+    raise error
+
 
 class MultiStorage(Storage, MultiLogicMixin):
     """
     Синхронная ФС, объединяющая содержимое нескольких слоев.
     """
     
-    def __init__(self, use_cache: bool = False):
-        super(Storage, self).__init__(use_cache=use_cache)
-        super(MultiLogicMixin, self).__init__()
+    def __init__(self, use_cache: bool = False, index_size: int = 65536):
+        Storage.__init__(self, use_cache=use_cache)
+        MultiLogicMixin.__init__(self, index_size=index_size)
     
-    def get_info(self, path: str) -> dict[str, Any]:
-        """Ищет информацию о файле в слоях, начиная с верхнего."""
-        for layer in self._layers:
+    def build_bloom(self, layer: Optional[int] = None, error_rate: float = 0.01):
+        """
+        Строит фильтры Блума по полному обходу всех слоев (или одного слоя по индексу).
+        Неполный фильтр дал бы ложные "нет", поэтому ошибка обхода прерывает построение,
+        а фильтр этого слоя остается None. Так же остается без фильтра слой со ссылками
+        на директории: walk в них не заходит, и их содержимое в фильтр не попало бы.
+        """
+        for i in ([layer] if layer is not None else range(len(self._layers))):
+            self._blooms[i] = None
+            keys = []
+            linked = False
+            for dirpath, _, files in self._layers[i].walk("/", onerror=_reraise):
+                base = self._key(dirpath)
+                keys.append(base)
+                linked = any(info is not None and info.get("type") == "dir" for _, info in files)
+                if linked:
+                    break
+                keys.extend(posixpath.join(base, name) for name, _ in files)
+            if not linked:
+                self._set_bloom(i, keys, error_rate)
+    
+    def _lookup(self, path: str, need_info: bool = False) -> tuple[int, Optional[dict]]:
+        """Находит слой, обслуживающий путь: сначала по индексу, затем одним вызовом на слой."""
+        key = self._key(path)
+        index = self._index.get(key)
+        if index is not None:
+            if index < 0 or not need_info:
+                return index, None
             try:
-                if layer.exists(path):
-                    return layer.get_info(path)
-            except Exception:
+                return index, self._layers[index].get_info(path)
+            except _MISSING:
+                self._index.pop(key)
+        
+        for i, layer in enumerate(self._layers):
+            if not self._may_contain(i, key):
                 continue
-        raise FileNotFoundError(f"Файл {path} не найден ни в одном слое.")
+            if need_info:
+                try:
+                    info = layer.get_info(path)
+                except _MISSING:
+                    continue
+                self._index.set(key, i)
+                return i, info
+            if layer.exists(path):
+                self._index.set(key, i)
+                return i, None
+        
+        self._index.set(key, -1)
+        return -1, None
+    
+    def get_info(self, path: str) -> dict[str, Any]:
+        """Ищет информацию о файле в слоях, начиная с верхнего."""
+        index, info = self._lookup(path, need_info=True)
+        if index < 0:
+            raise FileNotFoundError(f"Файл {path} не найден ни в одном слое.")
+        return info
     
     def exists(self, path: str) -> bool:
         """Проверяет существование файла в любом из слоев."""
-        return any(layer.exists(path) for layer in self._layers)
+        return self._lookup(path)[0] >= 0
     
     def list_dir(self, path: str) -> Iterator[tuple[str, Optional[dict]]]:
-        """Объединяет списки файлов изо всех слоев, исключая дубликаты."""
+        """
+        Объединяет списки файлов изо всех слоев, исключая дубликаты; заодно пополняет индекс.
+        Если директории нет ни в одном слое, бросает FileNotFoundError (или NotADirectoryError).
+        """
+        key = self._key(path)
+        if self._index.get(key) == -1:
+            raise FileNotFoundError(path)
         seen = set()
-        for layer in self._layers:
-            try:
-                if layer.exists(path):
-                    for name, info in layer.list_dir(path):
-                        if name not in seen:
-                            seen.add(name)
-                            yield name, info
-            except Exception:
+        error: Optional[OSError] = None
+        listed = False
+        for i, layer in enumerate(self._layers):
+            if not self._may_contain(i, key):
                 continue
+            try:
+                for name, info in layer.list_dir(path):
+                    if name not in seen:
+                        seen.add(name)
+                        self._index.set(posixpath.join(key, name), i)
+                        yield name, info
+                listed = True
+            except _MISSING as e:
+                error = e
+        if not listed:
+            raise error or FileNotFoundError(path)
     
     def open(self, path: str, mode: str) -> Any:
         """
@@ -46,27 +114,79 @@ class MultiStorage(Storage, MultiLogicMixin):
         Если на чтение — в первом найденном.
         """
         if any(m in mode for m in "wax+"):
-            return self.primary.open(path, mode)
+            file = self.primary.open(path, mode)
+            self._note_write(path)
+            return FileProxy(file, lambda: self._forget(path))
         
-        for layer in self._layers:
-            if layer.exists(path):
-                return layer.open(path, mode)
-        raise FileNotFoundError(path)
+        index, _ = self._lookup(path)
+        if index < 0:
+            raise FileNotFoundError(path)
+        return self._layers[index].open(path, mode)
+    
+    def read_bytes(self, path: str) -> bytes:
+        index, _ = self._lookup(path)
+        if index < 0:
+            raise FileNotFoundError(path)
+        return self._layers[index].read_bytes(path)
+    
+    def map(self, path: str) -> memoryview:
+        index, _ = self._lookup(path)
+        if index < 0:
+            raise FileNotFoundError(path)
+        return self._layers[index].map(path)
+    
+    def iter_chunks(self, path: str, size: int) -> Iterator[memoryview]:
+        index, _ = self._lookup(path)
+        if index < 0:
+            raise FileNotFoundError(path)
+        return self._layers[index].iter_chunks(path, size)
+    
+    def write_bytes(self, path: str, data: bytes):
+        """Запись всегда идет в primary слой."""
+        try:
+            self.primary.write_bytes(path, data)
+        finally:
+            self._forget(path)
+        self._add_to_bloom(0, self._key(path))
+    
+    def copy(self, src: str, dest: str, source: Optional[Storage] = None):
+        """Источник берется из верхнего слоя, где он есть; копия всегда ложится в primary слой."""
+        if source is None or source is self:
+            index, _ = self._lookup(src)
+            if index < 0:
+                raise FileNotFoundError(src)
+            source = self._layers[index]
+        try:
+            self.primary.copy(src, dest, None if source is self.primary else source)
+        finally:
+            self._forget(dest)
+        self._add_to_bloom(0, self._key(dest))
     
     def mkdir(self, path: str, mode: str, parents: bool, exist_ok: bool):
         """Создает папку только в приоритетном слое."""
         self.primary.mkdir(path, mode, parents, exist_ok)
+        self._note_write(path)
     
     def unlink(self, path: str):
         """Удаляет файл из всех слоев (или только из тех, где есть доступ)."""
+        key = self._key(path)
         found = False
-        for layer in self._layers:
-            if layer.exists(path):
-                layer.unlink(path)
-                found = True
+        try:
+            for i, layer in enumerate(self._layers):
+                if self._may_contain(i, key) and layer.exists(path):
+                    layer.unlink(path)
+                    found = True
+        finally:
+            self._forget(path, subtree=True)
         if not found:
             raise FileNotFoundError(path)
     
     def rename(self, src: str, dest: str):
         """Переименование поддерживается только внутри одного (primary) слоя."""
-        self.primary.rename(src, dest)
+        try:
+            self.primary.rename(src, dest)
+        finally:
+            self._forget(src, subtree=True)
+            self._forget(dest, subtree=True)
+            # Поддерево dest заранее неизвестно: фильтр primary-слоя больше не точен
+            self._blooms[0] = None
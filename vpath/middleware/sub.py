@@ -1,12 +1,13 @@
 from ..storage import Storage
+from ..utils import group_batch
 from .mixins import SubPathLogicMixin
 from .wrap import StorageWrapper
 
 
 class SubStorage(StorageWrapper, SubPathLogicMixin):
     def __init__(self, wrapped: Storage, base_path: str):
-        super(StorageWrapper, self).__init__(wrapped)
-        super(SubPathLogicMixin, self).__init__(base_path)
+        StorageWrapper.__init__(self, wrapped)
+        SubPathLogicMixin.__init__(self, base_path)
     
     def get_info(self, path): return self.wrapped.get_info(self._fix(path))
     
@@ -21,4 +22,36 @@ class SubStorage(StorageWrapper, SubPathLogicMixin):
     def mkdir(self, path, mode=0o777, parents=False, exist_ok=False): return self.wrapped.mkdir(self._fix(path), mode,
                                                                                                 parents, exist_ok)
     
-    def rename(self, src, dist): return self.wrapped.rename(self._fix(src), self._fix(dist))
\ No newline at end of file
+    def rename(self, src, dist): return self.wrapped.rename(self._fix(src), self._fix(dist))
+    
+    def walk(self, path, pattern=None, onerror=None):
+        for dirpath, dirs, files in self.wrapped.walk(self._fix(path), pattern, onerror):
+            yield self._unfix(dirpath), dirs, files
+    
+    def _many(self, method: str, paths) -> list:
+        results, groups = group_batch(paths, lambda p: (self.wrapped, self._fix(p)))
+        for target, slots, fixed in groups:
+            for i, res in zip(slots, getattr(target, method)(fixed)):
+                results[i] = res
+        return results
+    
+    def get_info_many(self, paths): return self._many("get_info_many", paths)
+    
+    def exists_many(self, paths): return self._many("exists_many", paths)
+    
+    def unlink_many(self, paths): return self._many("unlink_many", paths)
+    
+    def read_many(self, paths): return self._many("read_many", paths)
+    
+    def read_bytes(self, path): return self.wrapped.read_bytes(self._fix(path))
+    
+    def write_bytes(self, path, data): return self.wrapped.write_bytes(self._fix(path), data)
+    
+    def map(self, path): return self.wrapped.map(self._fix(path))
+    
+    def iter_chunks(self, path, size): return self.wrapped.iter_chunks(self._fix(path), size)
+    
+    def copy(self, src, dest, source=None):
+        if source is None or source is self:
+            return self.wrapped.copy(self._fix(src), self._fix(dest))
+        return self.wrapped.copy(src, self._fix(dest), source)
@@ -0,0 +1,124 @@
+import os
+from time import perf_counter
+from typing import Any, Callable, Iterator, Optional, TextIO
+
+from ..storage import Storage
+from ..utils import CountingFile
+from .mixins import TraceLogicMixin
+from .wrap import StorageWrapper
+
+
+class TraceStorage(StorageWrapper, TraceLogicMixin):
+    """
+    Пишет трассу всех вызовов обернутого хранилища для последующего replay (vpath.replay).
+    Открытый файл попадает в трассу при закрытии: режим, время открытия и число байт.
+    """
+    
+    def __init__(self, wrapped: Storage, sink: "str | os.PathLike | TextIO"):
+        StorageWrapper.__init__(self, wrapped)
+        TraceLogicMixin.__init__(self, sink)
+    
+    def _call(self, op: str, func: Callable, *call_args, path: Optional[str] = None,
+              measure: Optional[Callable[[Any], int]] = None, **args) -> Any:
+        start = perf_counter()
+        result = error = None
+        try:
+            result = func(*call_args)
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            nbytes = measure(result) if measure is not None and error is None else None
+            self._record(op, start, perf_counter() - start, path, error, nbytes, **args)
+    
+    def _iter(self, op: str, it: Iterator, path: str, measure: Optional[Callable[[Any], int]] = None,
+              **args) -> Iterator:
+        elapsed, error, nbytes = 0.0, None, 0
+        begin = perf_counter()
+        try:
+            it = iter(it)
+            while True:
+                start = perf_counter()
+                try:
+                    item = next(it)
+                except StopIteration:
+                    elapsed += perf_counter() - start
+                    return
+                elapsed += perf_counter() - start
+                if measure is not None:
+                    nbytes += measure(item)
+                yield item
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._record(op, begin, elapsed, path, error, nbytes if measure is not None else None, **args)
+    
+    def get_info(self, path): return self._call("get_info", self.wrapped.get_info, path, path=path)
+    
+    def exists(self, path): return self._call("exists", self.wrapped.exists, path, path=path)
+    
+    def list_dir(self, path): return self._iter("list_dir", self.wrapped.list_dir(path), path)
+    
+    def walk(self, path, pattern=None, onerror=None):
+        return self._iter("walk", self.wrapped.walk(path, pattern, onerror), path, pattern=pattern)
+    
+    def open(self, path, mode="r"):
+        start = perf_counter()
+        try:
+            file = self.wrapped.open(path, mode)
+        except Exception as e:
+            self._record("open", start, perf_counter() - start, path, e, mode=mode)
+            raise
+        dur = perf_counter() - start
+        moved = [0]
+        
+        def count(_direction: str, n: int):
+            moved[0] += n
+        
+        return CountingFile(file, count, lambda: self._record("open", start, dur, path, None, moved[0], mode=mode))
+    
+    def unlink(self, path): return self._call("unlink", self.wrapped.unlink, path, path=path)
+    
+    def mkdir(self, path, mode=0o777, parents=False, exist_ok=False):
+        return self._call("mkdir", self.wrapped.mkdir, path, mode, parents, exist_ok,
+                          path=path, parents=parents, exist_ok=exist_ok)
+    
+    def rename(self, src, dest): return self._call("rename", self.wrapped.rename, src, dest, path=src, dest=dest)
+    
+    def copy(self, src, dest, source=None):
+        return self._call("copy", StorageWrapper.copy, self, src, dest, source, path=src, dest=dest)
+    
+    def get_info_many(self, paths):
+        paths = list(paths)
+        return self._call("get_info_many", self.wrapped.get_info_many, paths, paths=paths)
+    
+    def exists_many(self, paths):
+        paths = list(paths)
+        return self._call("exists_many", self.wrapped.exists_many, paths, paths=paths)
+    
+    def unlink_many(self, paths):
+        paths = list(paths)
+        return self._call("unlink_many", self.wrapped.unlink_many, paths, paths=paths)
+    
+    def read_many(self, paths):
+        paths = list(paths)
+        return self._call("read_many", self.wrapped.read_many, paths, paths=paths,
+                          measure=lambda rs: sum(len(r) for r in rs if not isinstance(r, Exception)))
+    
+    def read_bytes(self, path): return self._call("read_bytes", self.wrapped.read_bytes, path, path=path, measure=len)
+    
+    def write_bytes(self, path, data):
+        return self._call("write_bytes", self.wrapped.write_bytes, path, data, path=path, measure=lambda _: len(data))
+    
+    def map(self, path): return self._call("map", self.wrapped.map, path, path=path, measure=lambda v: v.nbytes)
+    
+    def iter_chunks(self, path, size):
+        return self._iter("iter_chunks", self.wrapped.iter_chunks(path, size), path, len, size=size)
+    
+    def close(self):
+        try:
+            self.wrapped.close()
+        finally:
+            self._close_trace()
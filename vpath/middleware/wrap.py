@@ -20,3 +20,26 @@ class StorageWrapper(Storage):
                                                                                                 exist_ok)
     
     def rename(self, src, dist): return self.wrapped.rename(src, dist)
+    
+    def walk(self, path, pattern=None, onerror=None): return self.wrapped.walk(path, pattern, onerror)
+    
+    def get_info_many(self, paths): return self.wrapped.get_info_many(paths)
+    
+    def exists_many(self, paths): return self.wrapped.exists_many(paths)
+    
+    def unlink_many(self, paths): return self.wrapped.unlink_many(paths)
+    
+    def read_many(self, paths): return self.wrapped.read_many(paths)
+    
+    def read_bytes(self, path): return self.wrapped.read_bytes(path)
+    
+    def write_bytes(self, path, data): return self.wrapped.write_bytes(path, data)
+    
+    def map(self, path): return self.wrapped.map(path)
+    
+    def iter_chunks(self, path, size): return self.wrapped.iter_chunks(path, size)
+    
+    def copy(self, src, dest, source=None):
+        return self.wrapped.copy(src, dest, None if source is None or source is self else source)
+    
+    def close(self): return self.wrapped.close()
@@ -1,9 +1,10 @@
+import codecs
 from io import TextIOWrapper
-from typing import Self
+from typing import Iterator, Self
 
 from .abc import BaseVPath
-from .storage import Storage
-from .utils import VStat
+from .storage import Storage, copy_tree
+from .utils import VStat, BufferReader, RecordSplitter, compile_glob, has_magic, decode_text, encode_text
 
 
 class VPath(BaseVPath):
@@ -18,8 +19,14 @@ class VPath(BaseVPath):
             self._info_cache = self.storage.get_info(self.as_posix())
         return VStat(self._info_cache)
     
-    def open(self, mode="r", encoding="utf-8"):
-        file = self.storage.open(self.as_posix(), mode.replace("t", ""))
+    def open(self, mode="r", encoding="utf-8", mmap=False):
+        """При mmap=True файл читается через map(): без копий и без системных вызовов на read/seek."""
+        if mmap:
+            if any(m in mode for m in "wax+"):
+                raise ValueError("mmap=True supports only read modes")
+            file = BufferReader(self.map())
+        else:
+            file = self.storage.open(self.as_posix(), mode.replace("t", ""))
         if "b" not in mode:
             return TextIOWrapper(file, encoding=encoding)
         return file
@@ -29,7 +36,72 @@ class VPath(BaseVPath):
     
     def iterdir(self):
         for n, m in self.storage.list_dir(self.as_posix()):
-            yield VPath(self, n, storage=self.storage, info_cache=m)
+            yield self._child(n, m)
+    
+    def walk(self) -> Iterator[tuple[Self, list[str], list[str]]]:
+        """Обход сверху вниз, как Path.walk; dirnames можно урезать на месте."""
+        for dirpath, dirs, files in self.storage.walk(self.as_posix()):
+            dirnames = [name for name, _ in dirs]
+            yield type(self)(dirpath, storage=self.storage), dirnames, [name for name, _ in files]
+            if len(dirnames) != len(dirs):
+                keep = set(dirnames)
+                dirs[:] = [d for d in dirs if d[0] in keep]
+    
+    def glob(self, pattern: str) -> Iterator[Self]:
+        parts = [part for part in pattern.split("/") if part and part != "."]
+        if not parts:
+            raise ValueError(f"Unacceptable pattern: {pattern!r}")
+        seen = set() if parts.count("**") > 1 else None
+        for path in self._glob(parts):
+            if seen is not None:
+                if path in seen:
+                    continue
+                seen.add(path)
+            yield path
+    
+    def rglob(self, pattern: str) -> Iterator[Self]:
+        return self.glob("**/" + pattern)
+    
+    def _glob(self, parts: list[str]) -> Iterator[Self]:
+        head, rest = parts[0], parts[1:]
+        if head == "**":
+            if len(rest) == 1 and rest[0] != "**":
+                # "**/шаблон": фильтр по имени уходит в хранилище
+                match = compile_glob(rest[0])
+                for dirpath, dirs, files in self.storage.walk(self.as_posix(), rest[0]):
+                    top = type(self)(dirpath, storage=self.storage)
+                    for name, info in dirs:
+                        if match(name):
+                            yield top._child(name, info)
+                    for name, info in files:
+                        yield top._child(name, info)
+                return
+            for dirpath, _, _ in self.storage.walk(self.as_posix()):
+                top = type(self)(dirpath, storage=self.storage)
+                if rest:
+                    yield from top._glob(rest)
+                else:
+                    yield top
+        elif has_magic(head):
+            match = compile_glob(head)
+            try:
+                entries = list(self.storage.list_dir(self.as_posix()))
+            except (FileNotFoundError, NotADirectoryError):
+                return
+            for name, info in entries:
+                if not match(name) or (rest and info is not None and info.get("type") != "dir"):
+                    continue
+                child = self._child(name, info)
+                if rest:
+                    yield from child._glob(rest)
+                else:
+                    yield child
+        else:
+            child = self._child(head)
+            if rest:
+                yield from child._glob(rest)
+            elif child.exists():
+                yield child
     
     def chroot(self) -> Self:
         from vpath.middleware import SubStorage
@@ -38,13 +110,73 @@ class VPath(BaseVPath):
     def unlink(self):
         self.storage.unlink(self.as_posix())
     
-    def write_text(self, data: str, encoding="utf-8"):
-        with self.open("w", encoding=encoding) as f:
-            f.write(data)
+    def map(self) -> memoryview:
+        """
+        Read-only memoryview содержимого. Локальные файлы отображаются через mmap
+        (данные берутся из page cache), остальные хранилища отдают буфер в памяти.
+        """
+        return self.storage.map(self.as_posix())
+    
+    def read_bytes(self) -> bytes:
+        return self.storage.read_bytes(self.as_posix())
+    
+    def write_bytes(self, data: bytes) -> int:
+        self.storage.write_bytes(self.as_posix(), data)
+        self._info_cache = None
+        return len(data)
     
-    def read_text(self, encoding="utf-8") -> str:
-        with self.open("r", encoding=encoding) as f:
-            return f.read()
+    def iter_chunks(self, size: int = 64 * 1024) -> Iterator[memoryview]:
+        """
+        Потоковое чтение кусками до size байт при постоянной памяти. Кусок может ссылаться
+        на переиспользуемый буфер — если он нужен дольше итерации, его надо скопировать.
+        """
+        return self.storage.iter_chunks(self.as_posix(), size)
+    
+    def iter_records(self, sep: bytes = b"\n", size: int = 64 * 1024, keepends: bool = False) -> Iterator[bytes]:
+        """Записи, разделенные sep; последняя запись может быть без разделителя."""
+        splitter = RecordSplitter(sep, keepends)
+        for chunk in self.iter_chunks(size):
+            yield from splitter.feed(bytes(chunk))
+        yield from splitter.finish()
+    
+    def iter_lines(self, encoding="utf-8", errors="strict", size: int = 64 * 1024) -> Iterator[str]:
+        """Строки без завершающего перевода (\n или \r\n), без TextIOWrapper."""
+        decoder = codecs.getincrementaldecoder(encoding)(errors)
+        splitter = RecordSplitter("\n")
+        for chunk in self.iter_chunks(size):
+            for line in splitter.feed(decoder.decode(chunk)):
+                yield line[:-1] if line.endswith("\r") else line
+        for line in splitter.feed(decoder.decode(b"", final=True)) + splitter.finish():
+            yield line[:-1] if line.endswith("\r") else line
+    
+    def read_text(self, encoding="utf-8", errors="strict") -> str:
+        return decode_text(self.read_bytes(), encoding, errors)
+    
+    def write_text(self, data: str, encoding="utf-8", errors="strict", newline=None) -> int:
+        self.write_bytes(encode_text(data, encoding, errors, newline))
+        return len(data)
     
     def mkdir(self, mode=0o777, parents=False, exist_ok=False):
         self.storage.mkdir(self.as_posix(), mode, parents, exist_ok)
+    
+    def copy_to(self, dest: "str | VPath", workers: int = 8) -> Self:
+        """
+        Копирует файл или дерево в dest (строка — путь в том же хранилище).
+        Данные идут хуком copy хранилища-приемника, файлы дерева — параллельно.
+        """
+        if not isinstance(dest, VPath):
+            dest = type(self)(dest, storage=self.storage)
+        copy_tree(self.storage, self.as_posix(), dest.storage, dest.as_posix(), workers)
+        return dest
+    
+    def move_to(self, dest: "str | VPath") -> Self:
+        """Переносит в dest: внутри хранилища — rename, между хранилищами — копия и удаление."""
+        if not isinstance(dest, VPath):
+            dest = type(self)(dest, storage=self.storage)
+        if dest.storage is self.storage:
+            self.storage.rename(self.as_posix(), dest.as_posix())
+        else:
+            self.copy_to(dest)
+            self.unlink()
+        self._info_cache = None
+        return dest
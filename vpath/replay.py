@@ -0,0 +1,164 @@
+"""
+Воспроизведение трасс, записанных TraceStorage / AsyncTraceStorage.
+
+    python -m vpath.replay trace.jsonl mem://bench/ [--async] [--speed 1.0]
+
+Операции выполняются по порядку над любым хранилищем или URL FileSystem; отчет —
+пропускная способность и перцентили задержек по каждой операции.
+"""
+import json
+import math
+import time
+from typing import Any, Iterable, Iterator, Optional
+
+from attrs import define, field
+
+from .storage import Storage
+
+WRITE_MODES = "wax+"
+
+
+def load_trace(source: "str | Iterable[str]") -> Iterator[dict[str, Any]]:
+    """События трассы из файла JSONL или из итерируемого набора строк."""
+    if isinstance(source, str):
+        with open(source, encoding="utf-8") as f:
+            yield from load_trace(f)
+        return
+    for line in source:
+        if line.strip():
+            yield json.loads(line)
+
+
+def percentile(ordered: list[float], q: float) -> float:
+    """Перцентиль по ближайшему рангу для отсортированного списка."""
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+@define
+class ReplayReport:
+    """Итоги replay: задержки по операциям, ошибки, объем данных и общее время."""
+    latencies: dict[str, list[float]] = field(factory=dict)
+    errors: dict[str, int] = field(factory=dict)
+    bytes: int = 0
+    elapsed: float = 0.0
+    
+    def add(self, op: str, dur: float, nbytes: int, failed: bool):
+        self.latencies.setdefault(op, []).append(dur)
+        if failed:
+            self.errors[op] = self.errors.get(op, 0) + 1
+        self.bytes += nbytes
+    
+    @property
+    def ops(self) -> int:
+        return sum(len(values) for values in self.latencies.values())
+    
+    def summary(self, quantiles: Iterable[float] = (50, 90, 99)) -> dict[str, Any]:
+        elapsed = self.elapsed or float("nan")
+        per_op = {}
+        for op, values in sorted(self.latencies.items()):
+            ordered = sorted(values)
+            per_op[op] = {
+                "count": len(values),
+                "errors": self.errors.get(op, 0),
+                **{f"p{q:g}": percentile(ordered, q) for q in quantiles},
+                "max": ordered[-1],
+            }
+        return {
+            "ops": self.ops,
+            "errors": sum(self.errors.values()),
+            "elapsed": self.elapsed,
+            "ops_per_sec": self.ops / elapsed,
+            "bytes_per_sec": self.bytes / elapsed,
+            "operations": per_op,
+        }
+
+
+def apply_event(storage: Storage, event: dict[str, Any]) -> int:
+    """Выполняет одно событие трассы; возвращает число перемещенных байт."""
+    op, path, args = event["op"], event.get("path"), event.get("args", {})
+    nbytes = event.get("bytes") or 0
+    if op in ("get_info", "exists", "unlink"):
+        getattr(storage, op)(path)
+    elif op == "read_bytes":
+        return len(storage.read_bytes(path))
+    elif op == "write_bytes":
+        storage.write_bytes(path, bytes(nbytes))
+    elif op == "map":
+        return storage.map(path).nbytes
+    elif op == "list_dir":
+        for _ in storage.list_dir(path):
+            pass
+    elif op == "walk":
+        for _ in storage.walk(path, args.get("pattern")):
+            pass
+    elif op == "iter_chunks":
+        return sum(len(chunk) for chunk in storage.iter_chunks(path, args["size"]))
+    elif op == "mkdir":
+        storage.mkdir(path, 0o777, args.get("parents", False), args.get("exist_ok", False))
+    elif op in ("rename", "copy"):
+        getattr(storage, op)(path, args["dest"])
+    elif op in ("get_info_many", "exists_many", "unlink_many", "read_many"):
+        results = getattr(storage, op)(args["paths"])
+        return sum(len(r) for r in results if isinstance(r, bytes)) if op == "read_many" else 0
+    elif op == "open":
+        mode = args.get("mode", "rb")
+        with storage.open(path, mode if "b" in mode else mode + "b") as f:
+            if any(m in mode for m in WRITE_MODES):
+                f.write(bytes(nbytes))
+            else:
+                return len(f.read())
+    else:
+        raise ValueError(f"Unknown trace operation: {op!r}")
+    return nbytes
+
+
+def replay(events: Iterable[dict[str, Any]], storage: "Storage | str", speed: Optional[float] = None) -> ReplayReport:
+    """
+    Воспроизводит события над storage (хранилище или URL FileSystem). speed=None — без пауз,
+    иначе исходные интервалы между операциями, ускоренные в speed раз.
+    """
+    if isinstance(storage, str):
+        from .factory import FileSystem
+        storage = FileSystem.open(storage, pooled=False).storage
+    report = ReplayReport()
+    origin = time.perf_counter()
+    for event in events:
+        if speed:
+            delay = event.get("ts", 0) / speed - (time.perf_counter() - origin)
+            if delay > 0:
+                time.sleep(delay)
+        start = time.perf_counter()
+        failed, nbytes = False, 0
+        try:
+            nbytes = apply_event(storage, event)
+        except OSError:
+            failed = True
+        report.add(event["op"], time.perf_counter() - start, nbytes, failed)
+    report.elapsed = time.perf_counter() - origin
+    return report
+
+
+def main(argv: Optional[list[str]] = None):
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog="python -m vpath.replay", description="Replay a vpath operation trace.")
+    parser.add_argument("trace", help="JSONL trace written by TraceStorage")
+    parser.add_argument("target", help="FileSystem URL of the storage to replay against")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="replay through AsyncFileSystem")
+    parser.add_argument("--speed", type=float, default=None, help="keep original pacing, sped up N times")
+    options = parser.parse_args(argv)
+    
+    events = list(load_trace(options.trace))
+    if options.use_async:
+        import anyio
+        from avpath.replay import replay as async_replay
+        report = anyio.run(async_replay, events, options.target, options.speed)
+    else:
+        report = replay(events, options.target, options.speed)
+    print(json.dumps(report.summary(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,26 @@
+import posixpath
+import shutil
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Iterator, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional
 
 from vpath.abc import BaseStorage
+from vpath.utils import compile_glob, capture
+
+# Метаданные — EntryInfo или dict с теми же ключами (name, type, size, mtime)
+Info = Mapping[str, Any]
+Entry = tuple[str, Optional[Info]]
 
 
 class Storage(BaseStorage, ABC):
+    copy_chunk_size = 1024 * 1024
     
     @abstractmethod
-    def get_info(self, path: str) -> dict[str, Any]: ...
+    def get_info(self, path: str) -> Info: ...
     
     @abstractmethod
-    def list_dir(self, path: str) -> Iterator[tuple[str, Optional[dict]]]: ...
+    def list_dir(self, path: str) -> Iterator[Entry]: ...
     
     @abstractmethod
     def open(self, path: str, mode: str) -> Any: ...
@@ -26,3 +36,153 @@ class Storage(BaseStorage, ABC):
     
     @abstractmethod
     def rename(self, src: str, dest: str): ...
+    
+    def walk(self, path: str, pattern: Optional[str] = None,
+             onerror: Optional[Callable[[OSError], Any]] = None) -> Iterator[tuple[str, list[Entry], list[Entry]]]:
+        """
+        Обходит дерево сверху вниз, как os.walk: (dirpath, dirs, files).
+        Поддиректории всегда попадают в dirs (список можно урезать на месте),
+        а files, если задан pattern (glob по имени), фильтруются самим хранилищем.
+        Нечитаемые директории пропускаются; onerror, как в os.walk, получает ошибку.
+        """
+        match = compile_glob(pattern) if pattern else None
+        stack = [path]
+        while stack:
+            top = stack.pop()
+            try:
+                dirs, files = self._scan_dir(top, match)
+            except OSError as e:
+                if onerror is not None:
+                    onerror(e)
+                continue
+            yield top, dirs, files
+            stack.extend(posixpath.join(top, name) for name, _ in reversed(dirs))
+    
+    def _scan_dir(self, path: str, match: Optional[Callable]) -> tuple[list[Entry], list[Entry]]:
+        """Один шаг walk: делит содержимое директории на (dirs, files)."""
+        dirs, files = [], []
+        for name, info in self.list_dir(path):
+            if info is None:
+                info = self.get_info(posixpath.join(path, name))
+            if info.get("type") == "dir":
+                dirs.append((name, info))
+            elif match is None or match(name):
+                files.append((name, info))
+        return dirs, files
+    
+    # Пакетные операции: ошибки возвращаются на месте элемента, а не прерывают пакет
+    
+    def get_info_many(self, paths: Iterable[str]) -> list[dict | Exception]:
+        return [capture(self.get_info, p) for p in paths]
+    
+    def exists_many(self, paths: Iterable[str]) -> list[bool | Exception]:
+        return [capture(self.exists, p) for p in paths]
+    
+    def unlink_many(self, paths: Iterable[str]) -> list[None | Exception]:
+        return [capture(self.unlink, p) for p in paths]
+    
+    def read_many(self, paths: Iterable[str]) -> list[bytes | Exception]:
+        return [capture(self.read_bytes, p) for p in paths]
+    
+    # Чтение и запись файла целиком: хранилища переопределяют их, чтобы обойтись без файлового объекта
+    
+    def read_bytes(self, path: str) -> bytes:
+        with self.open(path, "rb") as f:
+            return f.read()
+    
+    def write_bytes(self, path: str, data: bytes):
+        with self.open(path, "wb") as f:
+            f.write(data)
+    
+    def copy(self, src: str, dest: str, source: Optional["Storage"] = None):
+        """
+        Копирует файл src хранилища source (по умолчанию — этого же) в dest этого хранилища.
+        По умолчанию — потоковое копирование кусками copy_chunk_size; хранилища
+        переопределяют хук, когда умеют быстрее (ядро ОС, общий буфер).
+        """
+        if source is None or source is self:
+            source = self
+            check_copy_paths(src, dest)
+        with source.open(src, "rb") as fin, self.open(dest, "wb") as fout:
+            while chunk := fin.read(self.copy_chunk_size):
+                fout.write(chunk)
+    
+    def iter_chunks(self, path: str, size: int) -> Iterator[memoryview]:
+        """
+        Потоковое чтение кусками до size байт. По умолчанию — readinto в один заранее
+        выделенный буфер: кусок действителен только до следующей итерации.
+        """
+        buffer = bytearray(size)
+        view = memoryview(buffer)
+        with self.open(path, "rb") as f:
+            while n := f.readinto(buffer):
+                yield view[:n]
+    
+    def map(self, path: str) -> memoryview:
+        """Содержимое файла как read-only memoryview; по умолчанию — буфер в памяти."""
+        return memoryview(self.read_bytes(path))
+    
+    def close(self):
+        """Освобождает ресурсы хранилища (соединения, дескрипторы)."""
+
+
+def rebase(path: str, src: str, dest: str) -> str:
+    """Переносит path из поддерева src в поддерево dest."""
+    rel = posixpath.relpath(path, src)
+    return dest if rel == "." else posixpath.join(dest, rel)
+
+
+def check_copy_paths(src: str, dest: str):
+    """
+    Копия внутри одного хранилища не может идти в себя: dest == src обнулил бы файлы
+    (приемник открывается на запись после источника), dest внутри src — бесконечный обход.
+    """
+    src, dest = posixpath.normpath(src), posixpath.normpath(dest)
+    if dest == src:
+        raise shutil.SameFileError(f"'{src}' and '{dest}' are the same file")
+    if dest.startswith(src.rstrip("/") + "/"):
+        raise OSError(f"Cannot copy '{src}' into itself")
+
+
+def copy_tree(source: Storage, src: str, target: Storage, dest: str, workers: int = 8):
+    """
+    Копирует файл или дерево src хранилища source в dest хранилища target.
+    Директории создаются по ходу обхода, файлы копируются в пуле из workers потоков;
+    в полете одновременно не больше 2 * workers файлов. После первой ошибки новые
+    копии не запускаются, а сама ошибка пробрасывается.
+    """
+    if source is target:
+        check_copy_paths(src, dest)
+    if source.get_info(src).get("type") != "dir":
+        target.copy(src, dest, source=None if source is target else source)
+        return
+    
+    pending = threading.BoundedSemaphore(workers * 2)
+    failed = threading.Event()
+    futures = []
+    
+    def done(future):
+        if future.exception() is not None:
+            failed.set()
+        pending.release()
+    
+    with ThreadPoolExecutor(workers, thread_name_prefix="vpath-copy") as pool:
+        for dirpath, _, files in source.walk(src, onerror=_raise):
+            folder = rebase(dirpath, src, dest)
+            target.mkdir(folder, 0o777, True, True)
+            for name, _ in files:
+                pending.acquire()
+                if failed.is_set():
+                    break
+                future = pool.submit(target.copy, posixpath.join(dirpath, name), posixpath.join(folder, name),
+                                     None if source is target else source)
+                future.add_done_callback(done)
+                futures.append(future)
+            if failed.is_set():
+                break
+    for future in futures:
+        future.result()
+
+
+def _raise(error: OSError):
+    raise error
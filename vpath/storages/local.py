@@ -1,12 +1,181 @@
+import os
+import mmap
 import shutil
+import stat as st_mode
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Iterator, Optional
+from typing import Any, Callable, Iterable, Iterator, Optional
 from vpath.storage import Storage
 from vpath.factory import FileSystem
+from vpath.utils import EntryInfo, ListingBatch, capture, make_entry
+
+
+def _type(stat: os.stat_result) -> str:
+    return "dir" if st_mode.S_ISDIR(stat.st_mode) else "file"
+
+
+def stat_info(name: str, stat: os.stat_result) -> EntryInfo:
+    """Собирает метаданные из одного результата stat()."""
+    return make_entry((name, _type(stat), stat.st_size, stat.st_mtime))
+
+
+def _entry_stat(entry: os.DirEntry) -> os.stat_result:
+    """
+    stat() записи os.scandir. У DirEntry он кэшируется
+    (на Windows берется прямо из листинга), битые ссылки описываются через lstat.
+    """
+    try:
+        return entry.stat()
+    except FileNotFoundError:
+        return entry.stat(follow_symlinks=False)
+
+
+def entry_info(entry: os.DirEntry) -> EntryInfo:
+    """Метаданные записи os.scandir."""
+    return stat_info(entry.name, _entry_stat(entry))
+
+
+def scan_entries(it: Iterator[os.DirEntry], limit: Optional[int] = None) -> ListingBatch:
+    """Читает до limit записей из итератора os.scandir сразу в колонки, без объекта на запись."""
+    batch = ListingBatch()
+    for entry in it:
+        stat = _entry_stat(entry)
+        batch.append(entry.name, _type(stat), stat.st_size, stat.st_mtime)
+        if limit is not None and len(batch) >= limit:
+            break
+    return batch
+
+
+def scan_walk_dir(path: str | Path, match: Optional[Callable]) -> tuple[list, list]:
+    """
+    Шаг walk для локального диска: тип берется из d_type, stat() делается
+    только для директорий и подходящих под шаблон файлов.
+    Ссылки на директории, как в Path.walk, считаются файлами и не обходятся.
+    """
+    dirs, files = [], []
+    with os.scandir(path) as it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                dirs.append((entry.name, entry_info(entry)))
+            elif match is None or match(entry.name):
+                files.append((entry.name, entry_info(entry)))
+    return dirs, files
+
+
+def write_file(path: Path, data: bytes):
+    """Записывает файл целиком, при необходимости создавая родительские директории."""
+    try:
+        path.write_bytes(data)
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+
+
+def open_file(path: Path, mode: str) -> Any:
+    """Открывает файл в двоичном режиме; для записи недостающие родители создаются по требованию."""
+    mode = mode if "b" in mode else mode + "b"
+    try:
+        return open(path, mode)
+    except FileNotFoundError:
+        if not any(m in mode for m in "wax"):
+            raise
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return open(path, mode)
+
+
+def remove(path: Path):
+    """Удаляет файл или директорию целиком."""
+    if path.is_dir():
+        shutil.rmtree(path)
+    else:
+        path.unlink()
+
+
+def map_file(path: str | Path) -> memoryview:
+    """
+    Отображает файл в память только на чтение. Дескриптор закрывается сразу,
+    отображение живет, пока жив memoryview (срезы memoryview не копируют данные).
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b"")  # Пустой файл нельзя отобразить
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return memoryview(mapped)
+
+
+def _kernel_copy(fd_in: int, fd_out: int, size: int) -> bool:
+    """
+    Копирует size байт внутри ядра: copy_file_range (в т.ч. reflink на CoW-ФС),
+    затем sendfile. False — ни один способ не поддерживается, и ничего не скопировано.
+    """
+    copied = 0
+    if hasattr(os, "copy_file_range"):
+        try:
+            while copied < size:
+                sent = os.copy_file_range(fd_in, fd_out, size - copied)
+                if sent == 0:
+                    break
+                copied += sent
+            return True
+        except OSError:
+            if copied:
+                raise
+    if hasattr(os, "sendfile"):
+        try:
+            while copied < size:
+                sent = os.sendfile(fd_out, fd_in, copied, size - copied)
+                if sent == 0:
+                    break
+                copied += sent
+            return True
+        except OSError:
+            if copied:
+                raise
+    return False
+
+
+def copy_file(src: Path, dest: Path, chunk_size: int = 1024 * 1024):
+    """
+    Копирует содержимое файла средствами ядра, при необходимости — кусками через user space.
+    Копия файла в самого себя (в т.ч. через ссылку) отклоняется до открытия приемника на запись.
+    """
+    try:
+        same = os.path.samefile(src, dest)
+    except OSError:
+        same = False
+    if same:
+        raise shutil.SameFileError(f"'{src}' and '{dest}' are the same file")
+    with open(src, "rb") as fin:
+        try:
+            fout = open(dest, "wb")
+        except FileNotFoundError:
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            fout = open(dest, "wb")
+        with fout:
+            if not _kernel_copy(fin.fileno(), fout.fileno(), os.fstat(fin.fileno()).st_size):
+                shutil.copyfileobj(fin, fout, chunk_size)
+
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def shared_executor(workers: int = 16) -> ThreadPoolExecutor:
+    """Общий для всех LocalStorage пул потоков пакетных операций (создается при первом пакете)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(workers, thread_name_prefix="vpath-local")
+    return _executor
 
 
 @FileSystem.register("file")
 class LocalStorage(Storage):
+    list_batch_size = 1024
+    batch_workers = 16
+    
     def __init__(self, base_path: str | Path, **kwargs):
         super().__init__(**kwargs)
         self.base = Path(base_path).resolve()
@@ -14,38 +183,64 @@ class LocalStorage(Storage):
     def _full(self, path: str) -> Path:
         return self.base / path.lstrip("/")
     
-    def get_info(self, path: str) -> dict[str, Any]:
+    def get_info(self, path: str) -> EntryInfo:
         p = self._full(path)
-        stat = p.stat()
-        return {
-            "name": p.name,
-            "size": stat.st_size,
-            "type": "dir" if p.is_dir() else "file",
-            "mtime": stat.st_mtime
-        }
+        return stat_info(p.name, p.stat())
     
     def list_dir(self, path: str) -> Iterator[tuple[str, Optional[dict]]]:
-        for entry in self._full(path).iterdir():
-            yield entry.name, self.get_info(str(entry.relative_to(self.base)))
+        with os.scandir(self._full(path)) as it:
+            while batch := scan_entries(it, self.list_batch_size):
+                yield from batch
+    
+    def _scan_dir(self, path: str, match: Optional[Callable]) -> tuple[list, list]:
+        return scan_walk_dir(self._full(path), match)
     
     def open(self, path: str, mode: str) -> Any:
-        p = self._full(path)
-        if "w" in mode and not p.parent.exists():
-            p.parent.mkdir(parents=True, exist_ok=True)
-        return open(p, mode if "b" in mode else mode + "b")
+        return open_file(self._full(path), mode)
     
     def exists(self, path: str) -> bool:
         return self._full(path).exists()
     
     def unlink(self, path: str):
-        p = self._full(path)
-        if p.is_dir():
-            shutil.rmtree(p)
-        else:
-            p.unlink()
+        remove(self._full(path))
     
     def mkdir(self, path: str, mode: int = 0o777, parents: bool = False, exist_ok: bool = False):
         self._full(path).mkdir(mode=mode, parents=parents, exist_ok=exist_ok)
     
     def rename(self, src: str, dest: str):
         shutil.move(str(self._full(src)), str(self._full(dest)))
+    
+    def _map(self, func: Callable, paths: Iterable[str]) -> list:
+        """Выполняет пакет в пуле потоков: системные вызовы отпускают GIL."""
+        paths = list(paths)
+        if len(paths) < 2:
+            return [capture(func, p) for p in paths]
+        return list(shared_executor(self.batch_workers).map(lambda p: capture(func, p), paths))
+    
+    def get_info_many(self, paths: Iterable[str]) -> list[dict | Exception]:
+        return self._map(self.get_info, paths)
+    
+    def exists_many(self, paths: Iterable[str]) -> list[bool | Exception]:
+        return self._map(self.exists, paths)
+    
+    def unlink_many(self, paths: Iterable[str]) -> list[None | Exception]:
+        return self._map(self.unlink, paths)
+    
+    def read_many(self, paths: Iterable[str]) -> list[bytes | Exception]:
+        return self._map(self.read_bytes, paths)
+    
+    def read_bytes(self, path: str) -> bytes:
+        return self._full(path).read_bytes()
+    
+    def write_bytes(self, path: str, data: bytes):
+        write_file(self._full(path), data)
+    
+    def map(self, path: str) -> memoryview:
+        return map_file(self._full(path))
+    
+    def copy(self, src: str, dest: str, source: Optional[Storage] = None):
+        """Между локальными хранилищами данные копирует ядро, не проходя через Python."""
+        if source is not None and not isinstance(source, LocalStorage):
+            return super().copy(src, dest, source)
+        copy_file((source or self)._full(src), self._full(dest), self.copy_chunk_size)
+
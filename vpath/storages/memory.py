@@ -1,92 +1,394 @@
 import io
 import time
-from typing import Any, Iterator, Optional
-from vpath.storage import Storage
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, Optional
+from vpath.storage import Storage, check_copy_paths
 from vpath.factory import FileSystem
+from vpath.utils import BufferReader, EntryInfo, make_entry
+
+
+class MemoryNode:
+    """Узел дерева в памяти: директория (children) или файл (data)."""
+    __slots__ = ("children", "data", "mtime")
+    
+    def __init__(self, children: Optional[dict[str, "MemoryNode"]] = None, data: Optional[bytes] = None):
+        self.children = children
+        self.data = data
+        self.mtime = time.time()
+    
+    @property
+    def is_dir(self) -> bool:
+        return self.children is not None
+
+
+class MemoryWriter(io.BufferedIOBase):
+    """
+    Файл на запись в bytearray. При закрытии готовый буфер передается
+    хранилищу целиком (on_close), без копирования в bytes.
+    """
+    
+    def __init__(self, on_close: Callable[[bytearray], None], initial: bytes | bytearray = b""):
+        self._buffer = bytearray(initial)
+        self._on_close = on_close
+    
+    def writable(self) -> bool:
+        return True
+    
+    def write(self, data) -> int:
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        self._buffer += data
+        return len(data) if not isinstance(data, memoryview) else data.nbytes
+    
+    def tell(self) -> int:
+        return len(self._buffer)
+    
+    def close(self):
+        if not self.closed:
+            buffer, self._buffer = self._buffer, None
+            super().close()
+            self._on_close(buffer)
+
+
+class MemoryUpdater(io.BytesIO):
+    """
+    Файл для режимов "+": чтение, запись и seek идут по копии содержимого,
+    при закрытии результат целиком передается хранилищу (on_close).
+    """
+    
+    def __init__(self, on_close: Callable[[bytes], None], initial: bytes | bytearray = b"", append: bool = False):
+        super().__init__(initial)
+        self._on_close = on_close
+        self._append = append
+        if append:
+            self.seek(0, io.SEEK_END)
+    
+    def write(self, data) -> int:
+        if self._append and not self.closed:
+            self.seek(0, io.SEEK_END)
+        return super().write(data)
+    
+    def close(self):
+        if not self.closed:
+            data = self.getvalue()
+            super().close()
+            self._on_close(data)
+
+
+class MemoryTreeLogicMixin:
+    """
+    Логика дерева директорий в памяти.
+    Листинг стоит O(число детей), rename и unlink переносят/удаляют поддерево целиком.
+    """
+    
+    def __init__(self):
+        self._root = MemoryNode(children={})
+    
+    @staticmethod
+    def _split(path: str) -> list[str]:
+        return [part for part in path.split("/") if part and part != "."]
+    
+    def _lookup(self, path: str) -> Optional[MemoryNode]:
+        node = self._root
+        for part in self._split(path):
+            if node.children is None:
+                return None
+            node = node.children.get(part)
+            if node is None:
+                return None
+        return node
+    
+    def _parent(self, path: str, create: bool = False) -> tuple[MemoryNode, str]:
+        """Возвращает (директория-родитель, имя) для пути, при create достраивая цепочку папок."""
+        parts = self._split(path)
+        if not parts:
+            raise PermissionError("Operation not permitted on memory root")
+        node = self._root
+        for part in parts[:-1]:
+            child = node.children.get(part)
+            if child is None:
+                if not create:
+                    raise FileNotFoundError(path)
+                child = node.children[part] = MemoryNode(children={})
+                node.mtime = child.mtime
+            elif child.children is None:
+                raise NotADirectoryError(path)
+            node = child
+        return node, parts[-1]
+    
+    def _lookup_many(self, paths: list[str]) -> list[tuple[str, Optional[MemoryNode]]]:
+        """Один проход по пакету: узел общего родителя ищется один раз."""
+        parents: dict[str, Optional[MemoryNode]] = {}
+        found = []
+        for path in paths:
+            parent_path, _, name = path.rstrip("/").rpartition("/")
+            if name in ("", "."):
+                found.append((name, self._lookup(path)))
+                continue
+            if parent_path not in parents:
+                parents[parent_path] = self._lookup(parent_path)
+            parent = parents[parent_path]
+            node = parent.children.get(name) if parent is not None and parent.children is not None else None
+            found.append((name, node))
+        return found
+    
+    def _info_many(self, paths: Iterable[str]) -> list[dict | Exception]:
+        paths = list(paths)
+        return [self._node_info(name, node) if node is not None else FileNotFoundError(path)
+                for path, (name, node) in zip(paths, self._lookup_many(paths))]
+    
+    def _exists_many(self, paths: Iterable[str]) -> list[bool]:
+        return [node is not None for _, node in self._lookup_many(list(paths))]
+    
+    def _read_many(self, paths: Iterable[str]) -> list[bytes | Exception]:
+        paths = list(paths)
+        results = []
+        for path, (_, node) in zip(paths, self._lookup_many(paths)):
+            if node is None:
+                results.append(FileNotFoundError(path))
+            elif node.children is not None:
+                results.append(IsADirectoryError(path))
+            else:
+                results.append(self._frozen(node))
+        return results
+    
+    def _unlink_many(self, paths: Iterable[str]) -> list[None | Exception]:
+        """Удаление пакетом за один проход: узел общего родителя ищется один раз."""
+        parents: dict[str, Optional[MemoryNode]] = {}
+        results: list[None | Exception] = []
+        now = time.time()
+        for path in paths:
+            parts = self._split(path)
+            if not parts:
+                results.append(PermissionError("Operation not permitted on memory root"))
+                continue
+            parent_key = "/".join(parts[:-1])
+            if parent_key not in parents:
+                parents[parent_key] = self._lookup(parent_key)
+            parent = parents[parent_key]
+            if parent is None:
+                results.append(FileNotFoundError(path))
+                continue
+            if parent.children is None:
+                results.append(NotADirectoryError(path))
+                continue
+            node = parent.children.pop(parts[-1], None)
+            if node is None:
+                results.append(FileNotFoundError(path))
+                continue
+            parent.mtime = now
+            if node.children is not None:
+                parents.clear()  # Вместе с поддеревом могли исчезнуть закэшированные родители
+            results.append(None)
+        return results
+    
+    @staticmethod
+    def _node_info(name: str, node: MemoryNode) -> EntryInfo:
+        if node.children is not None:
+            return make_entry((name, "dir", 0, node.mtime))
+        return make_entry((name, "file", len(node.data), node.mtime))
+    
+    def _info(self, path: str) -> EntryInfo:
+        node = self._lookup(path)
+        if node is None:
+            raise FileNotFoundError(f"Memory file not found: {path}")
+        parts = self._split(path)
+        return self._node_info(parts[-1] if parts else "", node)
+    
+    def _list(self, path: str) -> Iterator[tuple[str, Optional[dict]]]:
+        node = self._lookup(path)
+        if node is None:
+            raise FileNotFoundError(path)
+        if node.children is None:
+            raise NotADirectoryError(path)
+        for name, child in list(node.children.items()):
+            yield name, self._node_info(name, child)
+    
+    def _scan_tree(self, path: str, match: Optional[Callable]) -> tuple[list, list]:
+        """Шаг walk прямо по узлам дерева: info собирается только для нужных записей."""
+        node = self._lookup(path)
+        if node is None:
+            raise FileNotFoundError(path)
+        if node.children is None:
+            raise NotADirectoryError(path)
+        dirs, files = [], []
+        for name, child in node.children.items():
+            if child.children is not None:
+                dirs.append((name, self._node_info(name, child)))
+            elif match is None or match(name):
+                files.append((name, self._node_info(name, child)))
+        return dirs, files
+    
+    def _node(self, path: str) -> MemoryNode:
+        node = self._lookup(path)
+        if node is None:
+            raise FileNotFoundError(path)
+        if node.children is not None:
+            raise IsADirectoryError(path)
+        return node
+    
+    @staticmethod
+    def _frozen(node: MemoryNode) -> bytes:
+        """
+        Содержимое как bytes. Запись хранит переданный ей bytearray; в bytes он
+        превращается один раз, при первом чтении через API, возвращающее bytes.
+        """
+        if type(node.data) is not bytes:
+            node.data = bytes(node.data)
+        return node.data
+    
+    def _read(self, path: str) -> bytes:
+        return self._frozen(self._node(path))
+    
+    def _copy_node(self, source: "MemoryTreeLogicMixin", src: str, dest: str):
+        """Копия файла между деревьями в памяти: новый узел ссылается на тот же неизменяемый буфер."""
+        if source is self:
+            check_copy_paths(src, dest)
+        self._write(dest, source._node(src).data)
+    
+    def _map(self, path: str) -> memoryview:
+        return memoryview(self._node(path).data).toreadonly()
+    
+    def _chunks(self, path: str, size: int) -> Iterator[memoryview]:
+        """Срезы хранимого буфера: без копий, и каждый остается действителен."""
+        view = self._map(path)
+        for start in range(0, len(view), size):
+            yield view[start:start + size]
+    
+    def _reader(self, path: str) -> BufferReader:
+        return BufferReader(self._node(path).data)
+    
+    def _writer(self, path: str, mode: str) -> MemoryWriter | MemoryUpdater:
+        """Писатель для режимов w/a/x и r+/w+/a+/x+; для w/a/x недостающие родители создаются сразу."""
+        if "r" in mode:
+            initial = self._node(path).data
+        else:
+            self._prepare_write(path)
+            existing = self._lookup(path)
+            if "x" in mode and existing is not None:
+                raise FileExistsError(path)
+            initial = existing.data if "a" in mode and existing is not None else b""
+        on_close = partial(self._write, path)
+        if "+" in mode:
+            return MemoryUpdater(on_close, initial, append="a" in mode)
+        return MemoryWriter(on_close, initial)
+    
+    def _prepare_write(self, path: str):
+        """Проверяет путь под запись и создает недостающих родителей."""
+        parent, name = self._parent(path, create=True)
+        existing = parent.children.get(name)
+        if existing is not None and existing.children is not None:
+            raise IsADirectoryError(path)
+    
+    def _write(self, path: str, data: bytes | bytearray):
+        parent, name = self._parent(path, create=True)
+        existing = parent.children.get(name)
+        if existing is not None and existing.children is not None:
+            raise IsADirectoryError(path)
+        node = parent.children[name] = MemoryNode(data=data)
+        parent.mtime = node.mtime
+    
+    def _exists(self, path: str) -> bool:
+        return self._lookup(path) is not None
+    
+    def _unlink(self, path: str):
+        parent, name = self._parent(path)
+        if parent.children.pop(name, None) is None:
+            raise FileNotFoundError(path)
+        parent.mtime = time.time()
+    
+    def _mkdir(self, path: str, parents: bool = False, exist_ok: bool = False):
+        if not self._split(path):
+            if exist_ok: return
+            raise FileExistsError(path)
+        parent, name = self._parent(path, create=parents)
+        existing = parent.children.get(name)
+        if existing is not None:
+            if exist_ok and existing.children is not None:
+                return
+            raise FileExistsError(path)
+        node = parent.children[name] = MemoryNode(children={})
+        parent.mtime = node.mtime
+    
+    def _rename(self, src: str, dest: str):
+        s_parts, d_parts = self._split(src), self._split(dest)
+        s_parent, s_name = self._parent(src)
+        node = s_parent.children.get(s_name)
+        if node is None:
+            raise FileNotFoundError(src)
+        if s_parts == d_parts:
+            return
+        
+        target = self._lookup(dest)
+        if target is not None and target.children is not None:
+            # Как shutil.move: перенос внутрь существующей директории
+            d_parts = d_parts + [s_name]
+        if d_parts[:len(s_parts)] == s_parts:
+            raise OSError(f"Cannot move '{src}' into itself")
+        
+        d_parent, d_name = self._parent("/".join(d_parts))
+        del s_parent.children[s_name]
+        d_parent.children[d_name] = node
+        s_parent.mtime = d_parent.mtime = time.time()
 
 
 @FileSystem.register("memory")
-class MemoryStorage(Storage):
+class MemoryStorage(Storage, MemoryTreeLogicMixin):
     def __init__(self, _base_path, **kwargs):
-        super().__init__(**kwargs)
-        self._files: dict[str, bytes] = {}
-        self._metadata: dict[str, float] = {}
-        self._dirs: set[str] = {"/"}
+        Storage.__init__(self, **kwargs)
+        MemoryTreeLogicMixin.__init__(self)
     
-    @staticmethod
-    def _normalize(path: str) -> str:
-        return "/" + path.strip("/")
-    
-    def get_info(self, path: str) -> dict[str, Any]:
-        p = self._normalize(path)
-        if p in self._dirs:
-            return {"name": p.split("/")[-1], "type": "dir", "size": 0, "mtime": self._metadata.get(p, 0.0)}
-        if p in self._files:
-            return {"name": p.split("/")[-1], "type": "file", "size": len(self._files[p]),
-                    "mtime": self._metadata.get(p, 0.0)}
-        raise FileNotFoundError(f"Memory file not found: {p}")
+    def get_info(self, path: str) -> EntryInfo:
+        return self._info(path)
     
     def list_dir(self, path: str) -> Iterator[tuple[str, Optional[dict]]]:
-        p = self._normalize(path)
-        p_slash = p if p.endswith("/") else p + "/"
-        
-        found = set()
-        for f_path in list(self._files.keys()) + list(self._dirs):
-            if f_path.startswith(p_slash) and f_path != p:
-                relative = f_path[len(p_slash):]
-                name = relative.split("/")[0]
-                if name not in found:
-                    found.add(name)
-                    yield name, self.get_info(p_slash + name)
+        return self._list(path)
+    
+    def _scan_dir(self, path: str, match: Optional[Callable]) -> tuple[list, list]:
+        return self._scan_tree(path, match)
     
     def open(self, path: str, mode: str) -> Any:
-        p = self._normalize(path)
-        if "w" in mode:
-            parts = p.split("/")
-            for i in range(2, len(parts)):
-                parent_dir = "/".join(parts[:i])
-                if parent_dir not in self._dirs:
-                    self._dirs.add(parent_dir)
-                    self._metadata[parent_dir] = time.time()
-            
-            buf = io.BytesIO()
-            orig_close = buf.close
-            
-            def _save():
-                self._files[p] = buf.getvalue()
-                self._metadata[p] = time.time()
-                self._dirs.discard(p)
-                orig_close()
-            
-            buf.close = _save
-            return buf
-        
-        if p not in self._files:
-            raise FileNotFoundError(p)
-        return io.BytesIO(self._files[p])
+        if any(m in mode for m in "wax+"):
+            return self._writer(path, mode)
+        return self._reader(path)
     
     def exists(self, path: str) -> bool:
-        p = self._normalize(path)
-        return p in self._files or p in self._dirs
+        return self._exists(path)
     
     def unlink(self, path: str):
-        p = self._normalize(path)
-        self._files.pop(p, None)
-        self._metadata.pop(p, None)
-        self._dirs.discard(p)
+        self._unlink(path)
     
     def mkdir(self, path: str, mode: int = 0o777, parents: bool = False, exist_ok: bool = False):
-        p = self._normalize(path)
-        if p in self._dirs and not exist_ok:
-            raise FileExistsError(p)
-        self._dirs.add(p)
-        self._metadata[p] = time.time()
+        self._mkdir(path, parents, exist_ok)
     
     def rename(self, src: str, dest: str):
-        s, d = self._normalize(src), self._normalize(dest)
-        if s in self._files:
-            self._files[d] = self._files.pop(s)
-            self._metadata[d] = self._metadata.pop(s)
-        elif s in self._dirs:
-            self._dirs.remove(s)
-            self._dirs.add(d)
\ No newline at end of file
+        self._rename(src, dest)
+    
+    def get_info_many(self, paths: Iterable[str]) -> list[dict | Exception]:
+        return self._info_many(paths)
+    
+    def exists_many(self, paths: Iterable[str]) -> list[bool | Exception]:
+        return self._exists_many(paths)
+    
+    def unlink_many(self, paths: Iterable[str]) -> list[None | Exception]:
+        return self._unlink_many(paths)
+    
+    def read_many(self, paths: Iterable[str]) -> list[bytes | Exception]:
+        return self._read_many(paths)
+    
+    def read_bytes(self, path: str) -> bytes:
+        return self._read(path)
+    
+    def map(self, path: str) -> memoryview:
+        return self._map(path)
+    
+    def iter_chunks(self, path: str, size: int) -> Iterator[memoryview]:
+        return self._chunks(path, size)
+    
+    def copy(self, src: str, dest: str, source: Optional[Storage] = None):
+        if source is not None and not isinstance(source, MemoryStorage):
+            return super().copy(src, dest, source)
+        self._copy_node(source or self, src, dest)
+    
+    def write_bytes(self, path: str, data: bytes):
+        self._write(path, data if type(data) is bytes else bytes(data))
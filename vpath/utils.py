@@ -1,15 +1,59 @@
 import os
+import sys
+import json
+import re
+import math
+import time
+import fnmatch
+import io
+import codecs
+import hashlib
 import importlib
+import threading
+from array import array
+from collections import OrderedDict
+from functools import lru_cache, partial
+from types import MappingProxyType
+from weakref import WeakValueDictionary
 from urllib.parse import urlparse, parse_qs
-from typing import Tuple, Dict, Any, Type
+from typing import Tuple, Dict, Any, Type, Callable, Hashable, Iterable, Mapping, NamedTuple, Optional
 
-from attrs import define, field
+from attrs import define, field, Factory
+
+
+class ParsedURL(NamedTuple):
+    """Результат разбора URL. Неизменяем (kwargs — MappingProxyType), поэтому его можно кэшировать."""
+    scheme: str
+    folder: str
+    file: str
+    ext: str
+    kwargs: Mapping[str, Any]
+
+
+# file:///..., mem://... и абсолютные пути без query, параметров, учетных данных и порта
+_PLAIN_URL = re.compile(r"(?:file://(?=/)|(mem)://|(?=/))([^?#;@:\[\]\s]*)")
 
 
 class URLParser:
     @staticmethod
-    def parse(url: str) -> Tuple[str, str, str, str, Dict[str, Any]]:
-        """Разбирает URL на (scheme, folder, filename, ext, kwargs)."""
+    @lru_cache(maxsize=4096)
+    def parse(url: str) -> ParsedURL:
+        """
+        Разбирает URL на (scheme, folder, filename, ext, kwargs). Результаты кэшируются (LRU).
+        Простые file:// / mem:// URL и абсолютные пути разбираются одной регуляркой, без urlparse.
+        """
+        plain = _PLAIN_URL.fullmatch(url)
+        if plain is None:
+            return URLParser._parse_full(url)
+        mem, full_path = plain.groups()
+        kwargs = {}
+        if mem:
+            netloc = full_path.partition("/")[0]
+            if netloc: kwargs['host'] = netloc.lower()
+        return URLParser._build("mem" if mem else "file", full_path, kwargs)
+    
+    @staticmethod
+    def _parse_full(url: str) -> ParsedURL:
         is_win_path = len(url) > 1 and url[1] == ":"
         if "://" not in url and not is_win_path and not url.startswith("/"):
             url = "file://" + url
@@ -20,20 +64,23 @@ class URLParser:
         scheme = parsed.scheme
         
         full_path = f"{parsed.netloc}{parsed.path}" if scheme != "file" else parsed.path
+        kwargs = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+        
+        if parsed.username: kwargs['user'] = parsed.username
+        if parsed.password: kwargs['password'] = parsed.password
+        if parsed.hostname and scheme != "file": kwargs['host'] = parsed.hostname
         
+        return URLParser._build(scheme, full_path, kwargs)
+    
+    @staticmethod
+    def _build(scheme: str, full_path: str, kwargs: Dict[str, Any]) -> ParsedURL:
         if full_path.endswith('/'):
             directory, filename = full_path.rstrip('/'), ""
         else:
             directory, filename = os.path.split(full_path)
         
         _, ext = os.path.splitext(filename)
-        kwargs = {k: v[0] for k, v in parse_qs(parsed.query).items()}
-        
-        if parsed.username: kwargs['user'] = parsed.username
-        if parsed.password: kwargs['password'] = parsed.password
-        if parsed.hostname and scheme != "file": kwargs['host'] = parsed.hostname
-        
-        return scheme, directory, filename, ext, kwargs
+        return ParsedURL(scheme, directory, filename, ext, MappingProxyType(kwargs))
 
 
 class LazyLoader:
@@ -48,6 +95,491 @@ class LazyLoader:
         return getattr(module, obj_name)
 
 
+def lazy_exports(package: str, exports: Dict[str, str],
+                 on_first: Optional[Callable[[], None]] = None) -> Tuple[Callable, Callable]:
+    """
+    Module __getattr__ / __dir__ для пакета: имя из exports импортируется из своего
+    подмодуля при первом обращении и кладется в пространство имен пакета.
+    on_first вызывается один раз перед первым таким импортом.
+    """
+    pending = [on_first] if on_first is not None else []
+    
+    def __getattr__(name: str) -> Any:
+        module = exports.get(name)
+        if module is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        while pending:
+            pending.pop()()
+        value = getattr(importlib.import_module(module, package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+    
+    def __dir__() -> list[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+    
+    return __getattr__, __dir__
+
+
+def _entry_points_cache_dir() -> str:
+    base = os.environ.get("VPATH_CACHE_DIR")
+    if base:
+        return base
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "vpath")
+
+
+def _environment_key() -> tuple[str, str]:
+    """
+    (интерпретатор, состояние установленных пакетов). Состояние — mtime директорий
+    site-packages: установка или удаление дистрибутива добавляет или убирает в них
+    *.dist-info. Прочие записи sys.path (в т.ч. '' — текущая директория) не учитываются.
+    """
+    interpreter = hashlib.sha1(f"{sys.prefix}\0{sys.version}".encode()).hexdigest()[:16]
+    state = []
+    for entry in sys.path:
+        if os.path.basename(entry.rstrip("/\\")) not in ("site-packages", "dist-packages"):
+            continue
+        try:
+            state.append(f"{entry}:{os.stat(entry).st_mtime_ns}")
+        except OSError:
+            pass
+    return interpreter, hashlib.sha1("\0".join(state).encode()).hexdigest()[:16]
+
+
+def cached_entry_points(group: str) -> list:
+    """
+    importlib.metadata.entry_points(group=...) с кэшем на диске (VPATH_CACHE_DIR,
+    иначе $XDG_CACHE_HOME/vpath): полный обход дистрибутивов делается только после
+    изменения окружения. Все группы интерпретатора лежат в одном файле; файлы
+    устаревших состояний удаляются при записи. Ошибки кэша не фатальны.
+    """
+    from importlib.metadata import EntryPoint, entry_points
+    
+    folder = _entry_points_cache_dir()
+    interpreter, state = _environment_key()
+    path = os.path.join(folder, f"entry_points-{interpreter}-{state}.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = {}
+    if not isinstance(cached, dict):
+        cached = {}
+    if group in cached:
+        try:
+            return [EntryPoint(name, value, group) for name, value in cached[group]]
+        except (TypeError, ValueError):
+            pass
+    
+    found = list(entry_points(group=group))
+    cached[group] = [(ep.name, ep.value) for ep in found]
+    try:
+        os.makedirs(folder, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cached, f)
+        os.replace(tmp, path)
+        stale = f"entry_points-{interpreter}-"
+        for name in os.listdir(folder):
+            if name.startswith(stale) and name.endswith(".json") and name != os.path.basename(path):
+                os.remove(os.path.join(folder, name))
+    except OSError:
+        pass
+    return found
+
+
+_MAGIC = re.compile(r"[*?[]")
+
+
+def has_magic(pattern: str) -> bool:
+    """Проверяет, содержит ли сегмент glob-шаблона спецсимволы."""
+    return _MAGIC.search(pattern) is not None
+
+
+@lru_cache(maxsize=256)
+def compile_glob(pattern: str) -> Callable[[str], Optional[re.Match]]:
+    """Компилирует glob-шаблон имени в функцию сопоставления (с учетом регистра, с кэшем)."""
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+def capture(func: Callable, *args) -> Any:
+    """Вызывает func и возвращает либо результат, либо возникшее исключение."""
+    try:
+        return func(*args)
+    except Exception as e:
+        return e
+
+
+def group_batch(items: Iterable, route: Callable[[Any], tuple[Any, Any]]) -> tuple[list, list]:
+    """
+    Группирует элементы пакета по цели: route(item) -> (цель, аргумент).
+    Возвращает (results, groups), где groups — [(цель, позиции, аргументы)];
+    ошибки route сразу записываются в results на позицию элемента.
+    """
+    results: list = []
+    groups: dict[int, tuple[Any, list[int], list]] = {}
+    for i, item in enumerate(items):
+        results.append(None)
+        try:
+            target, arg = route(item)
+        except Exception as e:
+            results[i] = e
+            continue
+        group = groups.get(id(target))
+        if group is None:
+            group = groups[id(target)] = (target, [], [])
+        group[1].append(i)
+        group[2].append(arg)
+    return results, list(groups.values())
+
+
+def as_bool(value: Any) -> bool:
+    """Приводит значение (в том числе строку из query URL) к bool."""
+    if isinstance(value, str):
+        return value.strip().lower() not in ("", "0", "false", "no", "off")
+    return bool(value)
+
+
+def decode_text(data: bytes, encoding: str = "utf-8", errors: str = "strict") -> str:
+    """Декодирует файл целиком с универсальными переводами строк, как TextIOWrapper(newline=None)."""
+    text = codecs.decode(data, encoding, errors)
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def encode_text(text: str, encoding: str = "utf-8", errors: str = "strict", newline: Optional[str] = None) -> bytes:
+    """Кодирует текст целиком; newline трактуется так же, как в open()."""
+    if newline is None:
+        newline = os.linesep
+    if newline not in ("", "\n"):
+        text = text.replace("\n", newline)
+    return text.encode(encoding, errors)
+
+
+class RecordSplitter:
+    """
+    Режет поток кусков (bytes или str) на записи по разделителю. Кусок делится одним
+    split, незавершенный хвост копится частями и склеивается один раз.
+    """
+    __slots__ = ("sep", "keepends", "_parts")
+    
+    def __init__(self, sep: bytes | str, keepends: bool = False):
+        self.sep = sep
+        self.keepends = keepends
+        self._parts: list = []
+    
+    def feed(self, data: bytes | str) -> list:
+        records = data.split(self.sep)
+        if len(records) == 1:
+            if data:
+                self._parts.append(data)
+            return []
+        tail = records.pop()
+        if self._parts:
+            self._parts.append(records[0])
+            records[0] = data[:0].join(self._parts)
+            self._parts = []
+        if tail:
+            self._parts.append(tail)
+        if self.keepends:
+            return [record + self.sep for record in records]
+        return records
+    
+    def finish(self) -> list:
+        """Последняя запись без завершающего разделителя, если она есть."""
+        if not self._parts:
+            return []
+        record = self._parts[0][:0].join(self._parts)
+        self._parts = []
+        return [record]
+
+
+class LRUCache:
+    """
+    LRU-кэш с опциональным временем жизни записей и счетчиками попаданий.
+    ttl=None — записи не устаревают, ttl=0 — кэш ничего не хранит. Потокобезопасен.
+    """
+    
+    def __init__(self, maxsize: int = 4096, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[Any, Optional[float]]] = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            value, expires = item
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any):
+        if self.ttl is not None and self.ttl <= 0:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires)
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def pop(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def discard_if(self, predicate: Callable[[Hashable], bool]):
+        """Удаляет все записи, ключ которых удовлетворяет условию."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                del self._data[key]
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self):
+        return len(self._data)
+    
+    def __contains__(self, key: Hashable):
+        return key in self._data
+
+
+class StoragePool:
+    """Пул экземпляров хранилищ по ключу (root, нормализованные kwargs)."""
+    
+    def __init__(self, maxsize: int = 128, weak: bool = False):
+        self.maxsize = maxsize
+        self.weak = weak
+        self._items = WeakValueDictionary() if weak else OrderedDict()
+    
+    @staticmethod
+    def _freeze(name: str, value: Any) -> Hashable:
+        """Приводит значение так же, как это сделает хранилище, чтобы равные настройки давали один ключ."""
+        if isinstance(value, (list, tuple)) and len(value) == 1:
+            value = value[0]  # Значение из parse_qs
+        if name == "use_cache":
+            return as_bool(value)
+        try:
+            hash(value)
+        except TypeError:
+            return repr(value)
+        return value
+    
+    @classmethod
+    def key(cls, root: str, kwargs: dict[str, Any]) -> tuple:
+        root = os.path.normpath(root) if root else ""
+        return root, tuple(sorted((k, cls._freeze(k, v)) for k, v in kwargs.items()))
+    
+    def get(self, key: tuple) -> Any:
+        storage = self._items.get(key)
+        if storage is not None and not self.weak:
+            self._items.move_to_end(key)
+        return storage
+    
+    def put(self, key: tuple, storage: Any) -> Optional[Any]:
+        """Кладет хранилище в пул; возвращает вытесненное хранилище, которое нужно закрыть."""
+        self._items[key] = storage
+        if not self.weak and len(self._items) > self.maxsize:
+            return self._items.popitem(last=False)[1]
+        return None
+    
+    def drain(self) -> list[Any]:
+        """Очищает пул и возвращает все хранившиеся в нем хранилища."""
+        storages = list(self._items.values())
+        self._items.clear()
+        return storages
+    
+    def __len__(self):
+        return len(self._items)
+
+
+class BloomFilter:
+    """Вероятностное множество строк: ложноположительные ответы возможны, ложноотрицательные — нет."""
+    
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(64, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+    
+    def _positions(self, item: str) -> Iterable[int]:
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+    
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+    
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class BufferReader(io.BufferedIOBase):
+    """
+    Файл только для чтения поверх буфера (bytes, bytearray, mmap, memoryview) без копирования:
+    readinto и getbuffer работают прямо по memoryview, а read() целиком отдает сам объект bytes.
+    """
+    
+    def __init__(self, data: bytes | bytearray | memoryview):
+        self._data = data
+        self._view = memoryview(data).toreadonly()
+        self._pos = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def getbuffer(self) -> memoryview:
+        """memoryview над всем содержимым; данные не копируются."""
+        self._check()
+        return self._view
+    
+    def read(self, size: Optional[int] = -1) -> bytes:
+        self._check()
+        start, total = self._pos, len(self._view)
+        end = total if size is None or size < 0 else min(total, start + size)
+        self._pos = max(start, end)
+        if start == 0 and end == total and type(self._data) is bytes:
+            return self._data
+        return bytes(self._view[start:end])
+    
+    read1 = read
+    
+    def readinto(self, buffer) -> int:
+        self._check()
+        target = memoryview(buffer).cast("B")
+        size = min(len(target), len(self._view) - self._pos)
+        if size <= 0:
+            return 0
+        target[:size] = self._view[self._pos:self._pos + size]
+        self._pos += size
+        return size
+    
+    readinto1 = readinto
+    
+    def _find_newline(self, start: int) -> int:
+        if hasattr(self._data, "find"):
+            return self._data.find(b"\n", start)
+        view, step = self._view, 65536  # У memoryview нет find: ищем по кускам
+        for offset in range(start, len(view), step):
+            found = bytes(view[offset:offset + step]).find(b"\n")
+            if found >= 0:
+                return offset + found
+        return -1
+    
+    def readline(self, size: Optional[int] = -1) -> bytes:
+        self._check()
+        end = self._find_newline(self._pos)
+        end = len(self._view) if end < 0 else end + 1
+        if size is not None and size >= 0:
+            end = min(end, self._pos + size)
+        line, self._pos = bytes(self._view[self._pos:end]), max(self._pos, end)
+        return line
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._check()
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}[whence]
+        if base + offset < 0:
+            raise ValueError(f"negative seek position {base + offset}")
+        self._pos = base + offset
+        return self._pos
+    
+    def tell(self) -> int:
+        self._check()
+        return self._pos
+    
+    def close(self):
+        if not self.closed:
+            self._view.release()
+            self._data = None
+        super().close()
+    
+    def _check(self):
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+
+
+class FileProxy:
+    """Прозрачная обертка над файловым объектом с хуком на закрытие."""
+    
+    def __init__(self, file, on_close: Optional[Callable[[], None]] = None):
+        self._file = file
+        self._on_close = on_close
+    
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+    
+    def close(self):
+        try:
+            self._file.close()
+        finally:
+            callback, self._on_close = self._on_close, None
+            if callback is not None:
+                callback()
+    
+    def __iter__(self):
+        return iter(self._file)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class CountingFile(FileProxy):
+    """FileProxy, сообщающий on_bytes(direction, n) о каждом прочитанном и записанном куске."""
+    
+    def __init__(self, file, on_bytes: Callable[[str, int], None], on_close: Optional[Callable[[], None]] = None):
+        super().__init__(file, on_close)
+        self._on_bytes = on_bytes
+    
+    def read(self, size: Optional[int] = -1) -> bytes:
+        data = self._file.read(size)
+        self._on_bytes("read", len(data))
+        return data
+    
+    def read1(self, size: int = -1) -> bytes:
+        data = self._file.read1(size)
+        self._on_bytes("read", len(data))
+        return data
+    
+    def readinto(self, buffer) -> int:
+        n = self._file.readinto(buffer)
+        self._on_bytes("read", n or 0)
+        return n
+    
+    def readline(self, size: Optional[int] = -1) -> bytes:
+        line = self._file.readline(size)
+        self._on_bytes("read", len(line))
+        return line
+    
+    def write(self, data) -> int:
+        n = self._file.write(data)
+        self._on_bytes("written", n if n is not None else len(data))
+        return n
+    
+    def __iter__(self):
+        for line in self._file:
+            self._on_bytes("read", len(line))
+            yield line
+
+
 class MetaSingleton(type):
     _instances = None
     
@@ -57,21 +589,130 @@ class MetaSingleton(type):
         return cls._instances
 
 
+class EntryInfo(NamedTuple):
+    """
+    Метаданные записи — кортеж со слотами вместо dict. Поддерживает и чтение как у словаря
+    (info["size"], info.get("type"), dict(info)), поэтому код, ждущий dict, работает без изменений.
+    """
+    name: str
+    type: str
+    size: int = 0
+    mtime: float = 0.0
+    
+    @classmethod
+    def from_mapping(cls, data: Mapping[str, Any]) -> "EntryInfo":
+        if isinstance(data, EntryInfo):
+            return data
+        return make_entry((data.get("name", ""), data.get("type", ""), data.get("size", 0), data.get("mtime", 0.0)))
+    
+    @property
+    def is_dir(self) -> bool:
+        return self.type == "dir"
+    
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+    
+    def __contains__(self, key) -> bool:
+        return key in self._fields
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self._fields else default
+    
+    def keys(self) -> tuple[str, ...]:
+        return self._fields
+    
+    def items(self) -> Iterable[tuple[str, Any]]:
+        return zip(self._fields, self)
+
+
+# Конструктор EntryInfo из готового кортежа (name, type, size, mtime) — без Python-уровневого
+# __new__ NamedTuple, почти вдвое дешевле; для горячих путей хранилищ.
+make_entry: Callable[[tuple], EntryInfo] = partial(tuple.__new__, EntryInfo)
+
+
+class ListingBatch:
+    """
+    Колоночный листинг: имена — списком, размеры, mtime и коды типов — в array.
+    На запись приходится строка имени и 17 байт вместо dict; EntryInfo создается при чтении.
+    Итерация отдает (name, info), как list_dir, поэтому пачку можно вернуть из хранилища как есть.
+    """
+    __slots__ = ("names", "sizes", "mtimes", "types", "_type_names", "_type_codes")
+    
+    def __init__(self):
+        self.names: list[str] = []
+        self.sizes = array("q")
+        self.mtimes = array("d")
+        self.types = array("B")
+        self._type_names: list[Optional[str]] = [None, "file", "dir"]  # код 0 — записи без метаданных
+        self._type_codes: dict[Optional[str], int] = {None: 0, "file": 1, "dir": 2}
+    
+    @classmethod
+    def from_entries(cls, entries: Iterable[tuple[str, Optional[Mapping[str, Any]]]]) -> "ListingBatch":
+        batch = cls()
+        for name, info in entries:
+            batch.add(name, info)
+        return batch
+    
+    def append(self, name: str, type: Optional[str], size: int = 0, mtime: float = 0.0):
+        code = self._type_codes.get(type)
+        if code is None:
+            code = self._type_codes[type] = len(self._type_names)
+            self._type_names.append(type)
+        self.names.append(name)
+        self.sizes.append(size)
+        self.mtimes.append(mtime)
+        self.types.append(code)
+    
+    def add(self, name: str, info: Optional[Mapping[str, Any]]):
+        if info is None:
+            self.append(name, None)
+        else:
+            _, type, size, mtime = EntryInfo.from_mapping(info)
+            self.append(name, type, size, mtime)
+    
+    def entry(self, index: int) -> Optional[EntryInfo]:
+        type = self._type_names[self.types[index]]
+        if type is None:
+            return None
+        return make_entry((self.names[index], type, self.sizes[index], self.mtimes[index]))
+    
+    def __len__(self) -> int:
+        return len(self.names)
+    
+    def __getitem__(self, index: int) -> tuple[str, Optional[EntryInfo]]:
+        return self.names[index], self.entry(index)
+    
+    def __iter__(self):
+        names, sizes, mtimes, types, type_names = self.names, self.sizes, self.mtimes, self.types, self._type_names
+        for i in range(len(names)):
+            type = type_names[types[i]]
+            yield names[i], None if type is None else make_entry((names[i], type, sizes[i], mtimes[i]))
+    
+    def __repr__(self):
+        return f"ListingBatch({len(self)} entries)"
+
+
 @define(frozen=True, repr=False)
 class VStat:
-    _data: dict = field(alias="metadata")
+    """Результат stat: поля читаются из EntryInfo атрибутами; dict от старых хранилищ приводится один раз."""
+    _data: Mapping[str, Any] = field(alias="metadata")
+    _entry: EntryInfo = field(init=False, default=Factory(lambda self: EntryInfo.from_mapping(self._data), takes_self=True))
     
     @property
     def st_size(self) -> int:
-        return self._data.get("size", 0)
+        return self._entry.size
     
     @property
     def st_mtime(self) -> float:
-        return self._data.get("mtime", 0.0)
+        return self._entry.mtime
     
     @property
     def is_dir(self) -> bool:
-        return self._data.get("type") == "dir"
+        return self._entry.type == "dir"
     
     def __getitem__(self, key):
         return self._data[key]
@@ -82,4 +723,4 @@ class VStat:
         raise AttributeError(f"'VStat' object has no attribute '{name}'")
     
     def __repr__(self):
-        return f"vstat_result(size={self.st_size}, type='{self._data.get('type', 'unknown')}')"
+        return f"vstat_result(size={self.st_size}, type='{self._entry.type or 'unknown'}')"